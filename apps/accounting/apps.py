@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounting'
+
+    def ready(self):
+        from accounting import checks  # noqa: F401
+        from accounting.services.coa_templates import registry
+
+        # parse and compile the CoA templates once, before any request
+        registry()
@@ -0,0 +1,11 @@
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.models)
+def check_coa_templates(app_configs, **kwargs):
+    from accounting.services.coa_templates import registry
+
+    return [
+        Error(str(error), hint="Run validate_coa_templates", id="accounting.E001")
+        for error in registry().errors.values()
+    ]
@@ -0,0 +1,310 @@
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django_ledger.models import EntityModel
+from django_tenants.utils import tenant_context
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounting.serializers import (
+    BalanceSheetSerializer,
+    IncomeStatementQuerySerializer,
+    IncomeStatementSerializer,
+    PeriodCloseRequestSerializer,
+    PeriodCloseResultSerializer,
+    StatementQuerySerializer,
+    TrialBalanceSerializer,
+)
+from accounting.services.journal_import import (
+    CONTENT_TYPES,
+    IMPORT_FIELDS,
+    JournalImportError,
+    encode_results,
+    import_journal_entries,
+    parse_rows,
+)
+from accounting.services.closing import (
+    PeriodCloseError,
+    balance_sheet,
+    close_period,
+    income_statement,
+    reopen_period,
+    trial_balance,
+)
+from identity.enums import UserRoles
+from identity.permissions import IsTenantMember
+
+STATEMENT_PARAMETERS = [
+    OpenApiParameter("as_of", str, description="Date, YYYY-MM-DD (default today)"),
+    OpenApiParameter("entity", description="Entity slug (default the tenant's entity)"),
+    OpenApiParameter(
+        "ledger", str, many=True, description="Ledger UUIDs (default every posted ledger)"
+    ),
+]
+
+
+ENTITY_NOT_FOUND = {"detail": "Entity not found"}
+
+
+def _entity(slug=None):
+    """The entity with `slug`, or the tenant's first entity."""
+    entities = EntityModel.objects.order_by("created")
+    if slug:
+        entities = entities.filter(slug=slug)
+    return entities.first()
+
+
+class StatementAPIView(APIView):
+    """
+    Shared query handling for statements read from closed-period rollups and
+    balance snapshots.
+    """
+
+    permission_classes = [IsTenantMember]
+    statement = None
+    serializer_class = None
+
+    def get(self, request):
+        query = StatementQuerySerializer(
+            data={
+                **request.query_params.dict(),
+                "ledger": request.query_params.getlist("ledger"),
+            }
+        )
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        entity = _entity(params.get("entity"))
+        if entity is None:
+            return Response(ENTITY_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+
+        result = self.statement(
+            entity, as_of=params.get("as_of"), ledger_ids=params.get("ledger") or None
+        )
+        return Response(self.serializer_class(result).data, status=status.HTTP_200_OK)
+
+
+class TrialBalanceAPIView(StatementAPIView):
+    """
+    Trial balance from the account balance snapshots.
+    """
+
+    statement = staticmethod(trial_balance)
+    serializer_class = TrialBalanceSerializer
+
+    @extend_schema(
+        tags=["Accounting"],
+        parameters=STATEMENT_PARAMETERS,
+        responses={200: TrialBalanceSerializer},
+        summary="Trial balance",
+        description="""
+        Debit and credit balance of every account with posted activity up
+        to `as_of`. Read from closed-month rollups and per-account monthly
+        snapshots, so it costs the same however many transactions the
+        ledgers hold.
+        """,
+    )
+    def get(self, request):
+        return super().get(request)
+
+
+class BalanceSheetAPIView(StatementAPIView):
+    """
+    Balance sheet from the account balance snapshots.
+    """
+
+    statement = staticmethod(balance_sheet)
+    serializer_class = BalanceSheetSerializer
+
+    @extend_schema(
+        tags=["Accounting"],
+        parameters=STATEMENT_PARAMETERS,
+        responses={200: BalanceSheetSerializer},
+        summary="Balance sheet",
+        description="""
+        Assets, liabilities and equity as of `as_of`. Income and expense
+        accounts are reported as earnings within equity.
+        """,
+    )
+    def get(self, request):
+        return super().get(request)
+
+
+class IncomeStatementAPIView(APIView):
+    """
+    Income statement for a date range, from closed-period rollups plus the
+    open months after them.
+    """
+
+    permission_classes = [IsTenantMember]
+
+    @extend_schema(
+        tags=["Accounting"],
+        parameters=[
+            OpenApiParameter("start", str, required=True, description="Date, YYYY-MM-DD"),
+            OpenApiParameter("end", str, description="Date, YYYY-MM-DD (default today)"),
+            OpenApiParameter("entity", description="Entity slug (default the tenant's entity)"),
+        ],
+        responses={200: IncomeStatementSerializer},
+        summary="Income statement",
+        description="""
+        Revenue, cost of goods sold and expenses posted from `start` to
+        `end`, with gross profit and net income. Closed months are read
+        from their rollups, which are recomputed first if a back-dated
+        entry landed in them.
+        """,
+    )
+    def get(self, request):
+        query = IncomeStatementQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        entity = _entity(params.get("entity"))
+        if entity is None:
+            return Response(ENTITY_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+
+        result = income_statement(entity, params["start"], params.get("end"))
+        return Response(IncomeStatementSerializer(result).data, status=status.HTTP_200_OK)
+
+
+class PeriodCloseAPIView(APIView):
+    """
+    Month-end close: closes every open month up to the given one.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Accounting"],
+        request=PeriodCloseRequestSerializer,
+        responses={200: PeriodCloseResultSerializer},
+        summary="Close periods",
+        description="""
+        Closes every open month up to and including the month of `period`
+        and stores its per-account rollups. Returns the months closed,
+        which is empty when they were already closed. Only months that have
+        ended can be closed.
+        """,
+    )
+    def post(self, request):
+        serializer = PeriodCloseRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entity = _entity(serializer.validated_data.get("entity"))
+        if entity is None:
+            return Response(ENTITY_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            periods = close_period(
+                entity, serializer.validated_data["period"], user=request.user
+            )
+        except PeriodCloseError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            PeriodCloseResultSerializer({"periods": periods}).data, status=status.HTTP_200_OK
+        )
+
+
+class PeriodReopenAPIView(APIView):
+    """
+    Reopens a closed month and every month after it.
+    """
+
+    permission_classes = [IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN)]
+
+    @extend_schema(
+        tags=["Accounting"],
+        request=PeriodCloseRequestSerializer,
+        responses={200: PeriodCloseResultSerializer},
+        summary="Reopen periods",
+        description="""
+        Reopens the month of `period` and every closed month after it,
+        dropping their rollups. Returns the months reopened.
+        """,
+    )
+    def post(self, request):
+        serializer = PeriodCloseRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entity = _entity(serializer.validated_data.get("entity"))
+        if entity is None:
+            return Response(ENTITY_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+
+        periods = reopen_period(entity, serializer.validated_data["period"])
+        return Response(
+            PeriodCloseResultSerializer({"periods": periods}).data, status=status.HTTP_200_OK
+        )
+
+
+class JournalEntryImportAPIView(APIView):
+    """
+    Bulk journal entry import, streaming back one line per rejected row.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Accounting"],
+        parameters=[
+            OpenApiParameter("entity", description="Entity slug (default the tenant's entity)"),
+            OpenApiParameter(
+                "post", bool, default=True, description="Post (and lock) the imported entries"
+            ),
+        ],
+        request={
+            "application/x-ndjson": {"type": "string"},
+            "text/csv": {"type": "string"},
+        },
+        responses={
+            (200, "application/x-ndjson"): {"type": "string"},
+            400: {"type": "object", "properties": {"detail": {"type": "string"}}},
+        },
+        summary="Import journal entries",
+        description=f"""
+        Imports journal entries from NDJSON (`application/x-ndjson`) or CSV
+        (`text/csv`), one transaction line per row with the fields
+        {", ".join(f"`{field}`" for field in IMPORT_FIELDS)}. Rows sharing
+        `entry` form one journal entry and must be adjacent; `ledger` is a
+        ledger UUID or xid and `account` an account code.
+
+        Each entry's debits must equal its credits. Entries are written in
+        chunks, each in its own transaction, so an invalid entry or failed
+        chunk does not stop the rest. The response streams one NDJSON line
+        per rejected row or entry (`line`, `entry`, `errors`) as the import
+        progresses, then a final `summary` line.
+        """,
+    )
+    def post(self, request):
+        import_format = CONTENT_TYPES.get(request.content_type.split(";")[0].strip())
+        if import_format is None:
+            return Response(
+                {"detail": f"Content type must be one of {', '.join(CONTENT_TYPES)}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        stream = request.stream
+        if stream is None:
+            return Response(
+                {"detail": "Request body is empty"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        entity = _entity(request.query_params.get("entity"))
+        if entity is None:
+            return Response(ENTITY_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+        post = request.query_params.get("post", "true").lower() not in ("0", "false", "no")
+
+        try:
+            results = import_journal_entries(entity, parse_rows(stream, import_format), post=post)
+        except JournalImportError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        tenant = connection.tenant
+
+        def stream_results():
+            # the import runs while the response is sent, after the view
+            # has returned, so pin the tenant's schema
+            with tenant_context(tenant):
+                yield from encode_results(results)
+
+        return StreamingHttpResponse(stream_results(), content_type="application/x-ndjson")
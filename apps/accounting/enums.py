@@ -0,0 +1,7 @@
+from django.db.models import TextChoices
+
+
+class PeriodCloseStatus(TextChoices):
+    CLOSED = "closed", "Closed"
+    # a posting landed in or before the month after it was closed
+    STALE = "stale", "Stale"
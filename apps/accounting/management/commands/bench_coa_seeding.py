@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django_ledger.models import EntityModel
+from django_tenants.utils import schema_context
+
+from accounting.services.chart_of_accounts import chart_rows, seed_chart_of_accounts
+from identity.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Times django_ledger's create_chart_of_accounts + populate_default_coa "
+        "against the bulk snapshot seeder in a tenant schema, checks both "
+        "produce the same accounts, and rolls everything back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name", help="Tenant schema to run in")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        admin = User.objects.order_by("created_at").first()
+        if admin is None:
+            raise CommandError("At least one user is needed to own the bench entity")
+
+        with schema_context(options["schema_name"]):
+            try:
+                with transaction.atomic():
+                    self._run(admin, options["repeat"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def _run(self, admin, repeat):
+        ledger_times, bulk_times = [], []
+        ledger_queries = bulk_queries = 0
+        ledger_rows = bulk_rows = None
+
+        for i in range(repeat):
+            entity = EntityModel.create_entity(
+                name=f"bench-coa-{i}",
+                admin=admin,
+                use_accrual_method=True,
+                fy_start_month=1,
+            )
+
+            def ledger_seed():
+                entity.create_chart_of_accounts(
+                    coa_name="ledger", assign_as_default=True, commit=True
+                )
+                entity.populate_default_coa(activate_accounts=False)
+
+            queries, elapsed = self._measure(ledger_seed)
+            ledger_times.append(elapsed)
+            ledger_queries = queries
+            ledger_rows = chart_rows(entity.default_coa)
+
+            queries, elapsed = self._measure(
+                lambda: seed_chart_of_accounts(
+                    entity, coa_name="bulk", assign_as_default=True
+                )
+            )
+            bulk_times.append(elapsed)
+            bulk_queries = queries
+            bulk_rows = chart_rows(entity.default_coa)
+
+        if ledger_rows != bulk_rows:
+            raise CommandError("Seeded accounts differ from django_ledger's defaults")
+
+        ledger, bulk = statistics.median(ledger_times), statistics.median(bulk_times)
+        self.stdout.write(f"{len(bulk_rows)} accounts, identical in both charts")
+        self.stdout.write(
+            f"django_ledger  p50 {ledger * 1000:8.1f}ms  {ledger_queries:5d} queries"
+        )
+        self.stdout.write(
+            f"bulk snapshot  p50 {bulk * 1000:8.1f}ms  {bulk_queries:5d} queries"
+        )
+        self.stdout.write(f"speedup {ledger / bulk:.1f}x")
+
+    def _measure(self, fn):
+        executed = []
+
+        def count(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            with transaction.atomic():
+                fn()
+            elapsed = time.perf_counter() - started
+        return len(executed), elapsed
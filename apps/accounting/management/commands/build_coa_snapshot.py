@@ -0,0 +1,35 @@
+import json
+from importlib.metadata import version
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting.services.chart_of_accounts import SNAPSHOT_PATH, build_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes data/coa_default.json from django_ledger's default chart of "
+        "accounts, or with --check fails when the file is out of date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true")
+
+    def handle(self, *args, **options):
+        nodes = build_snapshot()
+        if options["check"]:
+            try:
+                current = json.loads(SNAPSHOT_PATH.read_text())["nodes"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Cannot read {SNAPSHOT_PATH}: {e}")
+            if current != nodes:
+                raise CommandError(
+                    f"{SNAPSHOT_PATH.name} does not match django_ledger's defaults, "
+                    "run build_coa_snapshot"
+                )
+            self.stdout.write(f"{SNAPSHOT_PATH.name} is up to date ({len(nodes)} accounts)")
+            return
+
+        snapshot = {"django_ledger": version("django-ledger"), "nodes": nodes}
+        SNAPSHOT_PATH.write_text(json.dumps(snapshot, indent=1) + "\n")
+        self.stdout.write(f"Wrote {len(nodes)} accounts to {SNAPSHOT_PATH}")
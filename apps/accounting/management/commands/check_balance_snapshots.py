@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_ledger.models import LedgerModel
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from accounting.services.balances import find_drift, rebuild_snapshots
+from tenants.models import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares account balance snapshots with a full recompute from posted "
+        "transactions, in every tenant schema or the given ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", nargs="+", dest="schemas")
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute the snapshots of ledgers that drifted",
+        )
+        parser.add_argument("--show", type=int, default=10, help="Drifted rows to print")
+
+    def handle(self, *args, **options):
+        schemas = options["schemas"] or list(
+            Client.objects.exclude(schema_name=get_public_schema_name())
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        drifted_schemas = 0
+        for schema in schemas:
+            with schema_context(schema):
+                ledger_ids = list(LedgerModel.objects.values_list("uuid", flat=True))
+                drift = find_drift(ledger_ids)
+                if not drift:
+                    self.stdout.write(f"{schema}: {len(ledger_ids)} ledgers consistent")
+                    continue
+
+                drifted_schemas += 1
+                self.stdout.write(
+                    self.style.WARNING(f"{schema}: {len(drift)} periods drifted")
+                )
+                for (ledger_id, account_id, period), stored, expected in drift[
+                    : options["show"]
+                ]:
+                    self.stdout.write(
+                        f"  ledger {ledger_id} account {account_id} {period:%Y-%m}: "
+                        f"stored {stored}, expected {expected}"
+                    )
+                if options["rebuild"]:
+                    rows = rebuild_snapshots({key[0] for key, _, _ in drift})
+                    self.stdout.write(f"  rebuilt {rows} snapshot rows")
+
+        if drifted_schemas and not options["rebuild"]:
+            raise CommandError(f"{drifted_schemas} schemas have drifted snapshots")
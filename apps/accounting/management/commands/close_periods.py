@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django_ledger.models import EntityModel
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from accounting.services.balances import month_start
+from accounting.services.closing import (
+    close_period,
+    refresh_stale_periods,
+)
+from tenants.models import Client
+
+
+def _month(value):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"{value} is not a month, use YYYY-MM")
+
+
+class Command(BaseCommand):
+    help = (
+        "Month-end close: closes every entity's books through last month (or "
+        "--through) and recomputes closed months made stale by back-dated "
+        "entries, in every tenant schema or the given ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", nargs="+", dest="schemas")
+        parser.add_argument("--through", type=_month, help="Last month to close, YYYY-MM")
+        parser.add_argument(
+            "--refresh-only",
+            action="store_true",
+            help="Only recompute stale months, close nothing new",
+        )
+
+    def handle(self, *args, **options):
+        this_month = month_start(timezone.localdate())
+        through = options["through"] or month_start(this_month - timedelta(days=1))
+        if through >= this_month:
+            raise CommandError("Only months that have ended can be closed")
+        schemas = options["schemas"] or list(
+            Client.objects.exclude(schema_name=get_public_schema_name())
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        for schema in schemas:
+            with schema_context(schema):
+                for entity in EntityModel.objects.order_by("created"):
+                    refreshed = refresh_stale_periods(entity)
+                    closed = (
+                        [] if options["refresh_only"] else close_period(entity, through)
+                    )
+                    self.stdout.write(
+                        f"{schema}/{entity.slug}: closed {len(closed)} months, "
+                        f"recomputed {len(refreshed)} stale months"
+                    )
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django_ledger.models import EntityModel
+from django_tenants.utils import schema_context
+
+from accounting.services.journal_import import (
+    IMPORT_FORMATS,
+    JournalImportError,
+    import_journal_entries,
+    parse_rows,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports journal entries from an NDJSON or CSV file into a tenant's "
+        "ledgers, printing each rejected row"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name")
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--entity", help="Entity slug, defaults to the first entity")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="Defaults to the file extension (.csv, anything else is NDJSON)",
+        )
+        parser.add_argument("--chunk-size", type=int, help="Entries per bulk insert")
+        parser.add_argument(
+            "--unposted", action="store_true", help="Leave the entries unposted"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and insert, then roll everything back",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["format"] or ("csv" if path.suffix == ".csv" else "ndjson")
+
+        with schema_context(options["schema_name"]):
+            entities = EntityModel.objects.order_by("created")
+            if options["entity"]:
+                entities = entities.filter(slug=options["entity"])
+            entity = entities.first()
+            if entity is None:
+                raise CommandError("Entity not found")
+
+            try:
+                with path.open("rb") as stream, transaction.atomic():
+                    summary = self._import(entity, stream, import_format, options)
+                    if options["dry_run"]:
+                        raise Rollback
+            except Rollback:
+                pass
+            except (OSError, JournalImportError) as e:
+                raise CommandError(e)
+
+        self.stdout.write(
+            f"{summary['rows']} rows, {summary['entries']} entries: "
+            f"{summary['imported']} imported, {summary['rejected']} rejected"
+            + (" (rolled back)" if options["dry_run"] else "")
+        )
+
+    def _import(self, entity, stream, import_format, options):
+        results = import_journal_entries(
+            entity,
+            parse_rows(stream, import_format),
+            chunk_size=options["chunk_size"],
+            post=not options["unposted"],
+        )
+        for result in results:
+            if "summary" in result:
+                return result["summary"]
+            entry = f" entry {result['entry']}" if result["entry"] else ""
+            self.stdout.write(
+                self.style.WARNING(f"line {result['line']}{entry}: ")
+                + "; ".join(result["errors"])
+            )
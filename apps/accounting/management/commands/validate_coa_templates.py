@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting.services.coa_templates import (
+    TEMPLATES_DIR,
+    CoATemplateError,
+    load_template,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Validates chart of accounts templates, by default every file in "
+        "data/coa_templates"
+    )
+    # a broken template fails the system checks, which must not stop this command
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", type=Path)
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or sorted(TEMPLATES_DIR.glob("*.json"))
+        failed = 0
+        for path in paths:
+            try:
+                template = load_template(path)
+            except CoATemplateError as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{path.name}: invalid"))
+                for error in e.errors:
+                    self.stdout.write(f"  {error}")
+                continue
+            self.stdout.write(
+                f"{path.name}: {template.name}, {template.currency or '-'}, "
+                f"{template.account_count} accounts"
+            )
+
+        if failed:
+            raise CommandError(f"{failed} of {len(paths)} templates are invalid")
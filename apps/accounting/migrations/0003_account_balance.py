@@ -0,0 +1,233 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:50
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = "accounting_accountbalance"
+TX_TABLE = "django_ledger_transactionmodel"
+JE_TABLE = "django_ledger_journalentrymodel"
+
+# Periods are months in TIME_ZONE, baked in here. If TIME_ZONE changes,
+# recreate this function and run check_balance_snapshots --rebuild.
+PERIOD_SQL = f"""
+CREATE OR REPLACE FUNCTION accounting_balance_period(ts timestamp with time zone)
+RETURNS date LANGUAGE sql IMMUTABLE AS $$
+    SELECT date_trunc('month', ts AT TIME ZONE '{settings.TIME_ZONE}')::date
+$$;
+"""
+
+# Adds signed (ledger, account, period) activity to the snapshots. Rows for
+# a new period open with the closing totals of the account's previous
+# period, then the closing totals of that period and every later one move
+# by the activity. Postings per ledger are serialised on an advisory lock
+# so a new row never reads a previous period another transaction is
+# still changing.
+APPLY_SQL = f"""
+CREATE OR REPLACE FUNCTION accounting_balance_apply(
+    ledgers uuid[], accounts uuid[], periods date[], debits numeric[], credits numeric[]
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    ledger uuid;
+BEGIN
+    IF ledgers IS NULL THEN
+        RETURN;
+    END IF;
+    FOR ledger IN SELECT DISTINCT l FROM unnest(ledgers) l ORDER BY l LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('accounting-balance:' || ledger::text));
+    END LOOP;
+
+    INSERT INTO {TABLE} (
+        id, created_at, updated_at, ledger_id, account_id, period,
+        debit, credit, closing_debit, closing_credit
+    )
+    SELECT gen_random_uuid(), now(), now(), d.ledger_id, d.account_id, d.period,
+           d.debit, d.credit,
+           COALESCE(prev.closing_debit, 0), COALESCE(prev.closing_credit, 0)
+    FROM unnest(ledgers, accounts, periods, debits, credits)
+        AS d(ledger_id, account_id, period, debit, credit)
+    LEFT JOIN LATERAL (
+        SELECT b.closing_debit, b.closing_credit FROM {TABLE} b
+        WHERE b.ledger_id = d.ledger_id AND b.account_id = d.account_id
+          AND b.period < d.period
+        ORDER BY b.period DESC LIMIT 1
+    ) prev ON true
+    ON CONFLICT (ledger_id, account_id, period) DO UPDATE SET
+        debit = {TABLE}.debit + EXCLUDED.debit,
+        credit = {TABLE}.credit + EXCLUDED.credit,
+        updated_at = EXCLUDED.updated_at;
+
+    UPDATE {TABLE} b SET
+        closing_debit = b.closing_debit + s.debit,
+        closing_credit = b.closing_credit + s.credit
+    FROM (
+        SELECT b.id, SUM(d.debit) AS debit, SUM(d.credit) AS credit
+        FROM {TABLE} b
+        JOIN unnest(ledgers, accounts, periods, debits, credits)
+            AS d(ledger_id, account_id, period, debit, credit)
+          ON b.ledger_id = d.ledger_id AND b.account_id = d.account_id
+         AND b.period >= d.period
+        GROUP BY b.id
+    ) s
+    WHERE b.id = s.id;
+END
+$$;
+"""
+
+# Signed activity of a set of transactions filed under a journal entry
+# state. Only posted entries count, and closing entries never do.
+ACTIVITY = """
+    SELECT {je}.ledger_id, t.account_id,
+           accounting_balance_period({je}.timestamp) AS period,
+           {sign} CASE WHEN t.tx_type = 'debit' THEN t.amount ELSE 0 END AS debit,
+           {sign} CASE WHEN t.tx_type = 'credit' THEN t.amount ELSE 0 END AS credit
+    FROM {source}
+    WHERE {je}.posted AND NOT {je}.is_closing_entry {extra}
+"""
+
+APPLY_ACTIVITY = """
+    PERFORM accounting_balance_apply(
+        array_agg(ledger_id), array_agg(account_id), array_agg(period),
+        array_agg(debit), array_agg(credit)
+    )
+    FROM (
+        SELECT ledger_id, account_id, period, SUM(debit) AS debit, SUM(credit) AS credit
+        FROM ({activity}) a
+        GROUP BY 1, 2, 3
+        HAVING SUM(debit) <> 0 OR SUM(credit) <> 0
+    ) d;
+"""
+
+
+def _trigger_function(name, activity):
+    return f"""
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+{APPLY_ACTIVITY.format(activity=activity)}
+    RETURN NULL;
+END
+$$;
+"""
+
+
+TX_NEW = ACTIVITY.format(
+    je="je", sign="", extra="",
+    source=f"new_rows t JOIN {JE_TABLE} je ON je.uuid = t.journal_entry_id",
+)
+TX_OLD = ACTIVITY.format(
+    je="je", sign="-", extra="",
+    source=f"old_rows t JOIN {JE_TABLE} je ON je.uuid = t.journal_entry_id",
+)
+
+# An entry moves in or out of the snapshots when it is posted or unposted,
+# or while posted changes ledger or month
+JE_MOVED = (
+    "AND (NOT {other}.posted OR {other}.is_closing_entry"
+    " OR {other}.ledger_id <> {je}.ledger_id"
+    " OR accounting_balance_period({other}.timestamp)"
+    " <> accounting_balance_period({je}.timestamp))"
+)
+JE_NEW = ACTIVITY.format(
+    je="n", sign="",
+    source=f"new_rows n JOIN old_rows o ON o.uuid = n.uuid"
+    f" JOIN {TX_TABLE} t ON t.journal_entry_id = n.uuid",
+    extra=JE_MOVED.format(je="n", other="o"),
+)
+JE_OLD = ACTIVITY.format(
+    je="o", sign="-",
+    source=f"old_rows o JOIN new_rows n ON n.uuid = o.uuid"
+    f" JOIN {TX_TABLE} t ON t.journal_entry_id = o.uuid",
+    extra=JE_MOVED.format(je="o", other="n"),
+)
+
+TRIGGERS_SQL = (
+    _trigger_function("accounting_balance_tx_insert", TX_NEW)
+    + _trigger_function("accounting_balance_tx_delete", TX_OLD)
+    + _trigger_function("accounting_balance_tx_update", f"{TX_NEW} UNION ALL {TX_OLD}")
+    + _trigger_function("accounting_balance_je_update", f"{JE_NEW} UNION ALL {JE_OLD}")
+    + f"""
+CREATE TRIGGER accounting_balance_tx_insert
+AFTER INSERT ON {TX_TABLE} REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_balance_tx_insert();
+
+CREATE TRIGGER accounting_balance_tx_delete
+AFTER DELETE ON {TX_TABLE} REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_balance_tx_delete();
+
+CREATE TRIGGER accounting_balance_tx_update
+AFTER UPDATE ON {TX_TABLE} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_balance_tx_update();
+
+CREATE TRIGGER accounting_balance_je_update
+AFTER UPDATE ON {JE_TABLE} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_balance_je_update();
+"""
+)
+
+DROP_SQL = f"""
+DROP TRIGGER IF EXISTS accounting_balance_tx_insert ON {TX_TABLE};
+DROP TRIGGER IF EXISTS accounting_balance_tx_delete ON {TX_TABLE};
+DROP TRIGGER IF EXISTS accounting_balance_tx_update ON {TX_TABLE};
+DROP TRIGGER IF EXISTS accounting_balance_je_update ON {JE_TABLE};
+DROP FUNCTION IF EXISTS accounting_balance_tx_insert();
+DROP FUNCTION IF EXISTS accounting_balance_tx_delete();
+DROP FUNCTION IF EXISTS accounting_balance_tx_update();
+DROP FUNCTION IF EXISTS accounting_balance_je_update();
+DROP FUNCTION IF EXISTS accounting_balance_apply(uuid[], uuid[], date[], numeric[], numeric[]);
+DROP FUNCTION IF EXISTS accounting_balance_period(timestamp with time zone);
+"""
+
+# Snapshots for entries posted before this migration
+BACKFILL_SQL = f"""
+INSERT INTO {TABLE} (
+    id, created_at, updated_at, ledger_id, account_id, period,
+    debit, credit, closing_debit, closing_credit
+)
+SELECT gen_random_uuid(), now(), now(), ledger_id, account_id, period,
+       debit, credit,
+       SUM(debit) OVER w, SUM(credit) OVER w
+FROM (
+    SELECT je.ledger_id, t.account_id,
+           accounting_balance_period(je.timestamp) AS period,
+           SUM(CASE WHEN t.tx_type = 'debit' THEN t.amount ELSE 0 END) AS debit,
+           SUM(CASE WHEN t.tx_type = 'credit' THEN t.amount ELSE 0 END) AS credit
+    FROM {TX_TABLE} t
+    JOIN {JE_TABLE} je ON je.uuid = t.journal_entry_id
+    WHERE je.posted AND NOT je.is_closing_entry
+    GROUP BY 1, 2, 3
+) s
+WINDOW w AS (PARTITION BY ledger_id, account_id ORDER BY period);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0002_alter_accountingentity_accounting_method_and_more'),
+        ('django_ledger', '0029_stagedtransactionmodel_matched_transaction_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('period', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('closing_debit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('closing_credit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='django_ledger.accountmodel')),
+                ('ledger', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_snapshots', to='django_ledger.ledgermodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('ledger', 'account', 'period'), name='accounting_balance_period_uniq')],
+            },
+        ),
+        migrations.RunSQL(PERIOD_SQL + APPLY_SQL + TRIGGERS_SQL, DROP_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
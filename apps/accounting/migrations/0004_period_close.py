@@ -0,0 +1,110 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:54
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+CLOSE_TABLE = "accounting_periodclose"
+BALANCE_TABLE = "accounting_accountbalance"
+LEDGER_TABLE = "django_ledger_ledgermodel"
+
+# A closed month goes stale when a snapshot row of one of the entity's
+# ledgers changes in or before it: closing totals carry forward, so every
+# closed month from the earliest change on is affected.
+INVALIDATE_SQL = f"""
+CREATE OR REPLACE FUNCTION accounting_period_close_invalidate() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE {CLOSE_TABLE} c SET status = 'stale', updated_at = now()
+    FROM (
+        SELECT l.entity_id, MIN(n.period) AS period
+        FROM new_rows n JOIN {LEDGER_TABLE} l ON l.uuid = n.ledger_id
+        GROUP BY l.entity_id
+    ) t
+    WHERE c.entity_id = t.entity_id AND c.period >= t.period AND c.status = 'closed';
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER accounting_period_close_invalidate_insert
+AFTER INSERT ON {BALANCE_TABLE} REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_period_close_invalidate();
+
+CREATE TRIGGER accounting_period_close_invalidate_update
+AFTER UPDATE ON {BALANCE_TABLE} REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_period_close_invalidate();
+
+-- posting or unposting a whole ledger changes every closed month
+CREATE OR REPLACE FUNCTION accounting_period_close_ledger_posted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE {CLOSE_TABLE} c SET status = 'stale', updated_at = now()
+    FROM new_rows n JOIN old_rows o ON o.uuid = n.uuid
+    WHERE n.posted IS DISTINCT FROM o.posted
+      AND c.entity_id = n.entity_id AND c.status = 'closed';
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER accounting_period_close_ledger_posted
+AFTER UPDATE ON {LEDGER_TABLE} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounting_period_close_ledger_posted();
+"""
+
+DROP_SQL = f"""
+DROP TRIGGER IF EXISTS accounting_period_close_invalidate_insert ON {BALANCE_TABLE};
+DROP TRIGGER IF EXISTS accounting_period_close_invalidate_update ON {BALANCE_TABLE};
+DROP TRIGGER IF EXISTS accounting_period_close_ledger_posted ON {LEDGER_TABLE};
+DROP FUNCTION IF EXISTS accounting_period_close_invalidate();
+DROP FUNCTION IF EXISTS accounting_period_close_ledger_posted();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0003_account_balance'),
+        ('django_ledger', '0029_stagedtransactionmodel_matched_transaction_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodClose',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('period', models.DateField()),
+                ('status', models.CharField(choices=[('closed', 'Closed'), ('stale', 'Stale')], default='closed', max_length=10)),
+                ('closed_at', models.DateTimeField()),
+                ('recomputed_at', models.DateTimeField(blank=True, null=True)),
+                ('closed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_closes', to='django_ledger.entitymodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entity', 'period'), name='accounting_period_close_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PeriodRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('period', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('closing_debit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('closing_credit', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_rollups', to='django_ledger.accountmodel')),
+                ('entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_rollups', to='django_ledger.entitymodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entity', 'period', 'account'), name='accounting_period_rollup_uniq')],
+            },
+        ),
+        migrations.RunSQL(INVALIDATE_SQL, DROP_SQL),
+    ]
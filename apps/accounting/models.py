@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.db import models
 from django.db.models import SET_NULL
 from django_ledger.models import EntityModel, LedgerModel
 from commons.mixins import ModelMixin
 
+from accounting.enums import PeriodCloseStatus
+
 
 class AccountingEntity(EntityModel):
     """Extends Django Ledger Entity with custom fields"""
@@ -28,6 +31,99 @@ class AccountingEntity(EntityModel):
         verbose_name_plural = "Accounting Entities"
 
 
+class AccountBalance(ModelMixin):
+    """
+    Debits and credits posted to an account in one ledger during one month,
+    plus the running (closing) totals up to the end of that month. Kept up
+    to date as journal entries are posted, see services/balances.py.
+    """
+
+    ledger = models.ForeignKey(
+        LedgerModel, on_delete=models.CASCADE, related_name="balance_snapshots"
+    )
+    account = models.ForeignKey(
+        "django_ledger.AccountModel",
+        on_delete=models.CASCADE,
+        related_name="balance_snapshots",
+    )
+    # first day of the month
+    period = models.DateField()
+    debit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    closing_debit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    closing_credit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ledger", "account", "period"],
+                name="accounting_balance_period_uniq",
+            )
+        ]
+
+
+class PeriodClose(ModelMixin):
+    """
+    A closed month of an entity's books. Its PeriodRollup rows are what
+    statements read for the month; a back-dated posting marks it STALE
+    until the rollups are recomputed, see services/closing.py.
+    """
+
+    entity = models.ForeignKey(
+        EntityModel, on_delete=models.CASCADE, related_name="period_closes"
+    )
+    # first day of the month
+    period = models.DateField()
+    status = models.CharField(
+        max_length=10,
+        choices=PeriodCloseStatus.choices,
+        default=PeriodCloseStatus.CLOSED,
+    )
+    closed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=SET_NULL, null=True, blank=True
+    )
+    closed_at = models.DateTimeField()
+    recomputed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity", "period"], name="accounting_period_close_uniq"
+            )
+        ]
+
+
+class PeriodRollup(ModelMixin):
+    """
+    An account's activity in a closed month across the entity's posted
+    ledgers, and its closing totals at the end of the month. Every account
+    with activity up to the month has a row, so the closing totals at a
+    closed month are a single-period read.
+    """
+
+    entity = models.ForeignKey(
+        EntityModel, on_delete=models.CASCADE, related_name="period_rollups"
+    )
+    account = models.ForeignKey(
+        "django_ledger.AccountModel",
+        on_delete=models.CASCADE,
+        related_name="period_rollups",
+    )
+    period = models.DateField()
+    debit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    closing_debit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    closing_credit = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity", "period", "account"],
+                name="accounting_period_rollup_uniq",
+            )
+        ]
+
+
 # class AccountingEntity(EntityModel):
 #     """Extends Django Ledger Entity with custom fields"""
 
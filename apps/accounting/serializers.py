@@ -0,0 +1,89 @@
+from rest_framework import serializers
+
+
+def _money(**kwargs):
+    return serializers.DecimalField(max_digits=20, decimal_places=2, **kwargs)
+
+
+class StatementQuerySerializer(serializers.Serializer):
+    """Query parameters shared by the statement endpoints."""
+
+    as_of = serializers.DateField(required=False, help_text="Defaults to today")
+    entity = serializers.SlugField(
+        required=False, help_text="Entity slug, defaults to the tenant's entity"
+    )
+    ledger = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Limit to these ledgers, defaults to every posted ledger",
+    )
+
+
+class TrialBalanceRowSerializer(serializers.Serializer):
+    account_id = serializers.UUIDField()
+    code = serializers.CharField()
+    name = serializers.CharField()
+    role = serializers.CharField()
+    balance_type = serializers.CharField()
+    debit = _money()
+    credit = _money()
+    balance = _money()
+
+
+class TrialBalanceSerializer(serializers.Serializer):
+    as_of = serializers.DateField()
+    accounts = TrialBalanceRowSerializer(many=True)
+    total_debit = _money()
+    total_credit = _money()
+    balanced = serializers.BooleanField()
+
+
+class BalanceSheetSectionSerializer(serializers.Serializer):
+    accounts = TrialBalanceRowSerializer(many=True)
+    total = _money()
+
+
+class EquitySectionSerializer(BalanceSheetSectionSerializer):
+    earnings = _money()
+
+
+class BalanceSheetSerializer(serializers.Serializer):
+    as_of = serializers.DateField()
+    assets = BalanceSheetSectionSerializer()
+    liabilities = BalanceSheetSectionSerializer()
+    equity = EquitySectionSerializer()
+    balanced = serializers.BooleanField()
+
+
+class IncomeStatementQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField(required=False, help_text="Defaults to today")
+    entity = serializers.SlugField(
+        required=False, help_text="Entity slug, defaults to the tenant's entity"
+    )
+
+    def validate(self, attrs):
+        if attrs.get("end") and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"start": "Must not be after end"})
+        return attrs
+
+
+class IncomeStatementSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    revenue = BalanceSheetSectionSerializer()
+    cost_of_goods_sold = BalanceSheetSectionSerializer()
+    gross_profit = _money()
+    expenses = BalanceSheetSectionSerializer()
+    net_income = _money()
+
+
+class PeriodCloseRequestSerializer(serializers.Serializer):
+    period = serializers.DateField(help_text="Any day of the month")
+    entity = serializers.SlugField(
+        required=False, help_text="Entity slug, defaults to the tenant's entity"
+    )
+
+
+class PeriodCloseResultSerializer(serializers.Serializer):
+    periods = serializers.ListField(child=serializers.DateField())
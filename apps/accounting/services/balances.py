@@ -0,0 +1,329 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Case, DateField, DecimalField, F, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django_ledger.io.roles import (
+    CREDIT,
+    DEBIT,
+    GROUP_ASSETS,
+    GROUP_CAPITAL,
+    GROUP_EARNINGS,
+    GROUP_LIABILITIES,
+)
+from django_ledger.models import AccountModel, EntityModel, LedgerModel, TransactionModel
+
+from accounting.models import AccountBalance
+
+ZERO = Decimal("0.00")
+
+# Same statement as the backfill in migration 0003
+REBUILD_SQL = """
+INSERT INTO accounting_accountbalance (
+    id, created_at, updated_at, ledger_id, account_id, period,
+    debit, credit, closing_debit, closing_credit
+)
+SELECT gen_random_uuid(), now(), now(), ledger_id, account_id, period,
+       debit, credit,
+       SUM(debit) OVER w, SUM(credit) OVER w
+FROM (
+    SELECT je.ledger_id, t.account_id,
+           accounting_balance_period(je.timestamp) AS period,
+           SUM(CASE WHEN t.tx_type = 'debit' THEN t.amount ELSE 0 END) AS debit,
+           SUM(CASE WHEN t.tx_type = 'credit' THEN t.amount ELSE 0 END) AS credit
+    FROM django_ledger_transactionmodel t
+    JOIN django_ledger_journalentrymodel je ON je.uuid = t.journal_entry_id
+    WHERE je.posted AND NOT je.is_closing_entry AND je.ledger_id = ANY(%s::uuid[])
+    GROUP BY 1, 2, 3
+) s
+WINDOW w AS (PARTITION BY ledger_id, account_id ORDER BY period)
+"""
+
+
+def month_start(value) -> date:
+    """
+    The period an entry falls in: the first day of its month in TIME_ZONE,
+    like accounting_balance_period() in the database.
+    """
+    if hasattr(value, "tzinfo"):
+        value = timezone.localdate(value)
+    return value.replace(day=1)
+
+
+def _amount(tx_type):
+    return Sum(
+        Case(
+            When(tx_type=tx_type, then=F("amount")),
+            default=Value(ZERO),
+            output_field=DecimalField(max_digits=20, decimal_places=2),
+        )
+    )
+
+
+def _posted(transactions):
+    # closing entries restate balances, django_ledger leaves them out of
+    # aggregation and so do the snapshots
+    return transactions.filter(
+        journal_entry__posted=True, journal_entry__is_closing_entry=False
+    )
+
+
+def _activity(transactions):
+    """(ledger, account, period) -> [debit, credit] for a TransactionModel queryset."""
+    rows = (
+        transactions.annotate(
+            period=TruncMonth("journal_entry__timestamp", output_field=DateField())
+        )
+        .values("journal_entry__ledger_id", "account_id", "period")
+        .annotate(debit=_amount(DEBIT), credit=_amount(CREDIT))
+        .order_by()
+    )
+    return {
+        (row["journal_entry__ledger_id"], row["account_id"], row["period"]): [
+            row["debit"],
+            row["credit"],
+        ]
+        for row in rows
+    }
+
+
+def _lock_ledgers(ledger_ids):
+    # the same lock accounting_balance_apply() takes, see migration 0003
+    with connection.cursor() as cursor:
+        for ledger_id in sorted(str(pk) for pk in ledger_ids):
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))",
+                ["accounting-balance:" + ledger_id],
+            )
+
+
+def expected_snapshots(ledger_ids: Iterable) -> dict:
+    """
+    (ledger, account, period) -> (debit, credit, closing_debit,
+    closing_credit) recomputed from every posted transaction.
+    """
+    activity = _activity(
+        _posted(TransactionModel.objects.filter(journal_entry__ledger_id__in=list(ledger_ids)))
+    )
+    expected = {}
+    running = {}
+    for key in sorted(activity, key=lambda k: (str(k[0]), str(k[1]), k[2])):
+        debit, credit = activity[key]
+        closing_debit, closing_credit = running.get(key[:2], (ZERO, ZERO))
+        running[key[:2]] = (closing_debit + debit, closing_credit + credit)
+        expected[key] = (debit, credit, *running[key[:2]])
+    return expected
+
+
+def find_drift(ledger_ids: Iterable) -> list:
+    """
+    Compares the stored snapshots with a full recompute. Returns one
+    (key, stored, expected) tuple per period that differs. Unposting can
+    leave a row with no activity, which must then carry the closing totals
+    of the period before it.
+    """
+    ledger_ids = list(ledger_ids)
+    expected = expected_snapshots(ledger_ids)
+    stored = {
+        (row[0], row[1], row[2]): tuple(row[3:])
+        for row in AccountBalance.objects.filter(ledger_id__in=ledger_ids).values_list(
+            "ledger_id",
+            "account_id",
+            "period",
+            "debit",
+            "credit",
+            "closing_debit",
+            "closing_credit",
+        )
+    }
+    periods = defaultdict(list)
+    for ledger_id, account_id, period in sorted(expected, key=lambda k: k[2]):
+        periods[(ledger_id, account_id)].append(period)
+
+    drift = []
+    for key in set(expected) | set(stored):
+        want = expected.get(key)
+        have = stored.get(key)
+        if want is None and have is not None and not any(have[:2]):
+            earlier = [p for p in periods[key[:2]] if p < key[2]]
+            want = (ZERO, ZERO) + (
+                expected[key[:2] + (earlier[-1],)][2:] if earlier else (ZERO, ZERO)
+            )
+        if have != want:
+            drift.append((key, have, want))
+    return sorted(drift, key=lambda d: (str(d[0][0]), str(d[0][1]), d[0][2]))
+
+
+def rebuild_snapshots(ledger_ids: Iterable) -> int:
+    """Replaces the ledgers' snapshots with a full recompute, in SQL."""
+    ledger_ids = list(ledger_ids)
+    with transaction.atomic():
+        _lock_ledgers(ledger_ids)
+        AccountBalance.objects.filter(ledger_id__in=ledger_ids).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(REBUILD_SQL, [ledger_ids])
+            return cursor.rowcount
+
+
+def posted_ledger_ids(entity: EntityModel, ledger_ids: Optional[Iterable] = None) -> list:
+    ledgers = LedgerModel.objects.filter(entity=entity, posted=True)
+    if ledger_ids is not None:
+        ledgers = ledgers.filter(uuid__in=list(ledger_ids))
+    return list(ledgers.values_list("uuid", flat=True))
+
+
+def next_month(period: date) -> date:
+    return (period + timedelta(days=32)).replace(day=1)
+
+
+def last_full_month(as_of: date) -> date:
+    """The last month that ends on or before `as_of`."""
+    period = month_start(as_of)
+    if as_of + timedelta(days=1) == next_month(period):
+        return period
+    return month_start(period - timedelta(days=1))
+
+
+def _add(totals, rows):
+    for account_id, debit, credit in rows:
+        totals[account_id][0] += debit
+        totals[account_id][1] += credit
+    return totals
+
+
+def snapshot_totals(ledger_ids: Iterable, through: date, totals=None):
+    """
+    Adds account id -> [debit, credit] posted up to the end of month
+    `through` into `totals`, reading one snapshot row per ledger and account.
+    """
+    latest = (
+        AccountBalance.objects.filter(ledger_id__in=list(ledger_ids), period__lte=through)
+        .order_by("ledger_id", "account_id", "-period")
+        .distinct("ledger_id", "account_id")
+        .values_list("account_id", "closing_debit", "closing_credit")
+    )
+    return _add(totals if totals is not None else defaultdict(lambda: [ZERO, ZERO]), latest)
+
+
+def transaction_totals(ledger_ids: Iterable, start: date, end: date, totals=None):
+    """
+    Adds account id -> [debit, credit] posted from `start` to `end`
+    inclusive into `totals`, from the transactions themselves. Meant for the
+    part of a month a snapshot does not cover.
+    """
+    partial = _activity(
+        _posted(
+            TransactionModel.objects.filter(
+                journal_entry__ledger_id__in=list(ledger_ids),
+                journal_entry__timestamp__date__gte=start,
+                journal_entry__timestamp__date__lte=end,
+            )
+        )
+    )
+    return _add(
+        totals if totals is not None else defaultdict(lambda: [ZERO, ZERO]),
+        ((account_id, debit, credit) for (_, account_id, _), (debit, credit) in partial.items()),
+    )
+
+
+def account_totals(
+    entity: EntityModel, as_of: Optional[date] = None, ledger_ids: Optional[Iterable] = None
+) -> dict:
+    """
+    account id -> (debit, credit) posted up to the end of `as_of` (today by
+    default), over the entity's posted ledgers, like django_ledger's own
+    balances. Reads one snapshot row per ledger and account; a date inside
+    a month adds that month's transactions up to the date.
+    """
+    as_of = as_of or timezone.localdate()
+    ledger_ids = posted_ledger_ids(entity, ledger_ids)
+    through = last_full_month(as_of)
+    totals = snapshot_totals(ledger_ids, through)
+    if next_month(through) <= as_of:
+        transaction_totals(ledger_ids, next_month(through), as_of, totals)
+    return {account_id: tuple(values) for account_id, values in totals.items()}
+
+
+def trial_balance(
+    entity: EntityModel,
+    as_of: Optional[date] = None,
+    ledger_ids: Optional[Iterable] = None,
+    totals: Optional[dict] = None,
+) -> dict:
+    """
+    Every account with posted activity, with its balance on its normal
+    side, and whether total debits equal total credits. `totals` replaces
+    the snapshot read, e.g. with closing.account_activity().
+    """
+    if totals is None:
+        totals = account_totals(entity, as_of=as_of, ledger_ids=ledger_ids)
+    accounts = AccountModel.objects.filter(uuid__in=list(totals)).order_by("code")
+    rows = []
+    total_debit = total_credit = ZERO
+    for account in accounts:
+        debit, credit = totals[account.uuid]
+        net = debit - credit
+        rows.append(
+            {
+                "account_id": account.uuid,
+                "code": account.code,
+                "name": account.name,
+                "role": account.role,
+                "balance_type": account.balance_type,
+                "debit": net if net > 0 else ZERO,
+                "credit": -net if net < 0 else ZERO,
+                "balance": net if account.balance_type == DEBIT else -net,
+            }
+        )
+        total_debit += rows[-1]["debit"]
+        total_credit += rows[-1]["credit"]
+    return {
+        "as_of": as_of or timezone.localdate(),
+        "accounts": rows,
+        "total_debit": total_debit,
+        "total_credit": total_credit,
+        "balanced": total_debit == total_credit,
+    }
+
+
+def balance_sheet(
+    entity: EntityModel,
+    as_of: Optional[date] = None,
+    ledger_ids: Optional[Iterable] = None,
+    totals: Optional[dict] = None,
+) -> dict:
+    """
+    Assets, liabilities and equity from the trial balance. Income, COGS and
+    expense accounts are not closed into equity in django_ledger, so their
+    net is reported as earnings inside equity.
+    """
+    trial = trial_balance(entity, as_of=as_of, ledger_ids=ledger_ids, totals=totals)
+
+    def net(roles, side):
+        # contra accounts (accumulated depreciation, dividends) net against
+        # their section instead of adding to it
+        accounts = [row for row in trial["accounts"] if row["role"] in roles]
+        total = sum((row["debit"] - row["credit"] for row in accounts), ZERO)
+        return accounts, total if side == DEBIT else -total
+
+    def section(roles, side):
+        accounts, total = net(roles, side)
+        return {"accounts": accounts, "total": total}
+
+    assets = section(GROUP_ASSETS, DEBIT)
+    liabilities = section(GROUP_LIABILITIES, CREDIT)
+    equity = section(GROUP_CAPITAL, CREDIT)
+    _, earnings = net(GROUP_EARNINGS, CREDIT)
+    equity["earnings"] = earnings
+    equity["total"] += earnings
+    return {
+        "as_of": trial["as_of"],
+        "assets": assets,
+        "liabilities": liabilities,
+        "equity": equity,
+        "balanced": assets["total"] == liabilities["total"] + equity["total"],
+    }
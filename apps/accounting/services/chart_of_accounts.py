@@ -0,0 +1,235 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from django.db import transaction
+from django_ledger.io.roles import ROOT_COA, ROOT_GROUP_LEVEL_2, ROOT_GROUP_META
+from django_ledger.models import AccountModel, ChartOfAccountModel, EntityModel
+from django_ledger.models.coa_default import CHART_OF_ACCOUNTS_ROOT_MAP, PREFIX_MAP
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / "data" / "coa_default.json"
+
+# Fields compared when checking a seeded chart against django_ledger's own
+SNAPSHOT_FIELDS = (
+    "path",
+    "code",
+    "name",
+    "role",
+    "role_default",
+    "balance_type",
+    "locked",
+    "active",
+)
+
+BULK_BATCH_SIZE = 500
+
+
+class ChartOfAccountsSeedError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class SnapshotNode:
+    """
+    One account of the default tree. `path` is the treebeard materialized
+    path relative to the CoA root node, so "" is the root itself, "0001"
+    its first child and so on.
+    """
+
+    path: str
+    code: str
+    name: str
+    role: str
+    role_default: Optional[bool]
+    balance_type: str
+    locked: bool
+    active: bool
+    numchild: int = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.path) // AccountModel.steplen + 1
+
+
+def _step(number: int) -> str:
+    return AccountModel._get_path(None, 1, number)
+
+
+def group_accounts(accounts) -> dict:
+    """
+    root role -> accounts under it, ordered the way django_ledger orders
+    DEFAULT_CHART_OF_ACCOUNTS before inserting it.
+    """
+    grouped = {}
+    for account in sorted(
+        accounts,
+        key=lambda a: (PREFIX_MAP[a["role"].split("_")[0]], a["role"], a["code"]),
+    ):
+        grouped.setdefault(PREFIX_MAP[account["role"].split("_")[0]], []).append(account)
+    return grouped
+
+
+def build_snapshot(root_map: Optional[dict] = None) -> list:
+    """
+    Walks `root_map` (django_ledger's CHART_OF_ACCOUNTS_ROOT_MAP by default)
+    in the order create_chart_of_accounts and populate_default_coa insert it
+    and returns the rows they would produce.
+    """
+    if root_map is None:
+        root_map = CHART_OF_ACCOUNTS_ROOT_MAP
+    nodes = []
+
+    def add(path, code, name, role, role_default, balance_type, locked, active):
+        nodes.append(
+            {
+                "path": path,
+                "code": code,
+                "name": name,
+                "role": role,
+                "role_default": role_default,
+                "balance_type": balance_type,
+                "locked": locked,
+                "active": active,
+            }
+        )
+
+    meta = ROOT_GROUP_META[ROOT_COA]
+    add("", meta["code"], meta["title"], ROOT_COA, True, meta["balance_type"], True, False)
+
+    group_paths = {}
+    for number, root_role in enumerate(ROOT_GROUP_LEVEL_2, start=1):
+        meta = ROOT_GROUP_META[root_role]
+        group_paths[root_role] = _step(number)
+        add(
+            group_paths[root_role],
+            meta["code"],
+            meta["title"],
+            root_role,
+            True,
+            meta["balance_type"],
+            True,
+            False,
+        )
+
+    for root_role, accounts in root_map.items():
+        seen_roles = set()
+        for number, account in enumerate(accounts, start=1):
+            # the first account of each role is its default, the others are
+            # stored as NULL so the (coa, role, role_default) constraint holds
+            role_default = True if account["role"] not in seen_roles else None
+            seen_roles.add(account["role"])
+            add(
+                group_paths[root_role] + _step(number),
+                account["code"],
+                account["name"],
+                account["role"],
+                role_default,
+                account["balance_type"],
+                False,
+                False,
+            )
+    return nodes
+
+
+def compile_snapshot(nodes) -> tuple:
+    """Freezes snapshot rows into SnapshotNodes, counting each node's children."""
+    steplen = AccountModel.steplen
+    numchild = {}
+    for node in nodes:
+        if node["path"]:
+            parent = node["path"][:-steplen]
+            numchild[parent] = numchild.get(parent, 0) + 1
+    return tuple(
+        SnapshotNode(numchild=numchild.get(node["path"], 0), **node) for node in nodes
+    )
+
+
+@lru_cache(maxsize=1)
+def default_snapshot() -> tuple:
+    """The snapshot in data/coa_default.json, read once per process."""
+    try:
+        raw = json.loads(SNAPSHOT_PATH.read_text())
+    except (OSError, ValueError) as e:
+        raise ChartOfAccountsSeedError(f"Cannot read {SNAPSHOT_PATH}: {e}")
+    return compile_snapshot(raw["nodes"])
+
+
+def _next_root_path() -> str:
+    last_root = AccountModel.get_last_root_node()
+    if last_root is None:
+        return _step(1)
+    return _step(AccountModel._str2int(last_root.path) + 1)
+
+
+def seed_chart_of_accounts(
+    entity: EntityModel,
+    coa_name: Optional[str] = None,
+    assign_as_default: bool = True,
+    activate_accounts: bool = False,
+    snapshot: Optional[tuple] = None,
+) -> ChartOfAccountModel:
+    """
+    Creates a chart of accounts holding the same rows as
+    entity.create_chart_of_accounts() followed by populate_default_coa(),
+    written with one bulk insert instead of a treebeard call per account.
+    `snapshot` replaces the default accounts, e.g. with a country
+    template's. Must run in the tenant's schema.
+    """
+    if snapshot is None:
+        snapshot = default_snapshot()
+
+    with transaction.atomic():
+        coa = ChartOfAccountModel(
+            name=coa_name or f"{entity.name} CoA", entity=entity
+        )
+        coa.clean()
+        # the roots come from the snapshot, stop post_save from configure()-ing
+        coa.configured = True
+        coa.save()
+
+        root_path = _next_root_path()
+        AccountModel.objects.bulk_create(
+            [
+                AccountModel(
+                    path=root_path + node.path,
+                    depth=node.depth,
+                    numchild=node.numchild,
+                    code=node.code,
+                    name=node.name,
+                    role=node.role,
+                    role_default=node.role_default,
+                    balance_type=node.balance_type,
+                    locked=node.locked,
+                    # roots stay inactive, like configure() leaves them
+                    active=activate_accounts if node.depth > 2 else node.active,
+                    coa_model=coa,
+                )
+                for node in snapshot
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        if assign_as_default:
+            entity.default_coa = coa
+            entity.save(update_fields=["default_coa", "updated"])
+    return coa
+
+
+def chart_rows(coa: ChartOfAccountModel) -> list:
+    """
+    The chart's accounts in snapshot form, paths relative to its root, for
+    comparing charts built in different ways.
+    """
+    accounts = list(
+        AccountModel.objects.filter(coa_model=coa)
+        .order_by("path")
+        .values("depth", "numchild", *SNAPSHOT_FIELDS)
+    )
+    if not accounts:
+        return []
+    root_length = len(accounts[0]["path"])
+    for account in accounts:
+        account["path"] = account["path"][root_length:]
+    return accounts
@@ -0,0 +1,305 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Max, Min, Sum
+from django.utils import timezone
+from django_ledger.io.roles import GROUP_COGS, GROUP_EXPENSES, GROUP_INCOME
+from django_ledger.models import EntityModel
+
+from accounting.enums import PeriodCloseStatus
+from accounting.models import AccountBalance, PeriodClose, PeriodRollup
+from accounting.services import balances
+from accounting.services.balances import (
+    ZERO,
+    last_full_month,
+    month_start,
+    next_month,
+    posted_ledger_ids,
+    snapshot_totals,
+    transaction_totals,
+)
+
+BULK_BATCH_SIZE = 1000
+
+
+class PeriodCloseError(Exception):
+    pass
+
+
+def _months(first: date, last: date) -> list:
+    months = []
+    while first <= last:
+        months.append(first)
+        first = next_month(first)
+    return months
+
+
+def _lock_entity(entity: EntityModel):
+    # closes, reopens and recomputes of one entity run one at a time. The
+    # default manager outer joins the chart of accounts, which FOR UPDATE
+    # refuses, so the row is locked through the base manager
+    EntityModel._base_manager.select_for_update().filter(uuid=entity.uuid).exists()
+
+
+def _monthly_activity(entity: EntityModel, through: date) -> dict:
+    """account id -> [(period, debit, credit), ...] in period order, across posted ledgers."""
+    rows = (
+        AccountBalance.objects.filter(
+            ledger_id__in=posted_ledger_ids(entity), period__lte=through
+        )
+        .values("account_id", "period")
+        .annotate(debit=Sum("debit"), credit=Sum("credit"))
+        .order_by("account_id", "period")
+    )
+    activity = defaultdict(list)
+    for row in rows:
+        activity[row["account_id"]].append((row["period"], row["debit"], row["credit"]))
+    return activity
+
+
+def _write_rollups(entity: EntityModel, periods: list):
+    """Replaces the rollups of `periods` (ascending) with a recompute from the snapshots."""
+    activity = _monthly_activity(entity, periods[-1])
+    rollups = []
+    for account_id, months in activity.items():
+        index = 0
+        closing_debit = closing_credit = ZERO
+        for period in periods:
+            debit = credit = ZERO
+            while index < len(months) and months[index][0] <= period:
+                month, month_debit, month_credit = months[index]
+                closing_debit += month_debit
+                closing_credit += month_credit
+                if month == period:
+                    debit, credit = month_debit, month_credit
+                index += 1
+            if index == 0:
+                # no activity yet
+                continue
+            rollups.append(
+                PeriodRollup(
+                    entity=entity,
+                    account_id=account_id,
+                    period=period,
+                    debit=debit,
+                    credit=credit,
+                    closing_debit=closing_debit,
+                    closing_credit=closing_credit,
+                )
+            )
+    PeriodRollup.objects.filter(entity=entity, period__in=periods).delete()
+    PeriodRollup.objects.bulk_create(rollups, batch_size=BULK_BATCH_SIZE)
+
+
+def close_period(entity: EntityModel, period: date, user=None) -> list:
+    """
+    Closes every open month of the entity up to and including `period`,
+    starting after the last closed month (or at the first month with
+    activity), and returns the months closed. Closed months stay
+    contiguous; only months that have ended can be closed.
+    """
+    period = month_start(period)
+    if period >= month_start(timezone.localdate()):
+        raise PeriodCloseError("Only months that have ended can be closed")
+
+    with transaction.atomic():
+        _lock_entity(entity)
+        refresh_stale_periods(entity)
+        last_closed = PeriodClose.objects.filter(entity=entity).aggregate(
+            last=Max("period")
+        )["last"]
+        if last_closed is not None:
+            first = next_month(last_closed)
+        else:
+            first = (
+                AccountBalance.objects.filter(
+                    ledger_id__in=posted_ledger_ids(entity)
+                ).aggregate(first=Min("period"))["first"]
+                or period
+            )
+        months = _months(first, period)
+        if not months:
+            return []
+
+        closed_at = timezone.now()
+        PeriodClose.objects.bulk_create(
+            [
+                PeriodClose(
+                    entity=entity,
+                    period=month,
+                    # a User, its id or a token's ClaimsUser
+                    closed_by_id=getattr(user, "pk", user),
+                    closed_at=closed_at,
+                )
+                for month in months
+            ]
+        )
+        _write_rollups(entity, months)
+    return months
+
+
+def reopen_period(entity: EntityModel, period: date) -> list:
+    """
+    Reopens `period` and every closed month after it, dropping their
+    rollups, and returns the months reopened.
+    """
+    period = month_start(period)
+    with transaction.atomic():
+        _lock_entity(entity)
+        closes = PeriodClose.objects.filter(entity=entity, period__gte=period)
+        months = list(closes.order_by("period").values_list("period", flat=True))
+        PeriodRollup.objects.filter(entity=entity, period__gte=period).delete()
+        closes.delete()
+    return months
+
+
+def refresh_stale_periods(entity: EntityModel) -> list:
+    """
+    Recomputes the rollups of closed months a back-dated posting made
+    STALE, from the earliest stale month onwards, and returns the months
+    recomputed. The close rows stay locked until commit, so a posting that
+    lands meanwhile marks them stale again once it commits.
+    """
+    with transaction.atomic():
+        closes = list(
+            PeriodClose.objects.select_for_update()
+            .filter(entity=entity)
+            .order_by("period")
+            .values_list("period", "status")
+        )
+        stale = [period for period, status in closes if status == PeriodCloseStatus.STALE]
+        if not stale:
+            return []
+        months = [period for period, _ in closes if period >= stale[0]]
+        _write_rollups(entity, months)
+        PeriodClose.objects.filter(entity=entity, period__in=months).update(
+            status=PeriodCloseStatus.CLOSED, recomputed_at=timezone.now()
+        )
+    return months
+
+
+def _closed_range(entity: EntityModel):
+    bounds = PeriodClose.objects.filter(entity=entity).aggregate(
+        first=Min("period"), last=Max("period")
+    )
+    return bounds["first"], bounds["last"]
+
+
+def cumulative_totals(entity: EntityModel, as_of: date, closed_range=None) -> dict:
+    """
+    account id -> [debit, credit] posted up to the end of `as_of` across
+    the entity's posted ledgers: the rollups of the last closed month on or
+    before it, plus the snapshots of the open months after that, plus the
+    transactions of a month `as_of` falls inside. Call
+    refresh_stale_periods() first.
+    """
+    first_closed, last_closed = closed_range or _closed_range(entity)
+    ledger_ids = posted_ledger_ids(entity)
+    through = last_full_month(as_of)
+    totals = defaultdict(lambda: [ZERO, ZERO])
+
+    if first_closed is not None and first_closed <= through:
+        anchor = min(through, last_closed)
+        for account_id, closing_debit, closing_credit in PeriodRollup.objects.filter(
+            entity=entity, period=anchor
+        ).values_list("account_id", "closing_debit", "closing_credit"):
+            totals[account_id][0] += closing_debit
+            totals[account_id][1] += closing_credit
+        if through > anchor:
+            for row in (
+                AccountBalance.objects.filter(
+                    ledger_id__in=ledger_ids, period__gt=anchor, period__lte=through
+                )
+                .values("account_id")
+                .annotate(debit=Sum("debit"), credit=Sum("credit"))
+                .order_by()
+            ):
+                totals[row["account_id"]][0] += row["debit"]
+                totals[row["account_id"]][1] += row["credit"]
+    else:
+        snapshot_totals(ledger_ids, through, totals)
+
+    if next_month(through) <= as_of:
+        transaction_totals(ledger_ids, next_month(through), as_of, totals)
+    return totals
+
+
+def account_activity(
+    entity: EntityModel, end: Optional[date] = None, start: Optional[date] = None
+) -> dict:
+    """
+    account id -> (debit, credit) posted from `start` (the beginning when
+    None) to `end` (today by default) inclusive, built from closed rollups
+    plus the open-period delta. Stale months are recomputed first.
+    """
+    end = end or timezone.localdate()
+    refresh_stale_periods(entity)
+    closed_range = _closed_range(entity)
+    totals = cumulative_totals(entity, end, closed_range)
+    if start is not None:
+        before = cumulative_totals(entity, start - timedelta(days=1), closed_range)
+        for account_id, (debit, credit) in before.items():
+            totals[account_id][0] -= debit
+            totals[account_id][1] -= credit
+    return {
+        account_id: tuple(values)
+        for account_id, values in totals.items()
+        if start is None or any(values)
+    }
+
+
+def trial_balance(
+    entity: EntityModel, as_of: Optional[date] = None, ledger_ids: Optional[Iterable] = None
+) -> dict:
+    """
+    balances.trial_balance() read through the closes. Closes cover every
+    posted ledger, so a ledger filter reads the snapshots directly.
+    """
+    if ledger_ids:
+        return balances.trial_balance(entity, as_of=as_of, ledger_ids=ledger_ids)
+    as_of = as_of or timezone.localdate()
+    return balances.trial_balance(entity, as_of=as_of, totals=account_activity(entity, as_of))
+
+
+def balance_sheet(
+    entity: EntityModel, as_of: Optional[date] = None, ledger_ids: Optional[Iterable] = None
+) -> dict:
+    """balances.balance_sheet() read through the closes, like trial_balance()."""
+    if ledger_ids:
+        return balances.balance_sheet(entity, as_of=as_of, ledger_ids=ledger_ids)
+    as_of = as_of or timezone.localdate()
+    return balances.balance_sheet(entity, as_of=as_of, totals=account_activity(entity, as_of))
+
+
+def income_statement(entity: EntityModel, start: date, end: Optional[date] = None) -> dict:
+    """
+    Revenue, cost of goods sold and expenses posted from `start` to `end`
+    inclusive, each on its normal side, with gross profit and net income.
+    """
+    end = end or timezone.localdate()
+    if start > end:
+        raise PeriodCloseError("start must not be after end")
+    trial = balances.trial_balance(
+        entity, as_of=end, totals=account_activity(entity, end, start=start)
+    )
+
+    def section(roles, sign):
+        accounts = [row for row in trial["accounts"] if row["role"] in roles]
+        total = sum((row["credit"] - row["debit"] for row in accounts), ZERO)
+        return {"accounts": accounts, "total": sign * total}
+
+    revenue = section(GROUP_INCOME, 1)
+    cogs = section(GROUP_COGS, -1)
+    expenses = section(GROUP_EXPENSES, -1)
+    gross_profit = revenue["total"] - cogs["total"]
+    return {
+        "start": start,
+        "end": end,
+        "revenue": revenue,
+        "cost_of_goods_sold": cogs,
+        "gross_profit": gross_profit,
+        "expenses": expenses,
+        "net_income": gross_profit - expenses["total"],
+    }
@@ -0,0 +1,226 @@
+import json
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from django_ledger.io.roles import ACCOUNT_ROLE_CHOICES, CREDIT, DEBIT, ROOT_GROUP
+from django_ledger.models.coa_default import DEFAULT_CHART_OF_ACCOUNTS
+
+from accounting.services.chart_of_accounts import (
+    build_snapshot,
+    compile_snapshot,
+    default_snapshot,
+    group_accounts,
+)
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "data" / "coa_templates"
+
+TEMPLATE_KEYS = {"country", "currency", "name", "accounts", "exclude"}
+ACCOUNT_KEYS = {"code", "name", "role", "balance_type"}
+
+# First digit of an account code for each root group, see
+# AccountModel.get_code_prefix()
+CODE_PREFIXES = {
+    "asset": "1",
+    "lia": "2",
+    "eq": "3",
+    "in": "4",
+    "cogs": "5",
+    "ex": "6",
+}
+
+ACCOUNT_ROLES = frozenset(
+    role
+    for _, group in ACCOUNT_ROLE_CHOICES
+    for role, _ in group
+    if role not in ROOT_GROUP
+)
+
+COUNTRY_RE = re.compile(r"^[A-Z]{2}$")
+CURRENCY_RE = re.compile(r"^[A-Z]{3}$")
+
+
+class CoATemplateError(Exception):
+    def __init__(self, source, errors):
+        self.source = source
+        self.errors = list(errors)
+        super().__init__(f"{source}: " + "; ".join(self.errors))
+
+
+@dataclass(frozen=True)
+class CoATemplate:
+    """A compiled country chart of accounts, ready to seed."""
+
+    country: str
+    currency: Optional[str]
+    name: str
+    snapshot: tuple
+
+    @property
+    def account_count(self) -> int:
+        return len(self.snapshot)
+
+
+@dataclass(frozen=True)
+class TemplateRegistry:
+    templates: Mapping[str, CoATemplate]
+    errors: Mapping[str, CoATemplateError]
+
+
+DEFAULT_TEMPLATE_NAME = "django_ledger default"
+
+
+def _account_errors(index, account) -> list:
+    where = f"accounts[{index}]"
+    if not isinstance(account, dict):
+        return [f"{where} must be an object"]
+
+    errors = []
+    missing = ACCOUNT_KEYS - account.keys()
+    if missing:
+        errors.append(f"{where} is missing {', '.join(sorted(missing))}")
+    unknown = account.keys() - ACCOUNT_KEYS
+    if unknown:
+        errors.append(f"{where} has unknown keys {', '.join(sorted(unknown))}")
+    if missing:
+        return errors
+
+    code, name, role = account["code"], account["name"], account["role"]
+    if role not in ACCOUNT_ROLES:
+        errors.append(f"{where} role {role!r} is not a django_ledger account role")
+    if account["balance_type"] not in (DEBIT, CREDIT):
+        errors.append(f"{where} balance_type must be {DEBIT!r} or {CREDIT!r}")
+    if not isinstance(name, str) or not name.strip() or len(name) > 100:
+        errors.append(f"{where} name must be 1 to 100 characters")
+    if not isinstance(code, str) or not code.isalnum() or len(code) > 10:
+        errors.append(f"{where} code must be 1 to 10 alphanumeric characters")
+    elif role in ACCOUNT_ROLES:
+        prefix = CODE_PREFIXES[role.split("_")[0]]
+        if not code.startswith(prefix):
+            errors.append(f"{where} code {code} must start with {prefix} for role {role}")
+    return errors
+
+
+def compile_template(raw, source: str = "template") -> CoATemplate:
+    """
+    Validates a parsed template and builds its snapshot. Template accounts
+    are merged into django_ledger's defaults by code, so a template only
+    lists the accounts it adds or renames, and `exclude` drops default
+    codes. Raises CoATemplateError with every problem found.
+    """
+    if not isinstance(raw, dict):
+        raise CoATemplateError(source, ["a template must be a JSON object"])
+
+    errors = []
+    unknown = raw.keys() - TEMPLATE_KEYS
+    if unknown:
+        errors.append(f"unknown keys {', '.join(sorted(unknown))}")
+    country = raw.get("country")
+    if not isinstance(country, str) or not COUNTRY_RE.match(country):
+        errors.append("country must be a two letter ISO code, e.g. NG")
+    currency = raw.get("currency")
+    if currency is not None and (
+        not isinstance(currency, str) or not CURRENCY_RE.match(currency)
+    ):
+        errors.append("currency must be a three letter ISO code, e.g. NGN")
+    if not isinstance(raw.get("name", ""), str):
+        errors.append("name must be a string")
+
+    accounts = raw.get("accounts", [])
+    exclude = raw.get("exclude", [])
+    if not isinstance(accounts, list):
+        errors.append("accounts must be a list")
+        accounts = []
+    if not isinstance(exclude, list):
+        errors.append("exclude must be a list of account codes")
+        exclude = []
+
+    for index, account in enumerate(accounts):
+        errors.extend(_account_errors(index, account))
+
+    merged = {
+        account["code"]: {key: account[key] for key in ACCOUNT_KEYS}
+        for account in DEFAULT_CHART_OF_ACCOUNTS
+    }
+    for code in exclude:
+        if not isinstance(code, str) or merged.pop(code, None) is None:
+            errors.append(f"exclude lists {code!r}, which is not a default account")
+
+    seen = set()
+    for account in accounts:
+        if not isinstance(account, dict) or not isinstance(account.get("code"), str):
+            continue
+        if account["code"] in seen:
+            errors.append(f"code {account['code']} is listed twice")
+        seen.add(account["code"])
+        merged[account["code"]] = {key: account.get(key) for key in ACCOUNT_KEYS}
+
+    if errors:
+        raise CoATemplateError(source, errors)
+
+    return CoATemplate(
+        country=country,
+        currency=currency,
+        name=raw.get("name") or country,
+        snapshot=compile_snapshot(build_snapshot(group_accounts(merged.values()))),
+    )
+
+
+def load_template(path: Path) -> CoATemplate:
+    try:
+        raw = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        raise CoATemplateError(path.name, [str(e)])
+    template = compile_template(raw, source=path.name)
+    if template.country != path.stem:
+        raise CoATemplateError(
+            path.name, [f"country {template.country} does not match the file name"]
+        )
+    return template
+
+
+@lru_cache(maxsize=1)
+def registry() -> TemplateRegistry:
+    """
+    country code -> CoATemplate for every file in data/coa_templates, parsed
+    and compiled once per process (AccountingConfig.ready() loads it).
+    Invalid templates are left out and kept in `errors`, which the
+    accounting.E001 system check reports.
+    """
+    templates, errors = {}, {}
+    for path in sorted(TEMPLATES_DIR.glob("*.json")):
+        try:
+            templates[path.stem] = load_template(path)
+        except CoATemplateError as e:
+            logger.error("Chart of accounts template %s", e)
+            errors[path.stem] = e
+    return TemplateRegistry(
+        templates=MappingProxyType(templates), errors=MappingProxyType(errors)
+    )
+
+
+@lru_cache(maxsize=1)
+def default_template() -> CoATemplate:
+    return CoATemplate(
+        country="", currency=None, name=DEFAULT_TEMPLATE_NAME, snapshot=default_snapshot()
+    )
+
+
+def template_for_country(country_code: Optional[str]) -> CoATemplate:
+    """
+    The template for a country code such as "NG", or django_ledger's
+    defaults when there is none. Raises CoATemplateError when the country's
+    template exists but failed validation, rather than seeding the generic
+    chart in its place.
+    """
+    country = (country_code or "").strip().upper()
+    templates = registry()
+    if country in templates.errors:
+        raise templates.errors[country]
+    return templates.templates.get(country) or default_template()
@@ -0,0 +1,447 @@
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django_ledger.io.roles import CREDIT, DEBIT
+from django_ledger.models import (
+    AccountModel,
+    EntityModel,
+    EntityStateModel,
+    JournalEntryModel,
+    LedgerModel,
+    TransactionModel,
+)
+from django_ledger.models.journal_entry import JournalEntryValidationError
+from django_ledger.settings import (
+    DJANGO_LEDGER_DOCUMENT_NUMBER_PADDING,
+    DJANGO_LEDGER_JE_NUMBER_NO_UNIT_PREFIX,
+    DJANGO_LEDGER_JE_NUMBER_PREFIX,
+)
+
+from accounting.services.balances import ZERO
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+# One row per transaction line; rows sharing `entry` form a journal entry
+# and must be adjacent
+IMPORT_FIELDS = (
+    "entry",
+    "ledger",
+    "date",
+    "description",
+    "account",
+    "debit",
+    "credit",
+    "memo",
+)
+REQUIRED_FIELDS = ("entry", "ledger", "date", "account")
+
+ORIGIN = "import"
+CENT = Decimal("0.01")
+# TransactionModel.amount is numeric(20, 2)
+MAX_AMOUNT = Decimal(10) ** 18
+
+
+class JournalImportError(Exception):
+    pass
+
+
+def _lines(stream) -> Iterator[str]:
+    for number, line in enumerate(stream):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        # spreadsheet exports often start with a byte order mark
+        yield line.lstrip("\ufeff") if number == 0 else line
+
+
+def _ndjson_rows(stream) -> Iterator[tuple]:
+    for line_number, line in enumerate(_lines(stream), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, JournalImportError(f"invalid JSON ({e.msg})")
+            continue
+        if not isinstance(row, dict):
+            row = JournalImportError("expected a JSON object")
+        yield line_number, row
+
+
+def _csv_rows(reader) -> Iterator[tuple]:
+    for row in reader:
+        # line_num counts the header too
+        yield reader.line_num, row
+
+
+def parse_rows(stream, import_format: str) -> Iterator[tuple]:
+    """
+    Returns an iterator of (line number, row) for each NDJSON line or CSV
+    record of `stream`, read one line at a time. A CSV header is read and
+    checked right away. A row that cannot be decoded is yielded as a
+    JournalImportError so the others still go through.
+    """
+    if import_format == "ndjson":
+        return _ndjson_rows(stream)
+    if import_format != "csv":
+        raise JournalImportError(
+            f"Unknown import format {import_format!r}, expected one of {IMPORT_FORMATS}"
+        )
+    reader = csv.DictReader(_lines(stream))
+    missing = set(REQUIRED_FIELDS) - set(reader.fieldnames or ())
+    if missing:
+        raise JournalImportError(f"CSV header is missing {', '.join(sorted(missing))}")
+    return _csv_rows(reader)
+
+
+def _text(row, field) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _amount(row, field, errors) -> Decimal:
+    value = _text(row, field)
+    if not value:
+        return ZERO
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        errors.append(f"{field}: {value!r} is not a number")
+        return ZERO
+    if not amount.is_finite() or amount < 0:
+        errors.append(f"{field}: must be zero or more")
+        return ZERO
+    if amount >= MAX_AMOUNT:
+        errors.append(f"{field}: must be less than {MAX_AMOUNT:,}")
+        return ZERO
+    try:
+        exact = amount == amount.quantize(CENT)
+    except InvalidOperation:
+        exact = False
+    if not exact:
+        errors.append(f"{field}: at most two decimal places")
+        return ZERO
+    return amount
+
+
+def _timestamp(value: str) -> Optional[datetime]:
+    try:
+        moment = parse_datetime(value)
+        day = None if moment else parse_date(value)
+    except ValueError:
+        return None
+    if moment is None and day is None:
+        return None
+    if moment is None:
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class _Lookups:
+    """The entity's ledgers and accounts, read once per import."""
+
+    def __init__(self, entity: EntityModel):
+        self.ledgers = {}
+        self.locked_ledgers = set()
+        for uuid, xid, locked in LedgerModel.objects.filter(entity=entity).values_list(
+            "uuid", "ledger_xid", "locked"
+        ):
+            self.ledgers[str(uuid)] = uuid
+            if xid:
+                self.ledgers[xid] = uuid
+            if locked:
+                self.locked_ledgers.add(uuid)
+        self.accounts = {
+            code: (uuid, role)
+            for code, uuid, role in AccountModel.objects.filter(
+                coa_model_id=entity.default_coa_id, active=True
+            ).values_list("code", "uuid", "role")
+        }
+
+
+def _parse_row(row, lookups: _Lookups) -> tuple:
+    """(fields, errors) for one row, checked on its own."""
+    if isinstance(row, JournalImportError):
+        return None, [str(row)]
+
+    errors = []
+    missing = [field for field in REQUIRED_FIELDS if not _text(row, field)]
+    if missing:
+        return None, [f"{field}: required" for field in missing]
+
+    ledger_id = lookups.ledgers.get(_text(row, "ledger"))
+    if ledger_id is None:
+        errors.append(f"ledger: {_text(row, 'ledger')} is not a ledger of this entity")
+    elif ledger_id in lookups.locked_ledgers:
+        errors.append("ledger: is locked")
+    account = lookups.accounts.get(_text(row, "account"))
+    if account is None:
+        errors.append(f"account: {_text(row, 'account')} is not an active account")
+    timestamp = _timestamp(_text(row, "date"))
+    if timestamp is None:
+        errors.append("date: expected YYYY-MM-DD or an ISO 8601 datetime")
+    debit = _amount(row, "debit", errors)
+    credit = _amount(row, "credit", errors)
+    if not errors and (debit > 0) == (credit > 0):
+        errors.append("exactly one of debit and credit must be more than zero")
+
+    if errors:
+        return None, errors
+    return {
+        "ledger_id": ledger_id,
+        "timestamp": timestamp,
+        "description": _text(row, "description")[:120] or None,
+        "account_id": account[0],
+        "role": account[1],
+        "debit": debit,
+        "credit": credit,
+        "memo": _text(row, "memo")[:100] or None,
+    }, []
+
+
+def _unbalanced(entries: list) -> dict:
+    """
+    entry index -> (debits, credits) for the entries of a chunk whose
+    debits and credits differ, summed in one pass over the chunk's lines
+    rather than a check per entry.
+    """
+    debits = defaultdict(lambda: ZERO)
+    credits = defaultdict(lambda: ZERO)
+    for index, entry in enumerate(entries):
+        for fields in entry["lines"]:
+            debits[index] += fields["debit"]
+            credits[index] += fields["credit"]
+    return {
+        index: (debits[index], credits[index])
+        for index in debits
+        if debits[index] != credits[index]
+    }
+
+
+def _reserve_je_numbers(entity: EntityModel, fiscal_year: int, count: int) -> int:
+    """
+    Claims `count` journal entry numbers of a fiscal year with one update
+    of django_ledger's sequence, instead of one per entry as
+    JournalEntryModel.generate_je_number() does. Returns the first.
+    """
+    lookup = {
+        "entity_model_id": entity.uuid,
+        "entity_unit_id": None,
+        "fiscal_year": fiscal_year,
+        "key": EntityStateModel.KEY_JOURNAL_ENTRY,
+    }
+    state = EntityStateModel.objects.select_for_update().filter(**lookup).first()
+    if state is None:
+        EntityStateModel.objects.create(sequence=count, **lookup)
+        return 1
+    EntityStateModel.objects.filter(pk=state.pk).update(sequence=F("sequence") + count)
+    return state.sequence + 1
+
+
+def _je_number(fiscal_year: int, sequence: int) -> str:
+    seq = str(sequence).zfill(DJANGO_LEDGER_DOCUMENT_NUMBER_PADDING)
+    return (
+        f"{DJANGO_LEDGER_JE_NUMBER_PREFIX}-{fiscal_year}-"
+        f"{DJANGO_LEDGER_JE_NUMBER_NO_UNIT_PREFIX}-{seq}"
+    )
+
+
+def _write_chunk(entity: EntityModel, entries: list, post: bool, batch_size: int):
+    by_year = defaultdict(list)
+    for entry in entries:
+        by_year[entity.get_fy_for_date(timezone.localdate(entry["timestamp"]))].append(entry)
+
+    journal_entries, transactions = [], []
+    for fiscal_year, year_entries in sorted(by_year.items()):
+        first = _reserve_je_numbers(entity, fiscal_year, len(year_entries))
+        for sequence, entry in enumerate(year_entries, start=first):
+            je_id = uuid4()
+            journal_entries.append(
+                JournalEntryModel(
+                    uuid=je_id,
+                    je_number=_je_number(fiscal_year, sequence),
+                    ledger_id=entry["ledger_id"],
+                    timestamp=entry["timestamp"],
+                    description=entry["description"],
+                    activity=entry["activity"],
+                    origin=ORIGIN,
+                    # posted entries are locked, like mark_as_posted(force_lock=True)
+                    posted=post,
+                    locked=post,
+                )
+            )
+            transactions.extend(
+                TransactionModel(
+                    journal_entry_id=je_id,
+                    account_id=fields["account_id"],
+                    tx_type=DEBIT if fields["debit"] else CREDIT,
+                    amount=fields["debit"] or fields["credit"],
+                    description=fields["memo"],
+                )
+                for fields in entry["lines"]
+            )
+
+    JournalEntryModel.objects.bulk_create(journal_entries, batch_size=batch_size)
+    TransactionModel.objects.bulk_create(transactions, batch_size=batch_size)
+
+
+def import_journal_entries(
+    entity: EntityModel,
+    rows: Iterable,
+    chunk_size: int = None,
+    post: bool = True,
+) -> Iterator[dict]:
+    """
+    Imports (line number, row) pairs from parse_rows() into the entity's
+    ledgers. Rows are read one entry at a time and written chunk_size
+    entries per bulk_create, each chunk in its own atomic block (a savepoint
+    when the caller holds a transaction) so a chunk that fails rolls back
+    alone.
+
+    Returns an iterator that does the import as it is consumed. It yields
+    {"line", "entry", "errors"} for every rejected row or entry as soon as
+    its chunk is processed, then one {"summary": {...}}. An entry with any
+    invalid row is rejected whole.
+    """
+    if entity.default_coa_id is None:
+        raise JournalImportError("The entity has no chart of accounts")
+    return _import(
+        entity,
+        rows,
+        chunk_size or settings.JOURNAL_IMPORT_CHUNK_SIZE,
+        post,
+        _Lookups(entity),
+    )
+
+
+def _import(entity, rows, chunk_size, post, lookups) -> Iterator[dict]:
+    summary = {"rows": 0, "entries": 0, "imported": 0, "rejected": 0}
+    seen_entries = set()
+    chunk = []
+    current = None
+
+    def finish(entry):
+        summary["entries"] += 1
+        if entry["errors"]:
+            summary["rejected"] += 1
+            return entry["errors"]
+        lines = entry["lines"]
+        first = lines[0]
+        entry.update(
+            ledger_id=first["ledger_id"],
+            timestamp=first["timestamp"],
+            description=next(
+                (fields["description"] for fields in lines if fields["description"]), None
+            ),
+        )
+        errors = []
+        for line_number, fields in zip(entry["line_numbers"], lines):
+            if fields["ledger_id"] != entry["ledger_id"]:
+                errors.append({"line": line_number, "errors": ["ledger: differs within the entry"]})
+            if fields["timestamp"] != entry["timestamp"]:
+                errors.append({"line": line_number, "errors": ["date: differs within the entry"]})
+        if not errors:
+            try:
+                entry["activity"] = JournalEntryModel.get_activity_from_roles(
+                    {fields["role"] for fields in lines}
+                )
+            except JournalEntryValidationError as e:
+                errors.append({"line": entry["line_numbers"][0], "errors": [str(e)]})
+        if errors:
+            summary["rejected"] += 1
+            return [dict(error, entry=entry["ref"]) for error in errors]
+        chunk.append(entry)
+        return []
+
+    def flush():
+        rejected = []
+        unbalanced = _unbalanced(chunk)
+        for index, (debits, credits) in sorted(unbalanced.items()):
+            entry = chunk[index]
+            rejected.append(
+                {
+                    "line": entry["line_numbers"][0],
+                    "entry": entry["ref"],
+                    "errors": [f"debits {debits} do not equal credits {credits}"],
+                }
+            )
+        balanced = [entry for index, entry in enumerate(chunk) if index not in unbalanced]
+        summary["rejected"] += len(unbalanced)
+        chunk.clear()
+        if not balanced:
+            return rejected
+        try:
+            with transaction.atomic():
+                _write_chunk(entity, balanced, post, chunk_size)
+        except DatabaseError as e:
+            summary["rejected"] += len(balanced)
+            rejected.extend(
+                {
+                    "line": entry["line_numbers"][0],
+                    "entry": entry["ref"],
+                    "errors": [f"Not imported: {e}"],
+                }
+                for entry in balanced
+            )
+        else:
+            summary["imported"] += len(balanced)
+        return rejected
+
+    for line_number, row in rows:
+        summary["rows"] += 1
+        ref = _text(row, "entry") if isinstance(row, dict) else ""
+        fields, errors = _parse_row(row, lookups)
+        if not ref:
+            # nothing to group it by, reject the row on its own
+            summary["rejected"] += 1
+            yield {"line": line_number, "entry": None, "errors": errors}
+            continue
+
+        if current is not None and ref != current["ref"]:
+            yield from finish(current)
+            current = None
+            if len(chunk) >= chunk_size:
+                yield from flush()
+        if current is None:
+            if ref in seen_entries:
+                errors = errors + ["entry: its rows must be adjacent"]
+            seen_entries.add(ref)
+            current = {"ref": ref, "lines": [], "line_numbers": [], "errors": []}
+        if errors:
+            current["errors"].append({"line": line_number, "entry": ref, "errors": errors})
+        else:
+            current["lines"].append(fields)
+            current["line_numbers"].append(line_number)
+
+    if current is not None:
+        yield from finish(current)
+    if chunk:
+        yield from flush()
+    yield {"summary": summary}
+
+
+def encode_results(results: Iterable[dict]) -> Iterator[str]:
+    """NDJSON lines for import_journal_entries() results."""
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for result in results:
+        yield encoder.encode(result) + "\n"
@@ -1,3 +1,184 @@
-from django.test import TestCase
+import io
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django_ledger.models import EntityModel
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.test.client import TenantClient
+
+from accounting.models import PeriodClose
+
+from accounting.services.journal_import import (
+    JournalImportError,
+    _Lookups,
+    _parse_row,
+    _unbalanced,
+    parse_rows,
+)
+from accounting.services.balances import month_start
+from identity.enums import UserRoles
+from identity.models import Membership, User
+from identity.serializers import CustomTokenObtainPairSerializer
+
+LEDGER_ID = uuid.uuid4()
+LOCKED_LEDGER_ID = uuid.uuid4()
+CASH_ID = uuid.uuid4()
+
+
+def lookups() -> _Lookups:
+    lookups = _Lookups.__new__(_Lookups)
+    lookups.ledgers = {"main": LEDGER_ID, "closed": LOCKED_LEDGER_ID}
+    lookups.locked_ledgers = {LOCKED_LEDGER_ID}
+    lookups.accounts = {"1010": (CASH_ID, "asset_ca_cash")}
+    return lookups
+
+
+def row(**fields) -> dict:
+    return {
+        "entry": "E1",
+        "ledger": "main",
+        "date": "2024-03-01",
+        "account": "1010",
+        "debit": "10.00",
+        **fields,
+    }
+
+
+class ParseRowsTests(SimpleTestCase):
+    def test_ndjson(self):
+        stream = io.BytesIO(b'{"entry": "E1"}\n\n[1]\nnot json\n{"entry": "E2"}\n')
+        rows = list(parse_rows(stream, "ndjson"))
+
+        self.assertEqual([line for line, _ in rows], [1, 3, 4, 5])
+        self.assertEqual(rows[0][1], {"entry": "E1"})
+        self.assertIsInstance(rows[1][1], JournalImportError)
+        self.assertIsInstance(rows[2][1], JournalImportError)
+        self.assertEqual(rows[3][1], {"entry": "E2"})
+
+    def test_csv_strips_byte_order_mark(self):
+        stream = io.BytesIO(
+            "\ufeffentry,ledger,date,account,debit\nE1,main,2024-03-01,1010,5\n".encode()
+        )
+        ((line, parsed),) = parse_rows(stream, "csv")
+
+        self.assertEqual(line, 2)
+        self.assertEqual(parsed["entry"], "E1")
+        self.assertEqual(parsed["debit"], "5")
+
+    def test_csv_header_is_checked_before_reading_rows(self):
+        with self.assertRaisesMessage(JournalImportError, "missing account, date"):
+            parse_rows(io.BytesIO(b"entry,ledger\nE1,main\n"), "csv")
+
+    def test_unknown_format(self):
+        with self.assertRaises(JournalImportError):
+            parse_rows(io.BytesIO(b""), "xlsx")
+
+
+class ParseRowTests(SimpleTestCase):
+    def test_valid_row(self):
+        fields, errors = _parse_row(row(description=" Rent ", memo=""), lookups())
+
+        self.assertEqual(errors, [])
+        self.assertEqual(fields["ledger_id"], LEDGER_ID)
+        self.assertEqual(fields["account_id"], CASH_ID)
+        self.assertEqual(fields["debit"], Decimal("10.00"))
+        self.assertEqual(fields["credit"], Decimal("0"))
+        self.assertEqual(fields["description"], "Rent")
+        self.assertIsNone(fields["memo"])
+
+    def test_required_fields(self):
+        fields, errors = _parse_row({"entry": "E1", "debit": "1"}, lookups())
+
+        self.assertIsNone(fields)
+        self.assertEqual(errors, ["ledger: required", "date: required", "account: required"])
+
+    def test_unknown_and_locked_references(self):
+        _, errors = _parse_row(row(ledger="other", account="9999"), lookups())
+        self.assertEqual(len(errors), 2)
+
+        _, errors = _parse_row(row(ledger="closed"), lookups())
+        self.assertEqual(errors, ["ledger: is locked"])
+
+    def test_invalid_date(self):
+        _, errors = _parse_row(row(date="03/01/2024"), lookups())
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("date:"))
+
+    def test_invalid_amounts(self):
+        for value in ("abc", "-1", "NaN", "1.001", "1e30", "1000000000000000000"):
+            with self.subTest(value=value):
+                fields, errors = _parse_row(row(debit=value), lookups())
+                self.assertIsNone(fields)
+                self.assertTrue(errors[0].startswith("debit:"), errors)
+
+    def test_largest_amount(self):
+        fields, errors = _parse_row(row(debit="999999999999999999.99"), lookups())
+        self.assertEqual(errors, [])
+        self.assertEqual(fields["debit"], Decimal("999999999999999999.99"))
+
+    def test_exactly_one_side(self):
+        for debit, credit in (("5", "5"), ("", ""), ("0", "0")):
+            with self.subTest(debit=debit, credit=credit):
+                _, errors = _parse_row(row(debit=debit, credit=credit), lookups())
+                self.assertEqual(
+                    errors, ["exactly one of debit and credit must be more than zero"]
+                )
+
+    def test_decode_error_is_reported(self):
+        fields, errors = _parse_row(JournalImportError("invalid JSON"), lookups())
+        self.assertIsNone(fields)
+        self.assertEqual(errors, ["invalid JSON"])
+
+
+class UnbalancedTests(SimpleTestCase):
+    def entry(self, *lines):
+        return {
+            "lines": [
+                {"debit": Decimal(debit), "credit": Decimal(credit)} for debit, credit in lines
+            ]
+        }
+
+    def test_only_unbalanced_entries(self):
+        entries = [
+            self.entry(("10", "0"), ("0", "10")),
+            self.entry(("10", "0"), ("0", "4"), ("0", "5")),
+            self.entry(("3", "0"), ("2", "0"), ("0", "5")),
+        ]
+        self.assertEqual(_unbalanced(entries), {1: (Decimal("10"), Decimal("9"))})
+
+    def test_empty_chunk(self):
+        self.assertEqual(_unbalanced([]), {})
+
+
+class PeriodCloseAPITests(TenantTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="accountant@example.com",
+            password="secret",
+            first_name="Ada",
+            last_name="Accountant",
+        )
+        Membership.objects.create(user=self.user, tenant=self.tenant, role=UserRoles.ACCOUNTANT)
+        self.entity = EntityModel.create_entity(
+            name="Acme", admin=self.user, use_accrual_method=True, fy_start_month=1
+        )
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client = TenantClient(self.tenant, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_close_with_access_token(self):
+        last_month = month_start(month_start(date.today()) - timedelta(days=1))
+        response = self.client.post(
+            reverse("accounting-period-close"),
+            {"period": last_month.isoformat()},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["periods"], [last_month.isoformat()])
+        self.assertEqual(
+            PeriodClose.objects.get(entity=self.entity, period=last_month).closed_by_id,
+            self.user.pk,
+        )
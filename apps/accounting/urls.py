@@ -1,3 +1,27 @@
 from django.urls import path
 
-urlpatterns = []
+from accounting.endpoints import (
+    BalanceSheetAPIView,
+    IncomeStatementAPIView,
+    JournalEntryImportAPIView,
+    PeriodCloseAPIView,
+    PeriodReopenAPIView,
+    TrialBalanceAPIView,
+)
+
+urlpatterns = [
+    path("trial-balance/", TrialBalanceAPIView.as_view(), name="accounting-trial-balance"),
+    path("balance-sheet/", BalanceSheetAPIView.as_view(), name="accounting-balance-sheet"),
+    path(
+        "income-statement/",
+        IncomeStatementAPIView.as_view(),
+        name="accounting-income-statement",
+    ),
+    path(
+        "journal-entries/import/",
+        JournalEntryImportAPIView.as_view(),
+        name="accounting-journal-entry-import",
+    ),
+    path("periods/close/", PeriodCloseAPIView.as_view(), name="accounting-period-close"),
+    path("periods/reopen/", PeriodReopenAPIView.as_view(), name="accounting-period-reopen"),
+]
@@ -1,3 +1,29 @@
 from django.contrib import admin
 
-# Register your models here.
+from banking.models import BankAccount, Reconciliation, StatementImport
+
+
+@admin.register(BankAccount)
+class BankAccountAdmin(admin.ModelAdmin):
+    list_display = ("account_number", "bank_id", "account_type", "currency", "entity")
+    search_fields = ("account_number", "name")
+
+
+@admin.register(StatementImport)
+class StatementImportAdmin(admin.ModelAdmin):
+    list_display = (
+        "bank_account",
+        "file_name",
+        "status",
+        "transactions_created",
+        "duplicates",
+        "rejected",
+        "created_at",
+    )
+    list_filter = ("status",)
+
+
+@admin.register(Reconciliation)
+class ReconciliationAdmin(admin.ModelAdmin):
+    list_display = ("bank_account", "method", "score", "matched_by", "created_at")
+    list_filter = ("method",)
@@ -0,0 +1,242 @@
+from django_ledger.models import AccountModel, EntityModel
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from banking.models import BankAccount, Reconciliation
+from banking.serializers import (
+    BankAccountSerializer,
+    BankAccountUpdateSerializer,
+    ManualMatchSerializer,
+    ReconcileRequestSerializer,
+    ReconcileResultSerializer,
+    ReconciliationSerializer,
+    StatementImportSerializer,
+    StatementUploadSerializer,
+)
+from banking.services.ingestion import StatementIngestionError, ingest_statements
+from banking.services.reconciliation import (
+    ReconciliationError,
+    match_manually,
+    reconcile,
+    undo_reconciliation,
+)
+from identity.enums import UserRoles
+from identity.permissions import IsTenantMember
+
+BANK_ACCOUNT_NOT_FOUND = {"detail": "Bank account not found"}
+
+
+class StatementUploadAPIView(APIView):
+    """
+    Imports the transactions of an OFX/QFX bank statement.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+    parser_classes = [MultiPartParser]
+
+    @extend_schema(
+        tags=["Banking"],
+        request={"multipart/form-data": StatementUploadSerializer},
+        responses={201: StatementImportSerializer(many=True)},
+        summary="Upload a bank statement",
+        description="""
+        Reads an OFX or QFX file (v1 SGML or v2 XML) as a stream and stages
+        its transactions for reconciliation, creating the bank account on
+        its first statement. Transactions whose FITID is already stored for
+        the account are skipped, so overlapping statements can be uploaded
+        safely. Returns one import summary per statement in the file.
+        """,
+    )
+    def post(self, request):
+        serializer = StatementUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        entities = EntityModel.objects.order_by("created")
+        if serializer.validated_data.get("entity"):
+            entities = entities.filter(slug=serializer.validated_data["entity"])
+        entity = entities.first()
+        if entity is None:
+            return Response(
+                {"detail": "Entity not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        upload = serializer.validated_data["file"]
+        try:
+            imports = ingest_statements(
+                entity, upload, file_name=upload.name, uploaded_by=request.user
+            )
+        except StatementIngestionError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            upload.close()
+        return Response(
+            StatementImportSerializer(imports, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class BankAccountAPIView(APIView):
+    """
+    Names a bank account and links it to its ledger account.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Banking"],
+        request=BankAccountUpdateSerializer,
+        responses={200: BankAccountSerializer},
+        summary="Update a bank account",
+        description="""
+        Sets the name of a bank account and the account of the entity's
+        chart of accounts, by code, that its lines reconcile against.
+        """,
+    )
+    def patch(self, request, pk):
+        bank_account = BankAccount.objects.select_related("entity").filter(id=pk).first()
+        if bank_account is None:
+            return Response(BANK_ACCOUNT_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+        serializer = BankAccountUpdateSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        if "name" in serializer.validated_data:
+            bank_account.name = serializer.validated_data["name"]
+        if "ledger_account" in serializer.validated_data:
+            code = serializer.validated_data["ledger_account"]
+            ledger_account = None
+            if code is not None:
+                ledger_account = AccountModel.objects.filter(
+                    coa_model_id=bank_account.entity.default_coa_id, code=code, active=True
+                ).first()
+                if ledger_account is None:
+                    return Response(
+                        {"detail": f"Account {code} not found"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+            bank_account.ledger_account = ledger_account
+        bank_account.save()
+        return Response(BankAccountSerializer(bank_account).data, status=status.HTTP_200_OK)
+
+
+class ReconcileAPIView(APIView):
+    """
+    Matches the unreconciled lines of a bank account with the ledger.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Banking"],
+        request=ReconcileRequestSerializer,
+        responses={200: ReconcileResultSerializer},
+        summary="Reconcile a bank account",
+        description="""
+        Matches the unreconciled bank lines posted from `start` to `end`
+        with the unreconciled posted transactions of the bank account's
+        ledger account, by amount, date and description. A bank line may
+        match several ledger transactions adding up to it, and the other
+        way round. The matches are stored unless `dry_run` is set.
+        """,
+    )
+    def post(self, request, pk):
+        bank_account = BankAccount.objects.filter(id=pk).first()
+        if bank_account is None:
+            return Response(BANK_ACCOUNT_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+        serializer = ReconcileRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            result = reconcile(
+                bank_account,
+                start=data.get("start"),
+                end=data.get("end"),
+                date_window=data.get("date_window"),
+                amount_tolerance=data.get("amount_tolerance"),
+                user=request.user,
+                commit=not data["dry_run"],
+            )
+        except ReconciliationError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ReconcileResultSerializer(result).data, status=status.HTTP_200_OK)
+
+
+class ReconciliationCreateAPIView(APIView):
+    """
+    Matches bank lines with ledger transactions by hand.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Banking"],
+        request=ManualMatchSerializer,
+        responses={201: ReconciliationSerializer},
+        summary="Match transactions",
+        description="""
+        Reconciles the given bank lines with the given ledger transactions
+        of the bank account's ledger account. They must be unreconciled and
+        add up to the same amount.
+        """,
+    )
+    def post(self, request):
+        serializer = ManualMatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        bank_account = BankAccount.objects.filter(id=data["bank_account"]).first()
+        if bank_account is None:
+            return Response(BANK_ACCOUNT_NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            reconciliation = match_manually(
+                bank_account,
+                data["bank_transactions"],
+                data["ledger_transactions"],
+                user=request.user,
+            )
+        except ReconciliationError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            ReconciliationSerializer(reconciliation).data, status=status.HTTP_201_CREATED
+        )
+
+
+class ReconciliationAPIView(APIView):
+    """
+    Undoes a reconciliation.
+    """
+
+    permission_classes = [
+        IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN, UserRoles.ACCOUNTANT)
+    ]
+
+    @extend_schema(
+        tags=["Banking"],
+        responses={204: None},
+        summary="Undo a reconciliation",
+        description="""
+        Returns the bank lines and ledger transactions of a reconciliation
+        to unreconciled, so they can be matched again.
+        """,
+    )
+    def delete(self, request, pk):
+        reconciliation = (
+            Reconciliation.objects.select_related("bank_account").filter(id=pk).first()
+        )
+        if reconciliation is None:
+            return Response(
+                {"detail": "Reconciliation not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        undo_reconciliation(reconciliation)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,19 @@
+from django.db.models import TextChoices
+
+
+class StatementImportStatus(TextChoices):
+    RUNNING = "running", "Running"
+    COMPLETED = "completed", "Completed"
+    FAILED = "failed", "Failed"
+
+
+class BankTransactionStatus(TextChoices):
+    # imported, not yet matched to the ledger
+    STAGED = "staged", "Staged"
+    # part of a Reconciliation
+    MATCHED = "matched", "Matched"
+
+
+class ReconciliationMethod(TextChoices):
+    AUTO = "auto", "Automatic"
+    MANUAL = "manual", "Manual"
@@ -0,0 +1,101 @@
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django_ledger.models import EntityModel
+from django_tenants.utils import schema_context
+
+from banking.services.fixtures import generated_transactions, write_statement
+from banking.services.ingestion import ingest_statements
+from banking.services.ofx import OFXTransaction, parse_statements
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates an OFX statement, times parsing it (and its peak memory), and "
+        "with --schema times ingesting it twice (the second run is all FITID "
+        "duplicates) in a tenant schema, rolling everything back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transactions", type=int, default=100_000)
+        parser.add_argument("--ofx-version", type=int, choices=(1, 2), default=1)
+        parser.add_argument("--schema", help="Tenant schema to ingest into")
+        parser.add_argument("--chunk-size", type=int, help="Transactions per bulk insert")
+        parser.add_argument(
+            "--trace-memory",
+            action="store_true",
+            help="Parse again under tracemalloc to report peak memory (several times slower)",
+        )
+
+    def handle(self, *args, **options):
+        count = options["transactions"]
+        with tempfile.TemporaryFile() as fixture:
+            write_statement(fixture, generated_transactions(count), version=options["ofx_version"])
+            size = fixture.tell()
+            self.stdout.write(
+                f"OFX v{options['ofx_version']} fixture: {count} transactions, "
+                f"{size / 1024 / 1024:.1f} MiB"
+            )
+
+            fixture.seek(0)
+            started = time.perf_counter()
+            parsed = self._parse(fixture)
+            elapsed = time.perf_counter() - started
+            if parsed != count:
+                raise CommandError(f"Parsed {parsed} of {count} transactions")
+            self.stdout.write(f"parse     {elapsed:7.2f}s  {count / elapsed:9.0f} tx/s")
+
+            if options["trace_memory"]:
+                fixture.seek(0)
+                tracemalloc.start()
+                self._parse(fixture)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(f"parse     peak {peak / 1024:.0f} KiB allocated")
+
+            if options["schema"]:
+                with schema_context(options["schema"]):
+                    try:
+                        with transaction.atomic():
+                            self._ingest(fixture, count, options["chunk_size"])
+                            raise Rollback
+                    except Rollback:
+                        pass
+
+    def _parse(self, fixture):
+        return sum(
+            1 for event in parse_statements(fixture) if isinstance(event, OFXTransaction)
+        )
+
+    def _ingest(self, fixture, count, chunk_size):
+        entity = EntityModel.objects.order_by("created").first()
+        if entity is None:
+            raise CommandError("The schema has no entity")
+
+        for label in ("ingest", "re-ingest"):
+            fixture.seek(0)
+            executed = []
+
+            def counted(execute, sql, params, many, context):
+                executed.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(counted):
+                started = time.perf_counter()
+                (statement_import,) = ingest_statements(
+                    entity, fixture, file_name="bench.ofx", chunk_size=chunk_size
+                )
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:<9} {elapsed:7.2f}s  {count / elapsed:9.0f} tx/s  "
+                f"{len(executed):5d} queries  "
+                f"{statement_import.transactions_created} created, "
+                f"{statement_import.duplicates} duplicates"
+            )
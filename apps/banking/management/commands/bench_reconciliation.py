@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from banking.services.fixtures import reconciliation_lines
+from banking.services.matching import MatchOptions, match_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a year of bank and ledger lines with known matches and times "
+        "matching them, reporting how many of the expected matches were found"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transactions", type=int, default=50_000)
+        parser.add_argument("--date-window", type=int, default=MatchOptions.date_window)
+        parser.add_argument(
+            "--amount-tolerance", type=int, default=MatchOptions.amount_tolerance
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        bank, ledger, expected = reconciliation_lines(
+            options["transactions"], seed=options["seed"]
+        )
+        self.stdout.write(
+            f"{len(bank)} bank lines, {len(ledger)} ledger lines, "
+            f"{len(expected)} expected matches"
+        )
+
+        match_options = MatchOptions(
+            date_window=options["date_window"], amount_tolerance=options["amount_tolerance"]
+        )
+        started = time.perf_counter()
+        matches = match_lines(bank, ledger, match_options)
+        elapsed = time.perf_counter() - started
+
+        found = {(frozenset(match.bank_ids), frozenset(match.ledger_ids)) for match in matches}
+        correct = len(found & expected)
+        split = sum(1 for match in matches if len(match.bank_ids) + len(match.ledger_ids) > 2)
+        # a wrong one-to-one match took a nearby line of the same amount,
+        # which the recurring amounts make common
+        swapped = sum(
+            1
+            for bank_ids, ledger_ids in found - expected
+            if len(bank_ids) == len(ledger_ids) == 1
+        )
+        self.stdout.write(
+            f"match  {elapsed:7.2f}s  {len(bank) / elapsed:9.0f} bank lines/s  "
+            f"{len(matches)} matches ({split} split)"
+        )
+        self.stdout.write(
+            f"{correct / max(len(matches), 1):.1%} as generated, "
+            f"{swapped} one-to-one swapped with a line of the same amount, "
+            f"{correct / max(len(expected), 1):.1%} of the generated matches found"
+        )
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django_ledger.models import EntityModel
+from django_tenants.utils import schema_context
+
+from banking.services.ingestion import StatementIngestionError, ingest_statements
+
+
+class Command(BaseCommand):
+    help = "Stages the transactions of an OFX/QFX statement file in a tenant schema"
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_name")
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--entity", help="Entity slug, defaults to the first entity")
+        parser.add_argument("--chunk-size", type=int, help="Transactions per bulk insert")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        with schema_context(options["schema_name"]):
+            entities = EntityModel.objects.order_by("created")
+            if options["entity"]:
+                entities = entities.filter(slug=options["entity"])
+            entity = entities.first()
+            if entity is None:
+                raise CommandError("Entity not found")
+
+            try:
+                with path.open("rb") as source:
+                    imports = ingest_statements(
+                        entity, source, file_name=path.name, chunk_size=options["chunk_size"]
+                    )
+            except (OSError, StatementIngestionError) as e:
+                raise CommandError(e)
+
+        for statement_import in imports:
+            self.stdout.write(
+                f"{statement_import.bank_account.account_number}: "
+                f"{statement_import.transactions_read} read, "
+                f"{statement_import.transactions_created} created, "
+                f"{statement_import.duplicates} duplicates, "
+                f"{statement_import.rejected} rejected"
+            )
@@ -0,0 +1,63 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from banking.models import BankAccount
+from banking.services.reconciliation import reconcile
+from tenants.models import Client
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"{value} is not a date, use YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = (
+        "Matches the unreconciled bank lines of every bank account linked to a "
+        "ledger account with the ledger, in every tenant schema or the given ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", nargs="+", dest="schemas")
+        parser.add_argument("--start", type=_date, help="Defaults to a year before --end")
+        parser.add_argument("--end", type=_date, help="Defaults to today")
+        parser.add_argument("--date-window", type=int, help="Days between matched lines")
+        parser.add_argument("--amount-tolerance", type=int, help="Cents a match may be off by")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report the matches without storing them"
+        )
+
+    def handle(self, *args, **options):
+        schemas = options["schemas"] or list(
+            Client.objects.exclude(schema_name=get_public_schema_name())
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        for schema in schemas:
+            with schema_context(schema):
+                for bank_account in BankAccount.objects.filter(
+                    ledger_account__isnull=False
+                ).order_by("created_at"):
+                    started = time.perf_counter()
+                    result = reconcile(
+                        bank_account,
+                        start=options["start"],
+                        end=options["end"],
+                        date_window=options["date_window"],
+                        amount_tolerance=options["amount_tolerance"],
+                        commit=not options["dry_run"],
+                    )
+                    self.stdout.write(
+                        f"{schema}/{bank_account.account_number}: "
+                        f"{result['matched_bank_transactions']} of "
+                        f"{result['bank_transactions']} bank lines matched to "
+                        f"{result['matched_ledger_transactions']} of "
+                        f"{result['ledger_transactions']} ledger lines in "
+                        f"{result['reconciliations']} reconciliations "
+                        f"({time.perf_counter() - started:.2f}s)"
+                    )
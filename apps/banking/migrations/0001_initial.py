@@ -0,0 +1,91 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:03
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('django_ledger', '0029_stagedtransactionmodel_matched_transaction_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankAccount',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('bank_id', models.CharField(blank=True, default='', max_length=32)),
+                ('account_number', models.CharField(max_length=64)),
+                ('account_type', models.CharField(max_length=20)),
+                ('currency', models.CharField(max_length=3)),
+                ('name', models.CharField(blank=True, default='', max_length=100)),
+                ('entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bank_accounts', to='django_ledger.entitymodel')),
+                ('ledger_account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bank_accounts', to='django_ledger.accountmodel')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StatementImport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('file_name', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('start_date', models.DateTimeField(blank=True, null=True)),
+                ('end_date', models.DateTimeField(blank=True, null=True)),
+                ('ledger_balance', models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True)),
+                ('balance_date', models.DateTimeField(blank=True, null=True)),
+                ('transactions_read', models.PositiveIntegerField(default=0)),
+                ('transactions_created', models.PositiveIntegerField(default=0)),
+                ('duplicates', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('bank_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statement_imports', to='banking.bankaccount')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BankTransaction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('fitid', models.CharField(max_length=255)),
+                ('transaction_type', models.CharField(max_length=20)),
+                ('posted_at', models.DateTimeField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('name', models.CharField(blank=True, default='', max_length=100)),
+                ('memo', models.CharField(blank=True, default='', max_length=255)),
+                ('check_number', models.CharField(blank=True, default='', max_length=12)),
+                ('reference', models.CharField(blank=True, default='', max_length=32)),
+                ('status', models.CharField(choices=[('staged', 'Staged')], default='staged', max_length=10)),
+                ('bank_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='banking.bankaccount')),
+                ('statement_import', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='banking.statementimport')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='bankaccount',
+            constraint=models.UniqueConstraint(fields=('bank_id', 'account_number'), name='banking_account_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['bank_account', 'posted_at'], name='banking_tx_account_posted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='banktransaction',
+            constraint=models.UniqueConstraint(fields=('bank_account', 'fitid'), name='banking_transaction_fitid_uniq'),
+        ),
+    ]
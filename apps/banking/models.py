@@ -1,3 +1,158 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import SET_NULL
+from django_ledger.models import EntityModel
 
-# Create your models here.
+from banking.enums import BankTransactionStatus, ReconciliationMethod, StatementImportStatus
+from commons.mixins import ModelMixin
+
+
+class BankAccount(ModelMixin):
+    """
+    An account at a bank, identified the way OFX statements identify it
+    (BANKACCTFROM or CCACCTFROM). Created by the first statement imported
+    for it.
+    """
+
+    entity = models.ForeignKey(
+        EntityModel, on_delete=models.CASCADE, related_name="bank_accounts"
+    )
+    # the cash or card account the bank lines reconcile against
+    ledger_account = models.ForeignKey(
+        "django_ledger.AccountModel",
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bank_accounts",
+    )
+    # BANKID (routing number), empty for card accounts
+    bank_id = models.CharField(max_length=32, blank=True, default="")
+    account_number = models.CharField(max_length=64)
+    account_type = models.CharField(max_length=20)
+    currency = models.CharField(max_length=3)
+    name = models.CharField(max_length=100, blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bank_id", "account_number"], name="banking_account_uniq"
+            )
+        ]
+
+    def __str__(self):
+        return self.name or f"{self.account_type} {self.account_number[-4:]}"
+
+
+class StatementImport(ModelMixin):
+    """One statement of an uploaded OFX/QFX file and what its ingestion did."""
+
+    bank_account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="statement_imports"
+    )
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(
+        max_length=10,
+        choices=StatementImportStatus.choices,
+        default=StatementImportStatus.RUNNING,
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=SET_NULL, null=True, blank=True
+    )
+    # DTSTART / DTEND of BANKTRANLIST
+    start_date = models.DateTimeField(null=True, blank=True)
+    end_date = models.DateTimeField(null=True, blank=True)
+    # LEDGERBAL
+    ledger_balance = models.DecimalField(
+        max_digits=20, decimal_places=2, null=True, blank=True
+    )
+    balance_date = models.DateTimeField(null=True, blank=True)
+    transactions_read = models.PositiveIntegerField(default=0)
+    transactions_created = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+
+class Reconciliation(ModelMixin):
+    """
+    A group of bank lines matched to a group of ledger transactions of the
+    account's ledger account with the same total. Usually one of each; a
+    deposit of several receipts, or a payment the bank split, matches one
+    line to several.
+    """
+
+    bank_account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="reconciliations"
+    )
+    method = models.CharField(max_length=10, choices=ReconciliationMethod.choices)
+    # how well an automatic match fits, from 0 to 1
+    score = models.FloatField(null=True, blank=True)
+    matched_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=SET_NULL, null=True, blank=True
+    )
+
+
+class BankTransaction(ModelMixin):
+    """
+    A transaction line from a bank statement, staged for reconciliation.
+    FITID is unique per account, so importing overlapping statements twice
+    adds nothing.
+    """
+
+    bank_account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="transactions"
+    )
+    statement_import = models.ForeignKey(
+        StatementImport,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transactions",
+    )
+    fitid = models.CharField(max_length=255)
+    transaction_type = models.CharField(max_length=20)
+    posted_at = models.DateTimeField()
+    # positive for money in, negative for money out
+    amount = models.DecimalField(max_digits=20, decimal_places=2)
+    name = models.CharField(max_length=100, blank=True, default="")
+    memo = models.CharField(max_length=255, blank=True, default="")
+    check_number = models.CharField(max_length=12, blank=True, default="")
+    reference = models.CharField(max_length=32, blank=True, default="")
+    status = models.CharField(
+        max_length=10,
+        choices=BankTransactionStatus.choices,
+        default=BankTransactionStatus.STAGED,
+    )
+    reconciliation = models.ForeignKey(
+        Reconciliation,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bank_transactions",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bank_account", "fitid"], name="banking_transaction_fitid_uniq"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["bank_account", "posted_at"], name="banking_tx_account_posted_idx"
+            )
+        ]
+
+
+class ReconciledLine(ModelMixin):
+    """The ledger side of a Reconciliation. A ledger transaction reconciles once."""
+
+    reconciliation = models.ForeignKey(
+        Reconciliation, on_delete=models.CASCADE, related_name="ledger_lines"
+    )
+    transaction = models.OneToOneField(
+        "django_ledger.TransactionModel",
+        on_delete=models.CASCADE,
+        related_name="reconciled_line",
+    )
@@ -0,0 +1,128 @@
+from rest_framework import serializers
+
+from banking.models import BankAccount, Reconciliation, StatementImport
+
+
+class StatementUploadSerializer(serializers.Serializer):
+    file = serializers.FileField(help_text="OFX or QFX statement file")
+    entity = serializers.SlugField(
+        required=False, help_text="Entity slug, defaults to the tenant's entity"
+    )
+
+
+class StatementImportSerializer(serializers.ModelSerializer):
+    account_number = serializers.CharField(source="bank_account.account_number")
+
+    class Meta:
+        model = StatementImport
+        fields = [
+            "id",
+            "bank_account",
+            "account_number",
+            "file_name",
+            "status",
+            "start_date",
+            "end_date",
+            "ledger_balance",
+            "balance_date",
+            "transactions_read",
+            "transactions_created",
+            "duplicates",
+            "rejected",
+            "errors",
+            "created_at",
+            "finished_at",
+        ]
+
+
+class BankAccountUpdateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    ledger_account = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text="Code of the cash or card account in the entity's chart of accounts",
+    )
+
+
+class BankAccountSerializer(serializers.ModelSerializer):
+    ledger_account_code = serializers.CharField(source="ledger_account.code", default=None)
+
+    class Meta:
+        model = BankAccount
+        fields = [
+            "id",
+            "name",
+            "bank_id",
+            "account_number",
+            "account_type",
+            "currency",
+            "ledger_account",
+            "ledger_account_code",
+        ]
+
+
+class ReconcileRequestSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False, help_text="Defaults to a year before end")
+    end = serializers.DateField(required=False, help_text="Defaults to today")
+    date_window = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=31,
+        help_text="Days a ledger transaction may be away from its bank line",
+    )
+    amount_tolerance = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text="Cents a one-to-one match may be off by",
+    )
+    dry_run = serializers.BooleanField(
+        default=False, help_text="Return the matches without storing them"
+    )
+
+
+class MatchSerializer(serializers.Serializer):
+    bank_transactions = serializers.ListField(
+        child=serializers.UUIDField(), source="bank_ids"
+    )
+    ledger_transactions = serializers.ListField(
+        child=serializers.UUIDField(), source="ledger_ids"
+    )
+    score = serializers.FloatField()
+
+
+class ReconcileResultSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    bank_transactions = serializers.IntegerField()
+    ledger_transactions = serializers.IntegerField()
+    reconciliations = serializers.IntegerField()
+    matched_bank_transactions = serializers.IntegerField()
+    matched_ledger_transactions = serializers.IntegerField()
+    committed = serializers.BooleanField()
+    matches = MatchSerializer(many=True)
+
+
+class ManualMatchSerializer(serializers.Serializer):
+    bank_account = serializers.UUIDField()
+    bank_transactions = serializers.ListField(child=serializers.UUIDField(), min_length=1)
+    ledger_transactions = serializers.ListField(child=serializers.UUIDField(), min_length=1)
+
+
+class ReconciliationSerializer(serializers.ModelSerializer):
+    bank_transactions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    ledger_transactions = serializers.SlugRelatedField(
+        source="ledger_lines", slug_field="transaction_id", many=True, read_only=True
+    )
+
+    class Meta:
+        model = Reconciliation
+        fields = [
+            "id",
+            "bank_account",
+            "method",
+            "score",
+            "matched_by",
+            "bank_transactions",
+            "ledger_transactions",
+            "created_at",
+        ]
@@ -0,0 +1,160 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import BinaryIO
+
+from banking.services.matching import Line, tokens
+
+V1_HEADER = (
+    "OFXHEADER:100\r\nDATA:OFXSGML\r\nVERSION:102\r\nSECURITY:NONE\r\n"
+    "ENCODING:USASCII\r\nCHARSET:1252\r\nCOMPRESSION:NONE\r\n"
+    "OLDFILEUID:NONE\r\nNEWFILEUID:NONE\r\n\r\n"
+)
+V2_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\r\n'
+    '<?OFX OFXHEADER="200" VERSION="220" SECURITY="NONE" '
+    'OLDFILEUID="NONE" NEWFILEUID="NONE"?>\r\n'
+)
+
+PAYEES = ("POS COFFEE & CO", "SALARY", "RENT", "UTILITY CO", "TRANSFER", "CARD FEE")
+# amounts (cents) that recur through the year, so several lines compete for a match
+RECURRING = (-150000, -4999, -1299, -89000, 250000, 10000)
+
+
+def _dt(value: datetime) -> str:
+    return value.strftime("%Y%m%d%H%M%S.000[0:UTC]")
+
+
+def generated_transactions(count: int, start: datetime = None, seed: int = 0):
+    """(fitid, type, posted_at, amount, name) tuples spread over a year."""
+    rng = random.Random(seed)
+    start = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(days=365) / max(count, 1)
+    for index in range(count):
+        amount = Decimal(rng.randint(-500000, 300000)) / 100 or Decimal("1.00")
+        yield (
+            f"FIT{seed}-{index:09d}",
+            "CREDIT" if amount > 0 else "DEBIT",
+            start + step * index,
+            amount,
+            rng.choice(PAYEES),
+        )
+
+
+def write_statement(
+    target: BinaryIO,
+    transactions,
+    version: int = 1,
+    bank_id: str = "011000015",
+    account_number: str = "000123456789",
+):
+    """
+    Writes a bank statement holding `transactions` (see
+    generated_transactions()) to `target` as OFX v1 SGML, with unclosed
+    value elements, or v2 XML. Written one transaction at a time.
+    """
+    close = version == 2
+
+    def element(tag, value):
+        value = str(value).replace("&", "&amp;")
+        return f"<{tag}>{value}</{tag}>" if close else f"<{tag}>{value}"
+
+    now = datetime.now(timezone.utc)
+    target.write((V2_HEADER if close else V1_HEADER).encode("ascii"))
+    target.write(
+        (
+            "<OFX><SIGNONMSGSRSV1><SONRS><STATUS>"
+            + element("CODE", 0)
+            + element("SEVERITY", "INFO")
+            + "</STATUS>"
+            + element("DTSERVER", _dt(now))
+            + element("LANGUAGE", "ENG")
+            + "</SONRS></SIGNONMSGSRSV1><BANKMSGSRSV1><STMTTRNRS>"
+            + element("TRNUID", 1)
+            + "<STATUS>"
+            + element("CODE", 0)
+            + element("SEVERITY", "INFO")
+            + "</STATUS><STMTRS>"
+            + element("CURDEF", "USD")
+            + "<BANKACCTFROM>"
+            + element("BANKID", bank_id)
+            + element("ACCTID", account_number)
+            + element("ACCTTYPE", "CHECKING")
+            + "</BANKACCTFROM><BANKTRANLIST>"
+            + element("DTSTART", _dt(now - timedelta(days=365)))
+            + element("DTEND", _dt(now))
+            + "\r\n"
+        ).encode("ascii")
+    )
+    balance = Decimal("0.00")
+    for fitid, trntype, posted_at, amount, name in transactions:
+        balance += amount
+        target.write(
+            (
+                "<STMTTRN>"
+                + element("TRNTYPE", trntype)
+                + element("DTPOSTED", _dt(posted_at))
+                + element("TRNAMT", amount)
+                + element("FITID", fitid)
+                + element("NAME", name)
+                + element("MEMO", f"Ref {fitid}")
+                + "</STMTTRN>\r\n"
+            ).encode("ascii")
+        )
+    target.write(
+        (
+            "</BANKTRANLIST><LEDGERBAL>"
+            + element("BALAMT", balance)
+            + element("DTASOF", _dt(now))
+            + "</LEDGERBAL></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\r\n"
+        ).encode("ascii")
+    )
+
+
+def reconciliation_lines(count: int, start: date = date(2024, 1, 1), seed: int = 0) -> tuple:
+    """
+    (bank lines, ledger lines, expected matches) for a year of about
+    `count` bank lines: mostly one-to-one, some deposits of several
+    receipts, some payments the bank split in two, and bank fees and
+    outstanding ledger items that match nothing. Ledger dates trail the
+    bank's by up to three days. Expected matches are (bank ids, ledger
+    ids) pairs of frozensets.
+    """
+    rng = random.Random(seed)
+    first = start.toordinal()
+    bank, ledger, expected = [], [], set()
+
+    def amount():
+        if rng.random() < 0.1:
+            return rng.choice(RECURRING)
+        return rng.randint(-500000, 300000) or 100
+
+    def add(bank_cents, ledger_cents, day, payee):
+        bank_ids = [f"B{len(bank) + i}" for i in range(len(bank_cents))]
+        ledger_ids = [f"L{len(ledger) + i}" for i in range(len(ledger_cents))]
+        for id, cents in zip(bank_ids, bank_cents):
+            bank.append(Line(id, day, cents, tokens(f"POS {payee} {rng.randint(1000, 9999)}")))
+        for id, cents in zip(ledger_ids, ledger_cents):
+            ledger.append(Line(id, day - rng.randint(0, 3), cents, tokens(f"{payee} invoice")))
+        if bank_ids and ledger_ids:
+            expected.add((frozenset(bank_ids), frozenset(ledger_ids)))
+
+    while len(bank) < count:
+        day = first + rng.randrange(365)
+        payee = rng.choice(PAYEES)
+        kind = rng.random()
+        if kind < 0.80:
+            cents = amount()
+            add([cents], [cents], day, payee)
+        elif kind < 0.88:
+            receipts = [rng.randint(1000, 200000) for _ in range(rng.randint(2, 3))]
+            add([sum(receipts)], receipts, day, payee)
+        elif kind < 0.92:
+            part = rng.randint(1000, 100000)
+            rest = rng.randint(1000, 100000)
+            add([-part, -rest], [-(part + rest)], day, payee)
+        elif kind < 0.96:
+            add([-rng.randint(100, 5000)], [], day, "CARD FEE")
+        else:
+            add([], [amount()], day, payee)
+    return bank, ledger, expected
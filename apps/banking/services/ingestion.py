@@ -0,0 +1,153 @@
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django_ledger.models import EntityModel
+
+from banking.enums import StatementImportStatus
+from banking.models import BankAccount, BankTransaction, StatementImport
+from banking.services.ofx import (
+    OFXParseError,
+    OFXTransaction,
+    RejectedTransaction,
+    StatementAccount,
+    StatementEnd,
+    parse_statements,
+)
+
+# Rejected transactions kept on a StatementImport, the count covers the rest
+MAX_STORED_ERRORS = 100
+
+
+class StatementIngestionError(Exception):
+    pass
+
+
+def _bank_account(entity: EntityModel, account: StatementAccount) -> BankAccount:
+    bank_account, _ = BankAccount.objects.get_or_create(
+        bank_id=account.bank_id,
+        account_number=account.account_number,
+        defaults={
+            "entity": entity,
+            "account_type": account.account_type,
+            "currency": account.currency,
+        },
+    )
+    if bank_account.entity_id != entity.uuid:
+        raise StatementIngestionError(
+            f"Account {account.account_number} belongs to another entity"
+        )
+    return bank_account
+
+
+def _insert(batch: list):
+    # duplicates of a FITID already stored, or earlier in the file, are
+    # skipped by the unique index
+    try:
+        with transaction.atomic():
+            BankTransaction.objects.bulk_create(batch, ignore_conflicts=True)
+    except DatabaseError as e:
+        raise StatementIngestionError(f"Could not store transactions: {e}")
+    finally:
+        batch.clear()
+
+
+def _finish(statement_import: StatementImport, status: str, **fields):
+    created = BankTransaction.objects.filter(statement_import=statement_import).count()
+    statement_import.transactions_created = created
+    statement_import.duplicates = (
+        statement_import.transactions_read - statement_import.rejected - created
+    )
+    statement_import.status = status
+    statement_import.finished_at = timezone.now()
+    for name, value in fields.items():
+        setattr(statement_import, name, value)
+    statement_import.save()
+
+
+def ingest_statements(
+    entity: EntityModel,
+    source: BinaryIO,
+    file_name: str = "",
+    uploaded_by=None,
+    chunk_size: Optional[int] = None,
+) -> list:
+    """
+    Streams an OFX/QFX file into the entity's bank accounts and returns a
+    StatementImport per statement in it. Transactions are inserted
+    chunk_size at a time as they are parsed, so memory stays flat however
+    long the statement is. Transactions already stored (same account and
+    FITID) are counted as duplicates.
+
+    A file that turns out to be malformed part way through, or a chunk the
+    database refuses, keeps what was inserted before the error; the import
+    is marked FAILED and uploading the file again adds only what is
+    missing.
+    """
+    chunk_size = chunk_size or settings.BANKING_INGEST_CHUNK_SIZE
+    imports = []
+    statement_import = None
+    batch = []
+
+    try:
+        for event in parse_statements(source):
+            if isinstance(event, StatementAccount):
+                statement_import = StatementImport.objects.create(
+                    bank_account=_bank_account(entity, event),
+                    file_name=file_name[:255],
+                    # a User, its id or a token's ClaimsUser
+                    uploaded_by_id=getattr(uploaded_by, "pk", uploaded_by),
+                )
+                imports.append(statement_import)
+                continue
+            if statement_import is None:
+                raise OFXParseError("Transactions before the statement's account")
+
+            if isinstance(event, OFXTransaction):
+                statement_import.transactions_read += 1
+                batch.append(
+                    BankTransaction(
+                        bank_account_id=statement_import.bank_account_id,
+                        statement_import=statement_import,
+                        fitid=event.fitid,
+                        transaction_type=event.transaction_type,
+                        posted_at=event.posted_at,
+                        amount=event.amount,
+                        name=event.name,
+                        memo=event.memo,
+                        check_number=event.check_number,
+                        reference=event.reference,
+                    )
+                )
+                if len(batch) >= chunk_size:
+                    _insert(batch)
+            elif isinstance(event, RejectedTransaction):
+                statement_import.transactions_read += 1
+                statement_import.rejected += 1
+                if len(statement_import.errors) < MAX_STORED_ERRORS:
+                    statement_import.errors.append({"fitid": event.fitid, "error": event.error})
+            elif isinstance(event, StatementEnd):
+                _insert(batch)
+                _finish(
+                    statement_import,
+                    StatementImportStatus.COMPLETED,
+                    start_date=event.start_date,
+                    end_date=event.end_date,
+                    ledger_balance=event.ledger_balance,
+                    balance_date=event.balance_date,
+                )
+                statement_import = None
+    except (OFXParseError, StatementIngestionError) as e:
+        if statement_import is not None:
+            statement_import.errors.append({"fitid": None, "error": str(e)})
+            try:
+                _insert(batch)
+            except StatementIngestionError as insert_error:
+                statement_import.errors.append({"fitid": None, "error": str(insert_error)})
+            _finish(statement_import, StatementImportStatus.FAILED)
+        raise StatementIngestionError(str(e))
+
+    if not imports:
+        raise StatementIngestionError("The file has no bank or card statement")
+    return imports
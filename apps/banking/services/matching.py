@@ -0,0 +1,235 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+
+# Weights of the score parts, which sum to 1
+AMOUNT_WEIGHT = 0.5
+DATE_WEIGHT = 0.3
+TEXT_WEIGHT = 0.2
+# A split match scores a little lower for each line past the first
+GROUP_DECAY = 0.95
+# Nearest lines by date searched for a split match of three
+GROUP_CANDIDATES = 24
+
+
+@dataclass(frozen=True)
+class Line:
+    """
+    A bank or ledger line reduced to what matching needs. `cents` is signed
+    from the bank's side: money in (a ledger debit to the cash account) is
+    positive. `day` is a date ordinal.
+    """
+
+    id: object
+    day: int
+    cents: int
+    tokens: frozenset = frozenset()
+
+
+@dataclass(frozen=True)
+class Match:
+    bank_ids: tuple
+    ledger_ids: tuple
+    score: float
+
+
+@dataclass(frozen=True)
+class MatchOptions:
+    # days a ledger line may be away from its bank line
+    date_window: int = 4
+    # cents a one-to-one match may be off by, e.g. for bank fees
+    amount_tolerance: int = 0
+    min_score: float = 0.5
+    # most lines on the "many" side of a split match, up to 3; 1 turns
+    # split matches off
+    max_group_size: int = 3
+
+
+def tokens(*texts: Optional[str]) -> frozenset:
+    return frozenset(TOKEN_RE.findall(" ".join(text for text in texts if text).lower()))
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Index:
+    """Lines grouped by amount bucket, each bucket sorted by day."""
+
+    def __init__(self, lines: Sequence[Line], width: int):
+        self.width = width
+        buckets = defaultdict(list)
+        for position, line in enumerate(lines):
+            buckets[line.cents // width].append((line.day, position))
+        self.buckets = {}
+        for key, entries in buckets.items():
+            entries.sort()
+            self.buckets[key] = ([day for day, _ in entries], [pos for _, pos in entries])
+
+    def near(self, cents: int, first_day: int, last_day: int):
+        key = cents // self.width
+        for bucket in (key - 1, key, key + 1) if self.width > 1 else (key,):
+            found = self.buckets.get(bucket)
+            if found is None:
+                continue
+            days, positions = found
+            yield from positions[bisect_left(days, first_day) : bisect_right(days, last_day)]
+
+
+def _pairs(bank: Sequence[Line], ledger: Sequence[Line], options: MatchOptions):
+    """
+    Candidate one-to-one pairs as parallel columns, found through the
+    ledger index instead of comparing every bank line with every ledger
+    line.
+    """
+    window, tolerance = options.date_window, options.amount_tolerance
+    index = _Index(ledger, tolerance + 1)
+    bank_column, ledger_column, day_gaps, cent_gaps = [], [], [], []
+    for b, line in enumerate(bank):
+        for l in index.near(line.cents, line.day - window, line.day + window):
+            gap = abs(ledger[l].cents - line.cents)
+            if gap <= tolerance:
+                bank_column.append(b)
+                ledger_column.append(l)
+                day_gaps.append(abs(ledger[l].day - line.day))
+                cent_gaps.append(gap)
+    return bank_column, ledger_column, day_gaps, cent_gaps
+
+
+def _scores(bank, ledger, columns, options: MatchOptions) -> list:
+    """Scores every candidate pair in one pass over the columns."""
+    bank_column, ledger_column, day_gaps, cent_gaps = columns
+    day_span = options.date_window + 1
+    cent_span = options.amount_tolerance + 1
+    return [
+        AMOUNT_WEIGHT * (1 - cents / cent_span)
+        + DATE_WEIGHT * (1 - days / day_span)
+        + TEXT_WEIGHT * _similarity(bank[b].tokens, ledger[l].tokens)
+        for b, l, days, cents in zip(bank_column, ledger_column, day_gaps, cent_gaps)
+    ]
+
+
+def _one_to_one(bank, ledger, options, bank_used, ledger_used) -> list:
+    columns = _pairs(bank, ledger, options)
+    scores = _scores(bank, ledger, columns, options)
+    bank_column, ledger_column, day_gaps, _ = columns
+    matches = []
+    # best pairs first, ties to the closest date
+    for pair in sorted(range(len(scores)), key=lambda p: (-scores[p], day_gaps[p])):
+        if scores[pair] < options.min_score:
+            break
+        b, l = bank_column[pair], ledger_column[pair]
+        if b in bank_used or l in ledger_used:
+            continue
+        bank_used.add(b)
+        ledger_used.add(l)
+        matches.append(Match((bank[b].id,), (ledger[l].id,), round(scores[pair], 4)))
+    return matches
+
+
+def _find_group(target: Line, pool: list, size: int) -> Optional[tuple]:
+    """Positions in `pool` of `size` (2 or 3) lines whose cents add up to the target's."""
+    by_cents = defaultdict(list)
+    for position, line in enumerate(pool):
+        by_cents[line.cents].append(position)
+
+    def pair(cents, after):
+        for i in range(after + 1, len(pool)):
+            for j in by_cents.get(cents - pool[i].cents, ()):
+                if j > i:
+                    return i, j
+        return None
+
+    if size == 2:
+        return pair(target.cents, -1)
+    for i in range(len(pool)):
+        found = pair(target.cents - pool[i].cents, i)
+        if found is not None:
+            return (i, *found)
+    return None
+
+
+def _one_to_many(singles, many, options, singles_used, many_used, size: int) -> list:
+    """
+    (single position, many positions, score) for each unused line of
+    `singles` that equals the sum of `size` unused lines of `many` of the
+    same sign, within the date window. Pairs are looked for among every
+    such line; triples, where chance sums get common on a busy account,
+    only among the GROUP_CANDIDATES nearest by date.
+    """
+    window = options.date_window
+    many_days = [line.day for line in many]
+    magnitudes = [abs(line.cents) for line in many]
+    # unused lines of each sign, by day
+    sides = {True: ([], []), False: ([], [])}
+    for position in sorted(
+        (position for position in range(len(many)) if position not in many_used),
+        key=many_days.__getitem__,
+    ):
+        days, positions = sides[many[position].cents > 0]
+        days.append(many_days[position])
+        positions.append(position)
+
+    found = []
+    for s, target in enumerate(singles):
+        if s in singles_used or target.cents == 0:
+            continue
+        day, limit = target.day, abs(target.cents)
+        days, order = sides[target.cents > 0]
+        in_window = order[bisect_left(days, day - window) : bisect_right(days, day + window)]
+        # (days away, position), nearest first
+        nearest = sorted(
+            (abs(many_days[position] - day), position)
+            for position in in_window
+            if 0 < magnitudes[position] < limit and position not in many_used
+        )
+        if len(nearest) < size:
+            continue
+        if size > 2:
+            nearest = nearest[:GROUP_CANDIDATES]
+        positions = [position for _, position in nearest]
+        group = _find_group(target, [many[position] for position in positions], size)
+        if group is None:
+            continue
+        members = [positions[i] for i in group]
+        date_score = 1 - max(abs(many_days[m] - day) for m in members) / (window + 1)
+        text_score = max(_similarity(target.tokens, many[m].tokens) for m in members)
+        score = (
+            AMOUNT_WEIGHT + DATE_WEIGHT * date_score + TEXT_WEIGHT * text_score
+        ) * GROUP_DECAY ** (size - 1)
+        if score >= options.min_score:
+            singles_used.add(s)
+            many_used.update(members)
+            found.append((s, members, round(score, 4)))
+    return found
+
+
+def match_lines(
+    bank: Sequence[Line], ledger: Sequence[Line], options: MatchOptions = MatchOptions()
+) -> list:
+    """
+    Matches bank lines to ledger lines. One-to-one pairs come first, the
+    best scoring pairs winning; then a bank line may match two or three
+    ledger lines that add up to it (a deposit of several receipts), and a
+    ledger line two or three bank lines (a payment the bank split), all
+    pairs being looked for before any triple. Each line is used at most
+    once.
+    """
+    bank_used, ledger_used = set(), set()
+    matches = _one_to_one(bank, ledger, options, bank_used, ledger_used)
+    for size in range(2, min(options.max_group_size, 3) + 1):
+        for b, members, score in _one_to_many(
+            bank, ledger, options, bank_used, ledger_used, size
+        ):
+            matches.append(Match((bank[b].id,), tuple(ledger[m].id for m in members), score))
+        for l, members, score in _one_to_many(
+            ledger, bank, options, ledger_used, bank_used, size
+        ):
+            matches.append(Match(tuple(bank[m].id for m in members), (ledger[l].id,), score))
+    return matches
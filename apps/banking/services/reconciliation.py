@@ -0,0 +1,269 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_ledger.models import TransactionModel
+
+from banking.enums import BankTransactionStatus, ReconciliationMethod
+from banking.models import BankAccount, BankTransaction, ReconciledLine, Reconciliation
+from banking.services.matching import Line, MatchOptions, match_lines, tokens
+
+BULK_BATCH_SIZE = 1000
+
+
+class ReconciliationError(Exception):
+    pass
+
+
+def _cents(amount) -> int:
+    return int(amount * 100)
+
+
+def _bounds(start: date, end: date) -> tuple:
+    """Aware datetimes from the start of `start` to the start of the day after `end`."""
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    )
+
+
+def _bank_lines(bank_account: BankAccount, start: date, end: date) -> list:
+    first, after = _bounds(start, end)
+    rows = (
+        BankTransaction.objects.filter(
+            bank_account=bank_account,
+            reconciliation__isnull=True,
+            posted_at__gte=first,
+            posted_at__lt=after,
+        )
+        .values_list("id", "posted_at", "amount", "name", "memo")
+        .iterator(chunk_size=BULK_BATCH_SIZE)
+    )
+    return [
+        Line(id, timezone.localdate(posted_at).toordinal(), _cents(amount), tokens(name, memo))
+        for id, posted_at, amount, name, memo in rows
+    ]
+
+
+def _ledger_transactions(bank_account: BankAccount):
+    """Posted, unreconciled transactions of the account's ledger account."""
+    return TransactionModel.objects.filter(
+        account_id=bank_account.ledger_account_id,
+        journal_entry__ledger__entity_id=bank_account.entity_id,
+        journal_entry__posted=True,
+        journal_entry__is_closing_entry=False,
+        reconciled=False,
+        reconciled_line__isnull=True,
+    )
+
+
+def _ledger_lines(bank_account: BankAccount, start: date, end: date) -> list:
+    first, after = _bounds(start, end)
+    rows = (
+        _ledger_transactions(bank_account)
+        .filter(journal_entry__timestamp__gte=first, journal_entry__timestamp__lt=after)
+        .values_list(
+            "uuid",
+            "journal_entry__timestamp",
+            "tx_type",
+            "amount",
+            "journal_entry__description",
+            "description",
+        )
+        .iterator(chunk_size=BULK_BATCH_SIZE)
+    )
+    # a debit to the cash account is money in
+    return [
+        Line(
+            uuid,
+            timezone.localdate(timestamp).toordinal(),
+            _cents(amount) if tx_type == TransactionModel.DEBIT else -_cents(amount),
+            tokens(je_description, description),
+        )
+        for uuid, timestamp, tx_type, amount, je_description, description in rows
+    ]
+
+
+def _save(bank_account: BankAccount, groups: list, method: str, user=None) -> list:
+    """
+    Stores (bank ids, ledger ids, score) groups as Reconciliations, marking
+    their bank lines MATCHED and their ledger transactions reconciled.
+    """
+    now = timezone.now()
+    reconciliations, bank_transactions, ledger_lines = [], [], []
+    for bank_ids, ledger_ids, score in groups:
+        reconciliation = Reconciliation(
+            bank_account=bank_account,
+            method=method,
+            score=score,
+            # a User, its id or a token's ClaimsUser
+            matched_by_id=getattr(user, "pk", user),
+        )
+        reconciliations.append(reconciliation)
+        bank_transactions.extend(
+            BankTransaction(
+                id=id,
+                reconciliation=reconciliation,
+                status=BankTransactionStatus.MATCHED,
+                updated_at=now,
+            )
+            for id in bank_ids
+        )
+        ledger_lines.extend(
+            ReconciledLine(reconciliation=reconciliation, transaction_id=id) for id in ledger_ids
+        )
+
+    Reconciliation.objects.bulk_create(reconciliations, batch_size=BULK_BATCH_SIZE)
+    BankTransaction.objects.bulk_update(
+        bank_transactions, ["reconciliation", "status", "updated_at"], batch_size=BULK_BATCH_SIZE
+    )
+    ReconciledLine.objects.bulk_create(ledger_lines, batch_size=BULK_BATCH_SIZE)
+    # leaves the balance snapshots alone, the amount and account don't change
+    ledger_ids = [line.transaction_id for line in ledger_lines]
+    for index in range(0, len(ledger_ids), BULK_BATCH_SIZE):
+        TransactionModel.objects.filter(
+            uuid__in=ledger_ids[index : index + BULK_BATCH_SIZE]
+        ).update(reconciled=True)
+    return reconciliations
+
+
+def _lock(bank_account: BankAccount):
+    # reconciliations of one bank account run one at a time
+    BankAccount.objects.select_for_update().filter(id=bank_account.id).exists()
+
+
+def _options(date_window: Optional[int], amount_tolerance: Optional[int]) -> MatchOptions:
+    return MatchOptions(
+        date_window=(
+            settings.BANKING_RECONCILE_DATE_WINDOW if date_window is None else date_window
+        ),
+        amount_tolerance=(
+            settings.BANKING_RECONCILE_AMOUNT_TOLERANCE
+            if amount_tolerance is None
+            else amount_tolerance
+        ),
+    )
+
+
+def reconcile(
+    bank_account: BankAccount,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    date_window: Optional[int] = None,
+    amount_tolerance: Optional[int] = None,
+    user=None,
+    commit: bool = True,
+) -> dict:
+    """
+    Matches the unreconciled bank lines of `bank_account` posted from
+    `start` to `end` (the last year up to today by default) against the
+    unreconciled posted transactions of its ledger account, see
+    matching.match_lines(), and stores the matches as automatic
+    Reconciliations unless `commit` is False. Returns the counts and the
+    matches.
+    """
+    if bank_account.ledger_account_id is None:
+        raise ReconciliationError("Link the bank account to a ledger account first")
+    end = end or timezone.localdate()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise ReconciliationError("start must not be after end")
+    options = _options(date_window, amount_tolerance)
+
+    with transaction.atomic():
+        _lock(bank_account)
+        bank = _bank_lines(bank_account, start, end)
+        window = timedelta(days=options.date_window)
+        ledger = _ledger_lines(bank_account, start - window, end + window)
+        matches = match_lines(bank, ledger, options)
+        if commit:
+            _save(
+                bank_account,
+                [(match.bank_ids, match.ledger_ids, match.score) for match in matches],
+                ReconciliationMethod.AUTO,
+                user,
+            )
+
+    return {
+        "start": start,
+        "end": end,
+        "bank_transactions": len(bank),
+        "ledger_transactions": len(ledger),
+        "reconciliations": len(matches),
+        "matched_bank_transactions": sum(len(match.bank_ids) for match in matches),
+        "matched_ledger_transactions": sum(len(match.ledger_ids) for match in matches),
+        "committed": commit,
+        "matches": matches,
+    }
+
+
+def match_manually(
+    bank_account: BankAccount,
+    bank_transaction_ids: Iterable,
+    ledger_transaction_ids: Iterable,
+    user=None,
+) -> Reconciliation:
+    """
+    Reconciles the given bank lines with the given ledger transactions,
+    which must all be unreconciled and add up to the same amount.
+    """
+    if bank_account.ledger_account_id is None:
+        raise ReconciliationError("Link the bank account to a ledger account first")
+    bank_transaction_ids = set(bank_transaction_ids)
+    ledger_transaction_ids = set(ledger_transaction_ids)
+    if not bank_transaction_ids or not ledger_transaction_ids:
+        raise ReconciliationError("A match needs at least one bank and one ledger transaction")
+
+    with transaction.atomic():
+        _lock(bank_account)
+        bank = dict(
+            BankTransaction.objects.filter(
+                bank_account=bank_account,
+                reconciliation__isnull=True,
+                id__in=bank_transaction_ids,
+            ).values_list("id", "amount")
+        )
+        if len(bank) != len(bank_transaction_ids):
+            raise ReconciliationError(
+                "Bank transactions not found or already reconciled: "
+                + ", ".join(sorted(str(id) for id in bank_transaction_ids - bank.keys()))
+            )
+        ledger = {
+            uuid: amount if tx_type == TransactionModel.DEBIT else -amount
+            for uuid, tx_type, amount in _ledger_transactions(bank_account)
+            .filter(uuid__in=ledger_transaction_ids)
+            .values_list("uuid", "tx_type", "amount")
+        }
+        if len(ledger) != len(ledger_transaction_ids):
+            raise ReconciliationError(
+                "Ledger transactions not found, not posted to the bank's ledger "
+                "account or already reconciled: "
+                + ", ".join(sorted(str(id) for id in ledger_transaction_ids - ledger.keys()))
+            )
+        if sum(bank.values()) != sum(ledger.values()):
+            raise ReconciliationError(
+                f"The bank transactions total {sum(bank.values())}, "
+                f"the ledger transactions {sum(ledger.values())}"
+            )
+        (reconciliation,) = _save(
+            bank_account,
+            [(tuple(bank), tuple(ledger), None)],
+            ReconciliationMethod.MANUAL,
+            user,
+        )
+    return reconciliation
+
+
+def undo_reconciliation(reconciliation: Reconciliation):
+    """Returns the lines of a reconciliation to unreconciled and deletes it."""
+    with transaction.atomic():
+        _lock(reconciliation.bank_account)
+        BankTransaction.objects.filter(reconciliation=reconciliation).update(
+            reconciliation=None, status=BankTransactionStatus.STAGED, updated_at=timezone.now()
+        )
+        TransactionModel.objects.filter(reconciled_line__reconciliation=reconciliation).update(
+            reconciled=False
+        )
+        reconciliation.delete()
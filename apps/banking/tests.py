@@ -1,3 +1,194 @@
-from django.test import TestCase
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django_ledger.models import EntityModel, LedgerModel, TransactionModel
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.test.client import TenantClient
+
+from accounting.services.chart_of_accounts import seed_chart_of_accounts
+from accounting.services.journal_import import import_journal_entries
+from banking.models import BankAccount, BankTransaction, Reconciliation, StatementImport
+from banking.services.fixtures import V1_HEADER, generated_transactions, write_statement
+from banking.services.ofx import (
+    OFXParseError,
+    OFXTransaction,
+    RejectedTransaction,
+    StatementAccount,
+    StatementEnd,
+    parse_statements,
+)
+from identity.enums import UserRoles
+from identity.models import Membership, User
+from identity.serializers import CustomTokenObtainPairSerializer
+
+
+def statement(version: int, count: int = 25) -> io.BytesIO:
+    target = io.BytesIO()
+    write_statement(target, generated_transactions(count), version=version)
+    target.seek(0)
+    return target
+
+
+def v1_statement(*amounts: str) -> io.BytesIO:
+    transactions = "".join(
+        f"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240105<TRNAMT>{amount}"
+        f"<FITID>F{index}<NAME>Shop</STMTTRN>"
+        for index, amount in enumerate(amounts)
+    )
+    body = (
+        "<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>USD"
+        "<BANKACCTFROM><BANKID>1<ACCTID>42<ACCTTYPE>CHECKING</BANKACCTFROM>"
+        f"<BANKTRANLIST><DTSTART>20240101<DTEND>20240131{transactions}</BANKTRANLIST>"
+        "</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+    )
+    return io.BytesIO((V1_HEADER + body).encode("ascii"))
+
+
+class ParseStatementsTests(SimpleTestCase):
+    def assertStatement(self, events, count):
+        self.assertIsInstance(events[0], StatementAccount)
+        self.assertEqual(events[0].account_number, "000123456789")
+        self.assertEqual(events[0].currency, "USD")
+        self.assertIsInstance(events[-1], StatementEnd)
+        transactions = events[1:-1]
+        self.assertEqual(len(transactions), count)
+        self.assertTrue(all(isinstance(event, OFXTransaction) for event in transactions))
+        expected = list(generated_transactions(count))
+        self.assertEqual(
+            [(t.fitid, t.posted_at, t.amount) for t in transactions],
+            [(fitid, posted_at, amount) for fitid, _, posted_at, amount, _ in expected],
+        )
+        self.assertEqual(events[-1].ledger_balance, sum(t.amount for t in transactions))
+
+    def test_v1(self):
+        self.assertStatement(list(parse_statements(statement(1))), 25)
+
+    def test_v2(self):
+        self.assertStatement(list(parse_statements(statement(2))), 25)
+
+    def test_tiny_read_sizes(self):
+        for version in (1, 2):
+            for read_size in (1, 7, 64):
+                with self.subTest(version=version, read_size=read_size):
+                    events = list(parse_statements(statement(version), read_size=read_size))
+                    self.assertStatement(events, 25)
+
+    def test_transaction_fields(self):
+        events = list(parse_statements(v1_statement("-12.345")))
+        transaction = events[1]
+        self.assertEqual(transaction.fitid, "F0")
+        self.assertEqual(transaction.transaction_type, "DEBIT")
+        self.assertEqual(transaction.posted_at, datetime(2024, 1, 5, tzinfo=timezone.utc))
+        self.assertEqual(transaction.amount, Decimal("-12.34"))
+        self.assertEqual(transaction.name, "Shop")
+
+    def test_malformed_amounts_are_rejected(self):
+        bad = ("abc", "NaN", "Infinity", "1e30", "1000000000000000000", "-1e18")
+        events = list(parse_statements(v1_statement("5,25", *bad, "999999999999999999.99")))
+        transactions = events[1:-1]
+
+        self.assertEqual(transactions[0].amount, Decimal("5.25"))
+        self.assertEqual(transactions[-1].amount, Decimal("999999999999999999.99"))
+        for event in transactions[1:-1]:
+            self.assertIsInstance(event, RejectedTransaction)
+            self.assertIn("TRNAMT", event.error)
+        self.assertEqual(
+            [event.fitid for event in transactions[1:-1]],
+            [f"F{index}" for index in range(1, len(bad) + 1)],
+        )
+
+    def test_not_ofx(self):
+        with self.assertRaises(OFXParseError):
+            list(parse_statements(io.BytesIO(b"date,amount\n2024-01-01,5\n")))
+
+    def test_truncated_file(self):
+        data = statement(1).getvalue()
+        with self.assertRaises(OFXParseError):
+            list(parse_statements(io.BytesIO(data[: len(data) // 2])))
+
+
+class BankingAPITestCase(TenantTestCase):
+    """An accountant of the test tenant calling the API with an access token."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="accountant@example.com",
+            password="secret",
+            first_name="Ada",
+            last_name="Accountant",
+        )
+        Membership.objects.create(user=self.user, tenant=self.tenant, role=UserRoles.ACCOUNTANT)
+        self.entity = EntityModel.create_entity(
+            name="Acme", admin=self.user, use_accrual_method=True, fy_start_month=1
+        )
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client = TenantClient(self.tenant, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def upload(self, *amounts: str):
+        upload = SimpleUploadedFile("statement.ofx", v1_statement(*amounts).getvalue())
+        return self.client.post(reverse("banking-statement-upload"), {"file": upload})
+
+
+class StatementUploadAPITests(BankingAPITestCase):
+    def test_upload_with_access_token(self):
+        response = self.upload("-12.50", "40.00")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        statement_import = StatementImport.objects.get()
+        self.assertEqual(statement_import.uploaded_by_id, self.user.pk)
+        self.assertEqual(
+            BankTransaction.objects.filter(statement_import=statement_import).count(), 2
+        )
+
+
+class ReconciliationAPITests(BankingAPITestCase):
+    def setUp(self):
+        super().setUp()
+        seed_chart_of_accounts(self.entity, activate_accounts=True)
+        LedgerModel.objects.create(entity=self.entity, name="Main", ledger_xid="main")
+        # a 25.00 sale received into cash (1010), as in the statement
+        entry = {"entry": "E1", "ledger": "main", "date": "2024-01-05"}
+        rows = [
+            (1, {**entry, "account": "1010", "debit": "25.00"}),
+            (2, {**entry, "account": "4010", "credit": "25.00"}),
+        ]
+        *errors, result = import_journal_entries(self.entity, rows)
+        self.assertEqual(result["summary"]["imported"], 1, errors)
+        self.assertEqual(self.upload("25.00").status_code, 201)
+        self.bank_account = BankAccount.objects.get()
+        response = self.client.patch(
+            reverse("banking-account", args=[self.bank_account.pk]),
+            {"ledger_account": "1010"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_reconcile_with_access_token(self):
+        response = self.client.post(
+            reverse("banking-account-reconcile", args=[self.bank_account.pk]),
+            {"start": "2024-01-01", "end": "2024-01-31"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["reconciliations"], 1)
+        self.assertEqual(Reconciliation.objects.get().matched_by_id, self.user.pk)
+
+    def test_match_manually_with_access_token(self):
+        cash = TransactionModel.objects.get(account__code="1010")
+        response = self.client.post(
+            reverse("banking-reconciliation-create"),
+            {
+                "bank_account": str(self.bank_account.pk),
+                "bank_transactions": [str(BankTransaction.objects.get().pk)],
+                "ledger_transactions": [str(cash.pk)],
+            },
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Reconciliation.objects.get().matched_by_id, self.user.pk)
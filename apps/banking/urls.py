@@ -0,0 +1,29 @@
+from django.urls import path
+
+from banking.endpoints import (
+    BankAccountAPIView,
+    ReconcileAPIView,
+    ReconciliationAPIView,
+    ReconciliationCreateAPIView,
+    StatementUploadAPIView,
+)
+
+urlpatterns = [
+    path("statements/", StatementUploadAPIView.as_view(), name="banking-statement-upload"),
+    path("accounts/<uuid:pk>/", BankAccountAPIView.as_view(), name="banking-account"),
+    path(
+        "accounts/<uuid:pk>/reconcile/",
+        ReconcileAPIView.as_view(),
+        name="banking-account-reconcile",
+    ),
+    path(
+        "reconciliations/",
+        ReconciliationCreateAPIView.as_view(),
+        name="banking-reconciliation-create",
+    ),
+    path(
+        "reconciliations/<uuid:pk>/",
+        ReconciliationAPIView.as_view(),
+        name="banking-reconciliation",
+    ),
+]
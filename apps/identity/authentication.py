@@ -0,0 +1,76 @@
+import time
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from identity.enums import MembershipStatus
+from identity.revocation import claims_revoked_at
+
+IS_ACTIVE_CLAIM = "act"
+MEMBERSHIPS_CLAIM = "mbr"
+CLAIMS_AT_CLAIM = "cat"
+
+
+def add_identity_claims(token, user):
+    """
+    Adds the claims StatelessJWTAuthentication trusts: the active flag, staff
+    flag and active tenant memberships as compact [tenant_id, role] pairs.
+    """
+    token[IS_ACTIVE_CLAIM] = user.is_active
+    token["is_staff"] = user.is_staff
+    token[MEMBERSHIPS_CLAIM] = [
+        [str(tenant_id), role]
+        for tenant_id, role in user.memberships.filter(
+            status=MembershipStatus.ACTIVE
+        ).values_list("tenant_id", "role")
+    ]
+    token[CLAIMS_AT_CLAIM] = round(time.time(), 3)
+    return token
+
+
+def claims_are_stale(token) -> bool:
+    claims_at = token.get(CLAIMS_AT_CLAIM)
+    if claims_at is None:
+        # issued before identity claims existed
+        return True
+    return claims_at < claims_revoked_at(token[api_settings.USER_ID_CLAIM])
+
+
+class ClaimsUser(TokenUser):
+    """User built from access token claims, without loading the User row."""
+
+    @cached_property
+    def is_active(self):
+        return self.token.get(IS_ACTIVE_CLAIM, False)
+
+    @cached_property
+    def tenant_roles(self) -> dict:
+        """tenant id -> set of roles held in that tenant"""
+        roles = {}
+        for tenant_id, role in self.token.get(MEMBERSHIPS_CLAIM, []):
+            roles.setdefault(tenant_id, set()).add(role)
+        return roles
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Trusts the identity claims in the access token and only loads the user
+    from the database when its claims were revoked after they were issued
+    (see identity.revocation).
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if claims_are_stale(validated_token):
+            return super().get_user(validated_token)
+
+        if not validated_token.get(IS_ACTIVE_CLAIM, False):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsUser(validated_token)
@@ -0,0 +1,64 @@
+from django.conf import settings
+
+from commons.cache import TTLCache
+from commons.metrics import registry
+from identity.enums import MembershipStatus
+from identity.models import Membership
+
+lookups_total = registry.counter(
+    "tenant_authorization_lookups_total",
+    "(user, tenant) role lookups by where the roles came from",
+)
+
+# (user id, tenant id) -> frozenset of roles, empty for non-members
+_roles = TTLCache(
+    maxsize=settings.TENANT_AUTHZ_CACHE_SIZE,
+    ttl=settings.TENANT_AUTHZ_CACHE_TTL,
+)
+
+
+def _key(user_id, tenant_id):
+    return (str(user_id), str(tenant_id))
+
+
+def _load(user_id, tenant_id) -> frozenset:
+    # served by the (user, tenant, role) unique index
+    return frozenset(
+        Membership.objects.filter(
+            user_id=user_id, tenant_id=tenant_id, status=MembershipStatus.ACTIVE
+        ).values_list("role", flat=True)
+    )
+
+
+def tenant_roles(user, tenant_id) -> frozenset:
+    """
+    Returns the roles the user holds in the tenant. Users authenticated from
+    token claims carry their roles already; others go through the cache.
+    """
+    claimed = getattr(user, "tenant_roles", None)
+    if claimed is not None:
+        lookups_total.inc(source="claims")
+        return frozenset(claimed.get(str(tenant_id), ()))
+
+    key = _key(user.pk, tenant_id)
+    roles = _roles.get(key)
+    if roles is not None:
+        lookups_total.inc(source="cache")
+        return roles
+
+    lookups_total.inc(source="database")
+    roles = _load(user.pk, tenant_id)
+    _roles.set(key, roles)
+    return roles
+
+
+def prime(user_id, tenant_id, roles) -> None:
+    _roles.set(_key(user_id, tenant_id), frozenset(roles))
+
+
+def invalidate(user_id, tenant_id) -> None:
+    _roles.delete(_key(user_id, tenant_id))
+
+
+def clear() -> None:
+    _roles.clear()
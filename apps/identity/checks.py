@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches)
+def check_revocation_cache(app_configs, **kwargs):
+    # a per-process cache would leave a revoked token valid in every other worker
+    if isinstance(caches[settings.JWT_REVOCATION_CACHE], LocMemCache):
+        return [
+            Error(
+                f"JWT_REVOCATION_CACHE ({settings.JWT_REVOCATION_CACHE!r}) is a "
+                "per-process LocMemCache",
+                hint="Point SHOGUN_JWT_REVOCATION_CACHE at a cache shared by every worker",
+                id="identity.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,112 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from commons.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+hashes_total = registry.counter(
+    "password_hashes_total", "Password hash operations by kind and outcome"
+)
+
+# Hashing is not taken off the request path: the request's own thread
+# hashes and the response waits for it. All this does is cap the hashes
+# running at once in one process at PASSWORD_HASHING_WORKERS, turning the
+# rest away with a 503 once QUEUE are waiting. Under the Dockerfile's sync
+# gunicorn workers a process serves one request at a time, so the cap is
+# never reached and nothing waits; it only has an effect with threaded
+# workers (gthread), where hashlib and argon2-cffi hash in parallel
+# because they release the GIL. What makes a hash cheaper is the hasher
+# and its cost settings (PASSWORD_HASHER_STRATEGY, PASSWORD_*), and the
+# default is still Django's PBKDF2.
+_running = threading.BoundedSemaphore(settings.PASSWORD_HASHING_WORKERS)
+# running + waiting operations, beyond which callers are turned away at once
+_admitted = threading.BoundedSemaphore(
+    settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE
+)
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins at the moment, please retry shortly."
+    default_code = "password_hashing_busy"
+
+
+def run(kind, fn, *args):
+    """
+    Runs a hashing call once fewer than PASSWORD_HASHING_WORKERS are
+    running, waiting up to PASSWORD_HASHING_TIMEOUT for that.
+    """
+    if not _admitted.acquire(blocking=False):
+        hashes_total.inc(kind=kind, outcome="busy")
+        raise PasswordHashingBusy()
+    try:
+        if not _running.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+            hashes_total.inc(kind=kind, outcome="busy")
+            raise PasswordHashingBusy()
+        try:
+            hashes_total.inc(kind=kind, outcome="run")
+            return fn(*args)
+        finally:
+            _running.release()
+    finally:
+        _admitted.release()
+
+
+def hash_password(raw_password) -> str:
+    return run("hash", make_password, raw_password)
+
+
+def verify_password(user, raw_password) -> bool:
+    """
+    Checks the password within the limit. A hash made with another hasher or
+    older cost parameters is upgraded in the background instead of
+    delaying the login.
+    """
+    encoded = user.password
+
+    def setter(raw_password):
+        schedule_rehash(user.pk, raw_password, encoded)
+
+    return run("verify", check_password, raw_password, encoded, setter)
+
+
+def _rehash(user_id, raw_password, old_encoded):
+    _running.acquire()
+    try:
+        # skipped if the password changed since the login that scheduled it
+        get_user_model().objects.filter(pk=user_id, password=old_encoded).update(
+            password=make_password(raw_password)
+        )
+    except Exception:
+        logger.exception("Rehashing the password of user %s failed", user_id)
+    finally:
+        _running.release()
+        _admitted.release()
+        connections.close_all()
+
+
+def schedule_rehash(user_id, raw_password, old_encoded) -> bool:
+    """
+    Rehashes on a background thread without waiting. Returns False if as
+    many operations as the limit allows are running or waiting already;
+    the next login retries.
+    """
+    if not _admitted.acquire(blocking=False):
+        hashes_total.inc(kind="rehash", outcome="busy")
+        return False
+    hashes_total.inc(kind="rehash", outcome="run")
+    threading.Thread(
+        target=_rehash,
+        args=(user_id, raw_password, old_encoded),
+        name="password-rehash",
+        daemon=True,
+    ).start()
+    return True
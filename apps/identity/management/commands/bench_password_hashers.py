@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from identity.hashers import (
+    TunedArgon2PasswordHasher,
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports hashes/sec for each password hasher configuration and pool "
+        "size, to tune the PASSWORD_* cost settings for this host"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pbkdf2-iterations", type=int, nargs="*", default=[600000, 1000000]
+        )
+        parser.add_argument(
+            "--scrypt-work-factors", type=int, nargs="*", default=[2**14, 2**15]
+        )
+        parser.add_argument(
+            "--argon2-memory-costs",
+            type=int,
+            nargs="*",
+            default=[19456, 65536],
+            help="KiB",
+        )
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+        parser.add_argument(
+            "--hashes", type=int, default=20, help="Hashes per configuration and pool size"
+        )
+
+    def handle(self, *args, **options):
+        configs = []
+        for iterations in options["pbkdf2_iterations"]:
+            hasher = TunedPBKDF2PasswordHasher()
+            hasher.iterations = iterations
+            configs.append((f"pbkdf2 iterations={iterations}", hasher))
+        for work_factor in options["scrypt_work_factors"]:
+            hasher = TunedScryptPasswordHasher()
+            hasher.work_factor = work_factor
+            configs.append((f"scrypt n={work_factor}", hasher))
+        for memory_cost in options["argon2_memory_costs"]:
+            hasher = TunedArgon2PasswordHasher()
+            hasher.memory_cost = memory_cost
+            configs.append((f"argon2 m={memory_cost}KiB", hasher))
+
+        self.stdout.write(
+            f"{'configuration':<30} {'workers':>7} {'hashes/s':>9} "
+            f"{'per worker':>10} {'ms/hash':>8}"
+        )
+        for label, hasher in configs:
+            try:
+                hasher.encode("warm-up", hasher.salt())
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f"{label:<30} skipped: {e}"))
+                continue
+            for workers in options["workers"]:
+                rate = self._rate(hasher, workers, options["hashes"])
+                self.stdout.write(
+                    f"{label:<30} {workers:>7} {rate:>9.1f} "
+                    f"{rate / workers:>10.1f} {1000 / (rate / workers):>8.1f}"
+                )
+
+    def _rate(self, hasher, workers, hashes):
+        salts = [hasher.salt() for _ in range(hashes)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            started = time.perf_counter()
+            list(pool.map(lambda salt: hasher.encode("correct horse battery", salt), salts))
+            elapsed = time.perf_counter() - started
+        return hashes / elapsed
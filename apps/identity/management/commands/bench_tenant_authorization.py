@@ -0,0 +1,82 @@
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from identity import authorization
+from identity.authentication import MEMBERSHIPS_CLAIM, ClaimsUser
+from identity.enums import UserRoles
+from identity.models import User
+from identity.permissions import IsTenantMember
+
+
+class Command(BaseCommand):
+    help = (
+        "Times IsTenantMember checks for users belonging to a growing number "
+        "of tenants, for token-claim users and cached database users"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenants",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100, 1000],
+            help="Memberships per user",
+        )
+        parser.add_argument("--checks", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        permission = IsTenantMember.with_roles(UserRoles.OWNER, UserRoles.ADMIN)()
+        statements = 0
+
+        def count_statements(execute, sql, params, many, context):
+            nonlocal statements
+            statements += 1
+            return execute(sql, params, many, context)
+
+        self.stdout.write(f"{'tenants':>8} {'claims ns/check':>16} {'cache ns/check':>15}")
+        with connection.execute_wrapper(count_statements):
+            for count in options["tenants"]:
+                tenant_ids = [uuid.uuid4() for _ in range(count)]
+                roles = [random.choice(UserRoles.values) for _ in tenant_ids]
+
+                token = AccessToken()
+                token[api_settings.USER_ID_CLAIM] = str(uuid.uuid4())
+                token[MEMBERSHIPS_CLAIM] = [
+                    [str(tenant_id), role] for tenant_id, role in zip(tenant_ids, roles)
+                ]
+                claims_user = ClaimsUser(token)
+
+                db_user = User(id=uuid.uuid4())
+                authorization.clear()
+                for tenant_id, role in zip(tenant_ids, roles):
+                    authorization.prime(db_user.pk, tenant_id, [role])
+
+                tenants = [
+                    SimpleNamespace(pk=tenant_id, schema_name=f"t_{tenant_id.hex}")
+                    for tenant_id in tenant_ids
+                ]
+                self.stdout.write(
+                    f"{count:>8} "
+                    f"{self._time(permission, claims_user, tenants, options['checks']):>16.0f} "
+                    f"{self._time(permission, db_user, tenants, options['checks']):>15.0f}"
+                )
+
+        authorization.clear()
+        self.stdout.write(f"Database statements: {statements}")
+
+    def _time(self, permission, user, tenants, checks):
+        requests = [
+            SimpleNamespace(user=user, tenant=random.choice(tenants))
+            for _ in range(min(checks, 10000))
+        ]
+        started = time.perf_counter()
+        for i in range(checks):
+            permission.has_permission(requests[i % len(requests)], None)
+        return (time.perf_counter() - started) / checks * 1e9
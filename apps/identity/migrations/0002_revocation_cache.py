@@ -0,0 +1,26 @@
+from django.db import migrations
+
+# The table `createcachetable` makes for the "revocations" DatabaseCache
+# alias, created here so every deployment has it before serving requests
+CREATE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS identity_revocation_cache (
+    cache_key varchar(255) NOT NULL PRIMARY KEY,
+    value text NOT NULL,
+    expires timestamp with time zone NOT NULL
+);
+CREATE INDEX IF NOT EXISTS identity_revocation_cache_expires
+    ON identity_revocation_cache (expires);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('identity', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_CACHE_TABLE, reverse_sql="DROP TABLE IF EXISTS identity_revocation_cache;"
+        ),
+    ]
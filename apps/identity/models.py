@@ -7,6 +7,7 @@ from django.contrib.auth.models import (
 import uuid
 
 from commons.mixins import ModelMixin
+from identity import hashing
 from identity.enums import UserRoles, MembershipStatus
 
 
@@ -38,6 +39,13 @@ class User(AbstractBaseUser, PermissionsMixin, ModelMixin):
 
     objects = UserManager()
 
+    def set_password(self, raw_password):
+        self.password = hashing.hash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        return hashing.verify_password(self, raw_password)
+
     def get_full_name(self):
         """Return the first_name plus the last_name, with a space in between."""
         return f"{self.first_name} {self.last_name}".strip()
@@ -0,0 +1,35 @@
+from django_tenants.utils import get_public_schema_name
+from rest_framework.permissions import BasePermission
+
+from identity.authorization import tenant_roles
+
+
+class IsTenantMember(BasePermission):
+    """
+    Allows authenticated users with an active membership in the request's
+    tenant. Set `allowed_roles` (or use `with_roles`) to require specific
+    roles. The resolved roles are left on `request.tenant_roles`.
+    """
+
+    allowed_roles = None
+    message = "You are not a member of this tenant."
+
+    @classmethod
+    def with_roles(cls, *roles):
+        return type(cls.__name__, (cls,), {"allowed_roles": frozenset(roles)})
+
+    def has_permission(self, request, view):
+        user = request.user
+        tenant = getattr(request, "tenant", None)
+        if not (user and user.is_authenticated) or tenant is None:
+            return False
+        if tenant.schema_name == get_public_schema_name():
+            return False
+
+        roles = tenant_roles(user, tenant.pk)
+        request.tenant_roles = roles
+        if not roles:
+            return False
+        if self.allowed_roles is None:
+            return True
+        return not roles.isdisjoint(self.allowed_roles)
@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from commons.cache import TTLCache
+
+KEY_PREFIX = "jwt-claims-revoked:"
+
+# Short-lived per-process copy of the shared list, so most requests do not
+# reach the shared cache either
+_local = TTLCache(maxsize=10000, ttl=settings.JWT_REVOCATION_LOCAL_TTL)
+
+
+def _shared_cache():
+    return caches[settings.JWT_REVOCATION_CACHE]
+
+
+def _timeout():
+    # Access tokens are re-minted with fresh claims on refresh, so an entry
+    # only needs to outlive the access tokens issued before it
+    return int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds()) + 60
+
+
+def revoke_user_claims(user_id) -> None:
+    """Marks every identity claim issued for the user until now as stale."""
+    revoked_at = time.time()
+    _shared_cache().set(KEY_PREFIX + str(user_id), revoked_at, _timeout())
+    _local.set(str(user_id), revoked_at)
+
+
+def claims_revoked_at(user_id) -> float:
+    """Returns when the user's claims were last revoked, 0 if they were not."""
+    key = str(user_id)
+    revoked_at = _local.get(key)
+    if revoked_at is None:
+        revoked_at = _shared_cache().get(KEY_PREFIX + key, 0.0)
+        _local.set(key, revoked_at)
+    return revoked_at
@@ -1,5 +1,14 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, UntypedToken
+
+from identity.authentication import StatelessJWTAuthentication, add_identity_claims
 from .models import User
 
 
@@ -24,6 +33,10 @@ class UserSerializer(serializers.ModelSerializer):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom JWT serializer that includes user data in the response"""
 
+    @classmethod
+    def get_token(cls, user):
+        return add_identity_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         # Get the default token data
         data = super().validate(attrs)
@@ -33,3 +46,30 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['status'] = True
 
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-reads the identity claims so a refreshed access token is never stale"""
+
+    def validate(self, attrs):
+        # simplejwt's validate() loads the user unguarded as well
+        try:
+            data = super().validate(attrs)
+            access = AccessToken(data["access"], verify=False)
+            user = User.objects.get(
+                **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}
+            )
+        except User.DoesNotExist:
+            raise InvalidToken("The token's user no longer exists")
+        data["access"] = str(add_identity_claims(access, user))
+
+        return data
+
+
+class CustomTokenVerifySerializer(TokenVerifySerializer):
+    """Also rejects tokens of inactive users, from the claims unless they were revoked"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        StatelessJWTAuthentication().get_user(UntypedToken(attrs["token"]))
+        return data
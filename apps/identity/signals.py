@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from identity import authorization
+from identity.models import Membership, User
+from identity.revocation import revoke_user_claims
+
+
+# Flags carried in (or implied by) the access token claims; IsAdminUser
+# trusts is_staff straight from the token
+REVOKING_FIELDS = ("is_active", "is_staff", "is_superuser")
+
+
+@receiver(pre_save, sender=User)
+def revoke_on_access_change(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(REVOKING_FIELDS):
+        return
+    previous = User.objects.filter(pk=instance.pk).values_list(*REVOKING_FIELDS).first()
+    current = tuple(getattr(instance, field) for field in REVOKING_FIELDS)
+    if previous is not None and previous != current:
+        revoke_user_claims(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Membership)
+def revoke_on_membership_change(sender, instance, **kwargs):
+    revoke_user_claims(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Membership)
+def invalidate_membership_roles(sender, instance, **kwargs):
+    authorization.invalidate(instance.user_id, instance.tenant_id)
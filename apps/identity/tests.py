@@ -1,3 +1,75 @@
-from django.test import TestCase
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from identity.authentication import ClaimsUser, StatelessJWTAuthentication
+from identity.models import User
+from identity.serializers import CustomTokenObtainPairSerializer
+from identity.views import CustomTokenRefreshView
+
+
+def create_user(**fields) -> User:
+    return User.objects.create_user(
+        email="ada@example.com",
+        password="secret",
+        first_name="Ada",
+        last_name="Lovelace",
+        **fields,
+    )
+
+
+def authenticate(token) -> object:
+    return StatelessJWTAuthentication().get_user(AccessToken(str(token)))
+
+
+class ClaimsRevocationTests(TenantTestCase):
+    def test_unrelated_change_keeps_claims(self):
+        user = create_user(is_staff=True)
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        user.first_name = "Augusta"
+        user.save()
+
+        self.assertIsInstance(authenticate(token), ClaimsUser)
+
+    def test_access_changes_revoke_claims(self):
+        for field, before, after in (
+            ("is_staff", True, False),
+            ("is_superuser", False, True),
+        ):
+            with self.subTest(field=field):
+                user = create_user(**{field: before})
+                token = CustomTokenObtainPairSerializer.get_token(user).access_token
+                self.assertIsInstance(authenticate(token), ClaimsUser)
+
+                setattr(user, field, after)
+                user.save(update_fields=[field])
+                authenticated = authenticate(token)
+
+                # the claims are stale, so the user comes from the database
+                self.assertIsInstance(authenticated, User)
+                self.assertEqual(getattr(authenticated, field), after)
+                user.delete()
+
+
+class TokenRefreshTests(TenantTestCase):
+    # in a tenant, as deleting a user cascades into the tenant apps' tables
+
+    def refresh(self, refresh_token):
+        request = APIRequestFactory().post(
+            "/api/v1/identity/jwt/refresh", {"refresh": str(refresh_token)}, format="json"
+        )
+        return CustomTokenRefreshView.as_view()(request)
+
+    def test_refresh_reissues_claims(self):
+        user = create_user(is_staff=True)
+        response = self.refresh(CustomTokenObtainPairSerializer.get_token(user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(AccessToken(response.data["access"])["is_staff"])
+
+    def test_deleted_user(self):
+        user = create_user()
+        refresh_token = CustomTokenObtainPairSerializer.get_token(user)
+        user.delete()
+
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
@@ -7,7 +7,11 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 from identity.utils import set_auth_cookies
-from identity.serializers import CustomTokenObtainPairSerializer
+from identity.serializers import (
+    CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
+    CustomTokenVerifySerializer,
+)
 
 # Create your views here.
 
@@ -32,6 +36,8 @@ class CustomTokenObtainView(TokenObtainPairView):
 class CustomTokenRefreshView(TokenRefreshView):
     """Handles token refresh by reading the refresh token from cookies if not provided in the request body."""
 
+    serializer_class = CustomTokenRefreshSerializer
+
     def post(self, request, *args, **kwargs):
         """Overrides the default post method to get the refresh token from cookies if not provided."""
 
@@ -70,6 +76,8 @@ class CustomTokenVerifyView(TokenVerifyView):
     Custom token verification view to handle token verification.
     """
 
+    serializer_class = CustomTokenVerifySerializer
+
     def post(self, request, *args, **kwargs):
         """
         Handle token verification.
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from onboarding.models import OnboardingApplication
+from onboarding.models import OnboardingApplication, OnboardingTransition, PromotionJob
 
 
 # Register your models here.
@@ -8,3 +8,29 @@ class OnboardingApplicationAdmin(admin.ModelAdmin):
     list_display = ("id", "business_name", "initiated_by", "status", "created_at")
     search_fields = ("business_name", "initiated_by__email")
     list_filter = ("status", "created_at")
+
+
+@admin.register(PromotionJob)
+class PromotionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "onboarding", "status", "step", "created_at", "finished_at")
+    list_filter = ("status",)
+
+
+@admin.register(OnboardingTransition)
+class OnboardingTransitionAdmin(admin.ModelAdmin):
+    list_display = (
+        "application",
+        "from_status",
+        "to_status",
+        "actor",
+        "duration_ms",
+        "created_at",
+    )
+    list_filter = ("to_status",)
+
+    # the table is append-only
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,17 +1,44 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from drf_spectacular.utils import extend_schema
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from onboarding.serializers import (
+    BulkVerificationRequestSerializer,
     OnboardingCreateSerializer,
+    PromotionJobSerializer,
     PromotionRequestSerializer,
+    ReviewQueueItemSerializer,
     VerificationRequestSerializer,
 )
+from onboarding.models import PromotionJob
+from onboarding.enums import BusinessStatusChoices
+from onboarding.services.export import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    export_chunks,
+    export_queryset,
+    iter_rows,
+)
+from onboarding.services.ingestion import (
+    IngestionError,
+    ingest_applications,
+    parse_items,
+)
+from onboarding.services.identifiers import search_applications
+from onboarding.services.jobs import enqueue_promotion
+from onboarding.services.review import (
+    REVIEW_STATUSES,
+    InvalidCursor,
+    review_queue_page,
+)
 from onboarding.services.promotion import (
-    promote_onboarding,
     PromotionError,
     VerificationError,
+    bulk_verify_onboardings,
     verify_onboarding,
 )
 
@@ -101,6 +128,298 @@ class OnboardingCreateView(APIView):
         )
 
 
+class OnboardingBulkCreateView(APIView):
+    """
+    API endpoint to create many onboarding applications in one request.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request={
+            "application/json": {"type": "array", "items": {"type": "object"}},
+            "application/x-ndjson": {"type": "string"},
+        },
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "created": {"type": "integer"},
+                    "failed": {"type": "integer"},
+                    "results": {"type": "array", "items": {"type": "object"}},
+                },
+                "example": {
+                    "created": 1,
+                    "failed": 1,
+                    "results": [
+                        {
+                            "index": 0,
+                            "status": "created",
+                            "application_id": "123e4567-e89b-12d3-a456-426614174000",
+                            "business_name": "Acme Corp",
+                        },
+                        {
+                            "index": 1,
+                            "status": "error",
+                            "errors": ["initiated_by: User with this ID does not exist."],
+                        },
+                    ],
+                },
+            },
+            400: {
+                "type": "object",
+                "properties": {
+                    "detail": {"type": "string"},
+                },
+                "example": {
+                    "detail": "Expected a JSON array of applications",
+                },
+            },
+        },
+        tags=["Onboarding"],
+        summary="Bulk create onboarding applications",
+        description="""
+        Creates many onboarding applications at once from a JSON array
+        (`application/json`) or one application per line
+        (`application/x-ndjson`). Each item takes the same fields as the
+        single create endpoint.
+
+        Invalid items do not stop the others: the response has one result
+        per item, in input order, with either the new application id or the
+        item's errors.
+        """,
+    )
+    def post(self, request):
+        content_type = request.content_type.split(";")[0].strip()
+        stream = request.stream
+        if stream is None:
+            return Response(
+                {"detail": "Request body is empty"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            results = ingest_applications(parse_items(stream, content_type))
+        except IngestionError as e:
+            return Response(
+                {"detail": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created = sum(1 for result in results if result["status"] == "created")
+        return Response(
+            {
+                "created": created,
+                "failed": len(results) - created,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class OnboardingExportView(APIView):
+    """
+    Streams onboarding applications as NDJSON or CSV.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Onboarding"],
+        parameters=[
+            OpenApiParameter(
+                "output", enum=EXPORT_FORMATS, default="ndjson", description="Export format"
+            ),
+            OpenApiParameter(
+                "status",
+                description="Comma-separated statuses, e.g. DRAFT,SUBMITTED",
+            ),
+            OpenApiParameter("country_code", description="Country code, e.g. NG"),
+        ],
+        responses={
+            (200, "application/x-ndjson"): {"type": "string"},
+            (200, "text/csv"): {"type": "string"},
+        },
+        summary="Export onboarding applications",
+        description="""
+        Streams every matching application, oldest first, without loading
+        them into memory. Rows are read page by page in (created_at, id)
+        order, so large exports do not slow down as they progress.
+        """,
+    )
+    def get(self, request):
+        export_format = request.query_params.get("output", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"output must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        statuses = [
+            value
+            for value in request.query_params.get("status", "").upper().split(",")
+            if value
+        ]
+        unknown = set(statuses) - set(BusinessStatusChoices.values)
+        if unknown:
+            return Response(
+                {"detail": f"Unknown status: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = export_queryset(
+            statuses=statuses,
+            country_code=request.query_params.get("country_code"),
+        )
+        response = StreamingHttpResponse(
+            export_chunks(iter_rows(queryset), export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="onboarding-applications.{export_format}"'
+        )
+        return response
+
+
+class ReviewQueueAPIView(APIView):
+    """
+    Lists DRAFT and SUBMITTED applications awaiting verification.
+    """
+
+    permission_classes = [IsAdminUser]
+    max_limit = 200
+
+    @extend_schema(
+        tags=["Onboarding"],
+        parameters=[
+            OpenApiParameter(
+                "status",
+                description="Comma-separated statuses: DRAFT, SUBMITTED (default both)",
+            ),
+            OpenApiParameter("country_code", description="Country code, e.g. NG"),
+            OpenApiParameter("cursor", description="next_cursor of the previous page"),
+            OpenApiParameter("limit", int, description="Page size, at most 200"),
+        ],
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "results": {"type": "array", "items": {"type": "object"}},
+                    "next_cursor": {"type": "string", "nullable": True},
+                },
+                "example": {
+                    "results": [
+                        {
+                            "id": "123e4567-e89b-12d3-a456-426614174000",
+                            "business_name": "Acme Corp",
+                            "country_code": "NG",
+                            "status": "DRAFT",
+                            "initiated_by": "5f0c7a2e-1b9d-4d8e-a3f4-6c2b1e0d9a87",
+                            "business_profile": {"business_type": "LLC", "industry": "Retail"},
+                            "identifiers": {"CAC": "RC123456"},
+                            "created_at": "2024-01-01T12:00:00Z",
+                        }
+                    ],
+                    "next_cursor": "MjAyNC0wMS0wMVQxMjowMDowMCswMDowMHwxMjNlNDU2Nw",
+                },
+            },
+        },
+        summary="Onboarding review queue",
+        description="""
+        Pages through applications waiting for review, oldest first. Pass
+        `next_cursor` back as `cursor` to get the next page; it is null on
+        the last page. Pages stay equally fast however deep the queue is.
+        """,
+    )
+    def get(self, request):
+        statuses = [
+            value
+            for value in request.query_params.get("status", "").upper().split(",")
+            if value
+        ]
+        unknown = set(statuses) - set(REVIEW_STATUSES)
+        if unknown:
+            return Response(
+                {"detail": f"Not a review status: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(int(request.query_params.get("limit", 50)), self.max_limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response(
+                {"detail": "limit must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            page = review_queue_page(
+                statuses=statuses,
+                country_code=request.query_params.get("country_code"),
+                cursor=request.query_params.get("cursor"),
+                limit=limit,
+            )
+        except InvalidCursor as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "results": ReviewQueueItemSerializer(page["results"], many=True).data,
+                "next_cursor": page["next_cursor"],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class OnboardingSearchAPIView(APIView):
+    """
+    Finds applications by registration identifier or business profile.
+    """
+
+    permission_classes = [IsAdminUser]
+    profile_fields = ("business_type", "industry")
+
+    @extend_schema(
+        tags=["Onboarding"],
+        parameters=[
+            OpenApiParameter(
+                "identifier",
+                description="Registration number, matched ignoring case, spaces and dashes",
+            ),
+            OpenApiParameter("kind", description="Identifier kind, e.g. CAC or TIN"),
+            OpenApiParameter("business_type", description="business_profile.business_type"),
+            OpenApiParameter("industry", description="business_profile.industry"),
+        ],
+        responses={200: ReviewQueueItemSerializer(many=True)},
+        summary="Search onboarding applications",
+        description="""
+        Returns up to 50 applications, newest first, matching an identifier
+        (optionally of one kind) and/or business profile values. Both are
+        index lookups, so duplicates can be checked before verification.
+        """,
+    )
+    def get(self, request):
+        params = request.query_params
+        profile = {
+            field: params[field] for field in self.profile_fields if params.get(field)
+        }
+        if not params.get("identifier") and not profile:
+            return Response(
+                {"detail": "Pass identifier or a business profile field"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        applications = search_applications(
+            identifier=params.get("identifier"),
+            kind=params.get("kind"),
+            profile=profile,
+        )
+        return Response(
+            ReviewQueueItemSerializer(applications, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+
 class VerifyOnboardingAPIView(APIView):
     permission_classes = [AllowAny]
 
@@ -145,7 +464,10 @@ class VerifyOnboardingAPIView(APIView):
         onboarding_id = serializer.validated_data["onboarding_id"]
 
         try:
-            onboarding = verify_onboarding(onboarding_id)
+            onboarding = verify_onboarding(
+                onboarding_id,
+                actor=request.user if request.user.is_authenticated else None,
+            )
         except VerificationError as e:
             return Response(
                 {"detail": str(e)},
@@ -162,6 +484,88 @@ class VerifyOnboardingAPIView(APIView):
         )
 
 
+class BulkVerifyOnboardingAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request=BulkVerificationRequestSerializer,
+        tags=["Onboarding"],
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "verified": {"type": "array", "items": {"type": "string"}},
+                    "verified_at": {"type": "string", "format": "date-time"},
+                    "skipped": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "application_id": {"type": "string"},
+                                "reason": {"type": "string"},
+                            },
+                        },
+                    },
+                },
+                "example": {
+                    "verified": ["123e4567-e89b-12d3-a456-426614174000"],
+                    "verified_at": "2024-01-01T12:00:00Z",
+                    "skipped": [
+                        {
+                            "application_id": "9b2f6c1e-0d4a-4f7e-8c55-3f1b2a7d9e10",
+                            "reason": "Only draft onboardings can be verified (status is VERIFIED)",
+                        }
+                    ],
+                },
+            },
+            400: {
+                "type": "object",
+                "properties": {
+                    "detail": {"type": "string"},
+                },
+                "example": {
+                    "detail": "At most 1000 applications per batch",
+                },
+            },
+        },
+        summary="Bulk verify onboarding applications",
+        description="""
+        Verifies every draft application in the list in one statement.
+        Applications that are missing or not in DRAFT are reported in
+        `skipped` with the reason; the others are verified regardless.
+
+        **Required fields:**
+        - onboarding_ids: UUIDs of the onboarding applications to verify
+        """,
+    )
+    def post(self, request):
+        serializer = BulkVerificationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = bulk_verify_onboardings(
+                serializer.validated_data["onboarding_ids"],
+                actor=request.user,
+            )
+        except VerificationError as e:
+            return Response(
+                {"detail": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "verified": [str(pk) for pk in result["verified"]],
+                "verified_at": result["verified_at"],
+                "skipped": [
+                    {"application_id": str(pk), "reason": reason}
+                    for pk, reason in result["skipped"].items()
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class PromoteOnboardingAPIView(APIView):
     permission_classes = [AllowAny]
 
@@ -169,17 +573,17 @@ class PromoteOnboardingAPIView(APIView):
         request=PromotionRequestSerializer,
         tags=["Onboarding"],
         responses={
-            201: {
+            202: {
                 "type": "object",
                 "properties": {
-                    "tenant_id": {"type": "string"},
-                    "schema": {"type": "string"},
+                    "job_id": {"type": "string"},
                     "status": {"type": "string"},
+                    "status_url": {"type": "string"},
                 },
                 "example": {
-                    "tenant_id": "123e4567-e89b-12d3-a456-426614174000",
-                    "schema": "tenant_123e4567e8",
-                    "status": "ACTIVE",
+                    "job_id": "9b2f6c1e-0d4a-4f7e-8c55-3f1b2a7d9e10",
+                    "status": "QUEUED",
+                    "status_url": "/api/v1/onboarding/promote/jobs/9b2f6c1e-0d4a-4f7e-8c55-3f1b2a7d9e10/",
                 },
             },
             400: {
@@ -194,7 +598,10 @@ class PromoteOnboardingAPIView(APIView):
         },
         summary="Promote onboarding application",
         description="""
-        Promotes a verified onboarding application to an active tenant. 
+        Queues the promotion of a verified onboarding application to an active
+        tenant. The promotion runs in the background; poll `status_url` for
+        progress. Repeated requests return the job already in progress.
+
         **Required fields:**
         - onboarding_id: UUID of the onboarding application to promote
         """,
@@ -205,7 +612,7 @@ class PromoteOnboardingAPIView(APIView):
         onboarding_id = serializer.validated_data["onboarding_id"]
 
         try:
-            tenant = promote_onboarding(onboarding_id)
+            job = enqueue_promotion(onboarding_id)
         except PromotionError as e:
             return Response(
                 {"detail": str(e)},
@@ -214,9 +621,34 @@ class PromoteOnboardingAPIView(APIView):
 
         return Response(
             {
-                "tenant_id": str(tenant.id),
-                "schema": tenant.schema_name,
-                "status": tenant.status,
+                "job_id": str(job.id),
+                "status": job.status,
+                "status_url": reverse(
+                    "onboarding-promotion-job", kwargs={"job_id": job.id}
+                ),
             },
-            status=status.HTTP_201_CREATED,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class PromotionJobStatusAPIView(APIView):
+    # the job carries the tenant's schema and the raw error, for staff only
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Onboarding"],
+        responses={200: PromotionJobSerializer},
+        summary="Promotion job status",
+        description="""
+        Returns the state of a queued promotion: QUEUED, RUNNING (with the
+        current step), DONE (with the tenant) or FAILED (with the error).
+        """,
+    )
+    def get(self, request, job_id):
+        job = get_object_or_404(
+            PromotionJob.objects.select_related("tenant"), id=job_id
+        )
+        return Response(
+            PromotionJobSerializer(job).data,
+            status=status.HTTP_200_OK,
         )
@@ -1,4 +1,4 @@
-from django.db.models import TextChoices
+from django.db.models import IntegerChoices, TextChoices
 
 
 class BusinessTypeChoices(TextChoices):
@@ -16,3 +16,25 @@ class BusinessStatusChoices(TextChoices):
     REJECTED = "REJECTED", "Rejected"
     SUBMITTED = "SUBMITTED", "Submitted"
     PROMOTED = "PROMOTED", "Promoted"
+
+
+class TransitionStatusChoices(IntegerChoices):
+    """BusinessStatusChoices as the smallint codes stored in OnboardingTransition"""
+
+    DRAFT = 1, "Draft"
+    UNDER_REVIEW = 2, "Under Review"
+    VERIFIED = 3, "Verified"
+    REJECTED = 4, "Rejected"
+    SUBMITTED = 5, "Submitted"
+    PROMOTED = 6, "Promoted"
+
+    @classmethod
+    def from_business_status(cls, status):
+        return cls[BusinessStatusChoices(status).name]
+
+
+class PromotionJobStatusChoices(TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    RUNNING = "RUNNING", "Running"
+    DONE = "DONE", "Done"
+    FAILED = "FAILED", "Failed"
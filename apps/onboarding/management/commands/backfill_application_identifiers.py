@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from onboarding.models import OnboardingApplication
+from onboarding.services.identifiers import sync_identifiers
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes ApplicationIdentifier rows for applications created before "
+        "identifiers were indexed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        missing = (
+            OnboardingApplication.objects.filter(identifier_rows__isnull=True)
+            .only("id", "identifiers")
+            .order_by("id")
+        )
+        total = 0
+        last_id = None
+        while True:
+            # applications without any usable identifier stay "missing",
+            # so walk forward by id instead of re-querying from the start
+            page = missing.filter(id__gt=last_id) if last_id else missing
+            batch = list(page[: options["batch_size"]])
+            if not batch:
+                break
+            with transaction.atomic():
+                sync_identifiers(batch)
+            total += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"indexed {total} applications", ending="\r")
+        self.stdout.write(f"indexed {total} applications")
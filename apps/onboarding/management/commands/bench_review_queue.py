@@ -0,0 +1,100 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from identity.models import User
+from onboarding.models import OnboardingApplication
+from onboarding.services.review import REVIEW_STATUSES, encode_cursor, review_queue_page
+
+BENCH_PREFIX = "bench-review-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds onboarding applications and compares review queue page latency "
+        "at increasing depths for keyset and OFFSET pagination"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument(
+            "--depths", type=int, nargs="+", default=[0, 1000, 10000, 100000, 900000]
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--skip-seed", action="store_true")
+        parser.add_argument("--cleanup", action="store_true", help="Delete seeded rows")
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            deleted, _ = OnboardingApplication.objects.filter(
+                business_name__startswith=BENCH_PREFIX
+            ).delete()
+            self.stdout.write(f"Deleted {deleted} rows")
+            return
+
+        if not options["skip_seed"]:
+            self._seed(options["rows"])
+
+        queue = OnboardingApplication.objects.filter(
+            status__in=REVIEW_STATUSES
+        ).order_by("created_at", "id")
+        depth_total = queue.count()
+        limit = options["limit"]
+
+        self.stdout.write(f"{'depth':>9} {'keyset p50':>11} {'offset p50':>11}")
+        for depth in options["depths"]:
+            if depth >= depth_total:
+                continue
+            cursor = None
+            if depth:
+                # locating the row is setup, not part of the timing
+                created_at, pk = queue.values_list("created_at", "id")[depth - 1]
+                cursor = encode_cursor(created_at, pk)
+
+            keyset = self._time(
+                lambda: review_queue_page(cursor=cursor, limit=limit), options["repeat"]
+            )
+            offset = self._time(
+                lambda: list(queue[depth : depth + limit]), options["repeat"]
+            )
+            self.stdout.write(f"{depth:>9} {keyset:>9.2f}ms {offset:>9.2f}ms")
+
+    def _time(self, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def _seed(self, rows):
+        user = User.objects.order_by("created_at").first()
+        if user is None:
+            raise CommandError("Create a user first, seeded applications need an initiator")
+
+        statuses = list(REVIEW_STATUSES) + ["VERIFIED", "PROMOTED"]
+        started_at = timezone.now() - timedelta(days=365)
+        batch = []
+        for i in range(rows):
+            batch.append(
+                OnboardingApplication(
+                    initiated_by=user,
+                    country_code=random.choice(["NG", "GH", "KE", "US"]),
+                    business_name=f"{BENCH_PREFIX}{i}",
+                    business_profile={"business_type": "LLC", "industry": "Retail"},
+                    identifiers={"CAC": f"RC{i:08d}"},
+                    status=random.choice(statuses),
+                    created_at=started_at + timedelta(seconds=i * 30),
+                )
+            )
+            if len(batch) == 10000:
+                OnboardingApplication.objects.bulk_create(batch)
+                batch = []
+                self.stdout.write(f"seeded {i + 1}/{rows}", ending="\r")
+        OnboardingApplication.objects.bulk_create(batch)
+        self.stdout.write(f"seeded {rows} rows")
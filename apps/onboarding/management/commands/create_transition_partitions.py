@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from onboarding.services.transitions import drop_partitions_before, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the upcoming monthly partitions of the onboarding transition "
+        "log, and optionally drops old ones. Run it at least monthly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3)
+        parser.add_argument(
+            "--drop-before",
+            metavar="YYYY-MM",
+            help="Drop the partitions of months before this one",
+        )
+
+    def handle(self, *args, **options):
+        for name in ensure_partitions(months_ahead=options["months_ahead"]):
+            self.stdout.write(f"created {name}")
+
+        if options["drop_before"]:
+            try:
+                month = datetime.strptime(options["drop_before"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--drop-before must look like 2024-01")
+            for name in drop_partitions_before(month):
+                self.stdout.write(f"dropped {name}")
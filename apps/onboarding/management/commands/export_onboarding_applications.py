@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from onboarding.enums import BusinessStatusChoices
+from onboarding.services.export import (
+    EXPORT_FORMATS,
+    export_chunks,
+    export_queryset,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Streams onboarding applications to a file or stdout as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument(
+            "--status", nargs="*", choices=BusinessStatusChoices.values, default=[]
+        )
+        parser.add_argument("--country", help="Country code, e.g. NG")
+        parser.add_argument("--output", help="File to write, stdout when omitted")
+        parser.add_argument("--page-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(
+            statuses=options["status"], country_code=options["country"]
+        )
+        chunks = export_chunks(
+            iter_rows(queryset, page_size=options["page_size"]), options["format"]
+        )
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        newline = "" if options["format"] == "csv" else None
+        with open(options["output"], "w", encoding="utf-8", newline=newline) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(f"Exported to {options['output']}")
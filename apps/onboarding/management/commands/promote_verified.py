@@ -0,0 +1,127 @@
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Avg, F
+
+from onboarding.models import OnboardingApplication, PromotionJob
+from onboarding.enums import (
+    BusinessStatusChoices as OnboardingStatus,
+    PromotionJobStatusChoices as JobStatus,
+)
+from onboarding.services.jobs import ACTIVE_JOB_STATUSES
+from onboarding.services.promotion import promote_onboarding
+
+
+def _promote(onboarding_id):
+    started = time.perf_counter()
+    try:
+        tenant = promote_onboarding(onboarding_id)
+    except Exception as e:
+        return onboarding_id, None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+    return onboarding_id, tenant.schema_name, None, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Promotes VERIFIED onboarding applications concurrently across a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(os.cpu_count() or 1, 8),
+            help="Number of worker processes",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Promote at most this many applications"
+        )
+        parser.add_argument(
+            "--country", default=None, help="Only promote applications for this country code"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Estimate the total time without promoting anything",
+        )
+        parser.add_argument(
+            "--assume-seconds",
+            type=float,
+            default=10.0,
+            help="Per-promotion estimate used by --dry-run when there is no job history",
+        )
+
+    def handle(self, *args, **options):
+        queryset = (
+            OnboardingApplication.objects.filter(
+                status=OnboardingStatus.VERIFIED, promoted_at__isnull=True
+            )
+            .exclude(promotion_jobs__status__in=ACTIVE_JOB_STATUSES)
+            .order_by("created_at")
+        )
+        if options["country"]:
+            queryset = queryset.filter(country_code=options["country"].upper())
+
+        ids = list(queryset.values_list("id", flat=True)[: options["limit"]])
+        workers = max(1, min(options["workers"], len(ids) or 1))
+
+        if options["dry_run"]:
+            self._estimate(len(ids), workers, options["assume_seconds"])
+            return
+
+        if not ids:
+            self.stdout.write("Nothing to promote")
+            return
+
+        self.stdout.write(f"Promoting {len(ids)} application(s) with {workers} worker(s)")
+
+        # Workers are forked: close our connections first so no socket is
+        # shared, each child then opens its own on first query.
+        connections.close_all()
+        succeeded = failed = 0
+        started = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            futures = [pool.submit(_promote, onboarding_id) for onboarding_id in ids]
+            for future in as_completed(futures):
+                onboarding_id, schema_name, error, elapsed = future.result()
+                if error:
+                    failed += 1
+                    self.stderr.write(self.style.ERROR(f"{onboarding_id}: {error}"))
+                else:
+                    succeeded += 1
+                    self.stdout.write(f"{onboarding_id} -> {schema_name} ({elapsed:.1f}s)")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Promoted {succeeded}, failed {failed} in {elapsed:.1f}s "
+                f"({succeeded / elapsed if elapsed else 0:.2f} tenants/s)"
+            )
+        )
+
+    def _estimate(self, count, workers, assume_seconds):
+        average = (
+            PromotionJob.objects.filter(
+                status=JobStatus.DONE,
+                started_at__isnull=False,
+                finished_at__isnull=False,
+            )
+            .order_by("-finished_at")[:50]
+            .aggregate(avg=Avg(F("finished_at") - F("started_at")))["avg"]
+        )
+        if average is not None:
+            per_item, source = average.total_seconds(), "recent promotion jobs"
+        else:
+            per_item, source = assume_seconds, "--assume-seconds"
+
+        total = math.ceil(count / workers) * per_item if count else 0
+        self.stdout.write(
+            f"Would promote {count} application(s) with {workers} worker(s): "
+            f"~{total:.0f}s at {per_item:.1f}s each (from {source})"
+        )
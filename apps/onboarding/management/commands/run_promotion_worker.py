@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from onboarding.enums import PromotionJobStatusChoices as JobStatus
+from onboarding.services.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Processes queued onboarding promotion jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                requeue_stale_jobs()
+                continue
+
+            started = time.perf_counter()
+            job = run_job(job)
+            elapsed = time.perf_counter() - started
+
+            if job.status == JobStatus.DONE:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Promoted {job.onboarding_id} in {elapsed:.1f}s"
+                    )
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"Failed {job.onboarding_id} at step "
+                        f"{job.step or '-'}: {job.error}"
+                    )
+                )
@@ -0,0 +1,15 @@
+from onboarding.services.transitions import batched_transitions
+
+
+class TransitionLogMiddleware:
+    """
+    Writes the onboarding transitions recorded while handling a request in
+    one INSERT after the view returns, instead of one per status change.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batched_transitions():
+            return self.get_response(request)
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:27
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0002_alter_onboardingapplication_options_and_more'),
+        ('tenants', '0003_spareschema'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromotionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=20)),
+                ('step', models.CharField(blank=True, default='', max_length=50)),
+                ('step_number', models.PositiveSmallIntegerField(default=0)),
+                ('total_steps', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('onboarding', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='promotion_jobs', to='onboarding.onboardingapplication')),
+                ('tenant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tenants.client')),
+            ],
+            options={
+                'verbose_name': 'Promotion Job',
+                'verbose_name_plural': 'Promotion Jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='onboarding__status_2c244e_idx')],
+            },
+        ),
+    ]
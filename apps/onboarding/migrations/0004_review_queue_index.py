@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:38
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0003_promotionjob'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='onboardingapplication',
+            index=models.Index(condition=models.Q(('status__in', ['DRAFT', 'SUBMITTED'])), fields=['status', 'created_at', 'id'], name='onboarding_review_queue_idx'),
+        ),
+    ]
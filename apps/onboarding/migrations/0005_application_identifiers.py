@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:39
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0004_review_queue_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationIdentifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=32)),
+                ('value', models.CharField(max_length=128)),
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name='onboardingapplication',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['business_profile'], name='onboarding_profile_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddField(
+            model_name='applicationidentifier',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identifier_rows', to='onboarding.onboardingapplication'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationidentifier',
+            index=models.Index(fields=['kind', 'value'], name='onboarding__kind_a7adbb_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='applicationidentifier',
+            unique_together={('application', 'kind')},
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0005_application_identifiers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnboardingTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('DRAFT', 'Draft'), ('UNDER_REVIEW', 'Under Review'), ('VERIFIED', 'Verified'), ('REJECTED', 'Rejected'), ('SUBMITTED', 'Submitted'), ('PROMOTED', 'Promoted')], max_length=20)),
+                ('to_status', models.CharField(choices=[('DRAFT', 'Draft'), ('UNDER_REVIEW', 'Under Review'), ('VERIFIED', 'Verified'), ('REJECTED', 'Rejected'), ('SUBMITTED', 'Submitted'), ('PROMOTED', 'Promoted')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='onboarding.onboardingapplication')),
+            ],
+            options={
+                'verbose_name': 'Onboarding Transition',
+                'verbose_name_plural': 'Onboarding Transitions',
+                'indexes': [models.Index(fields=['application', 'created_at'], name='onboarding__applica_51dc10_idx')],
+            },
+        ),
+    ]
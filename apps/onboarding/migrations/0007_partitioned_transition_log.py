@@ -0,0 +1,132 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:41
+
+from datetime import timedelta
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+TABLE = "onboarding_onboardingtransition"
+
+STATUS_CODES = "CASE {column} " + " ".join(
+    f"WHEN '{status}' THEN {code}"
+    for code, status in enumerate(
+        ["DRAFT", "UNDER_REVIEW", "VERIFIED", "REJECTED", "SUBMITTED", "PROMOTED"], 1
+    )
+) + " END"
+
+# Rebuilds the table partitioned by month on created_at. A partitioned
+# table's primary key must include the partition key, hence (created_at, id).
+# It is built as {TABLE}_new and renamed once the rows are copied.
+PARTITION_SQL = f"""
+CREATE TABLE {TABLE}_new (
+    created_at timestamp with time zone NOT NULL,
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    application_id uuid NOT NULL,
+    actor_id uuid NULL,
+    duration_ms integer NULL CHECK (duration_ms >= 0),
+    from_status smallint NOT NULL CHECK (from_status >= 0),
+    to_status smallint NOT NULL CHECK (to_status >= 0),
+    step_ms integer[] NULL,
+    CONSTRAINT {TABLE}_pkey_new PRIMARY KEY (created_at, id)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE {TABLE}_default PARTITION OF {TABLE}_new DEFAULT;
+"""
+
+COPY_SQL = f"""
+INSERT INTO {TABLE}_new (created_at, application_id, actor_id, from_status, to_status)
+SELECT created_at, application_id, actor_id,
+       {STATUS_CODES.format(column="from_status")},
+       {STATUS_CODES.format(column="to_status")}
+FROM {TABLE};
+
+DROP TABLE {TABLE};
+ALTER TABLE {TABLE}_new RENAME TO {TABLE};
+ALTER TABLE {TABLE} RENAME CONSTRAINT {TABLE}_pkey_new TO {TABLE}_pkey;
+
+CREATE INDEX onboarding__applica_51dc10_idx ON {TABLE} (application_id, created_at);
+
+CREATE FUNCTION onboarding_transition_append_only() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    RAISE EXCEPTION 'onboarding transitions are append-only';
+END
+$$;
+
+CREATE TRIGGER onboarding_transition_append_only
+BEFORE UPDATE OR DELETE OR TRUNCATE ON {TABLE}
+FOR EACH STATEMENT EXECUTE FUNCTION onboarding_transition_append_only();
+"""
+
+
+def create_monthly_partitions(apps, schema_editor):
+    """This month and the next two; create_transition_partitions adds later ones."""
+    month = timezone.now().date().replace(day=1)
+    for _ in range(3):
+        following = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE}_y{month.year}m{month.month:02d} "
+            f"PARTITION OF {TABLE}_new "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') "
+            f"TO ('{following.isoformat()} 00:00+00')"
+        )
+        month = following
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0006_onboardingtransition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(PARTITION_SQL),
+                # before the copy, so current rows land in monthly partitions
+                migrations.RunPython(create_monthly_partitions),
+                migrations.RunSQL(COPY_SQL),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='onboardingtransition',
+                    name='duration_ms',
+                    field=models.PositiveIntegerField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name='onboardingtransition',
+                    name='step_ms',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), blank=True, null=True, size=None),
+                ),
+                migrations.AlterField(
+                    model_name='onboardingtransition',
+                    name='actor',
+                    field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='onboardingtransition',
+                    name='application',
+                    field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='transitions', to='onboarding.onboardingapplication'),
+                ),
+                migrations.AlterField(
+                    model_name='onboardingtransition',
+                    name='from_status',
+                    field=models.PositiveSmallIntegerField(choices=[(1, 'Draft'), (2, 'Under Review'), (3, 'Verified'), (4, 'Rejected'), (5, 'Submitted'), (6, 'Promoted')]),
+                ),
+                migrations.AlterField(
+                    model_name='onboardingtransition',
+                    name='id',
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='onboardingtransition',
+                    name='to_status',
+                    field=models.PositiveSmallIntegerField(choices=[(1, 'Draft'), (2, 'Under Review'), (3, 'Verified'), (4, 'Rejected'), (5, 'Submitted'), (6, 'Promoted')]),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:28
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0007_partitioned_transition_log'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='applicationidentifier',
+            index=models.Index(fields=['value', 'kind'], name='onboarding__value_c3448a_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='applicationidentifier',
+            name='onboarding__kind_a7adbb_idx',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0008_identifier_value_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='onboardingapplication',
+            index=models.Index(fields=['created_at', 'id'], name='onboarding_export_idx'),
+        ),
+    ]
@@ -1,6 +1,13 @@
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+from django.utils import timezone
 from commons.mixins import ModelMixin
-from onboarding.enums import BusinessStatusChoices
+from onboarding.enums import (
+    BusinessStatusChoices,
+    PromotionJobStatusChoices,
+    TransitionStatusChoices,
+)
 
 
 class OnboardingApplication(ModelMixin):
@@ -28,8 +35,130 @@ class OnboardingApplication(ModelMixin):
     class Meta:
         verbose_name = "Onboarding Application"
         verbose_name_plural = "Onboarding Applications"
+        indexes = [
+            # business_profile containment searches (services.identifiers)
+            GinIndex(
+                fields=["business_profile"],
+                name="onboarding_profile_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+            # review queue (services.review): one ordered scan per status
+            models.Index(
+                fields=["status", "created_at", "id"],
+                name="onboarding_review_queue_idx",
+                condition=models.Q(
+                    status__in=[
+                        BusinessStatusChoices.DRAFT,
+                        BusinessStatusChoices.SUBMITTED,
+                    ]
+                ),
+            ),
+            # export pages (services.export) in (created_at, id) order
+            models.Index(fields=["created_at", "id"], name="onboarding_export_idx"),
+        ]
 
     @classmethod
     def create_application(cls, **kwargs):
-        application = cls.objects.create(**kwargs)
+        from onboarding.services.identifiers import sync_identifiers
+
+        with transaction.atomic():
+            application = cls.objects.create(**kwargs)
+            sync_identifiers([application])
         return application
+
+
+class OnboardingTransition(models.Model):
+    """
+    Append-only status history of onboarding applications. The table is
+    partitioned by month on created_at and refuses UPDATE and DELETE; old
+    months are dropped whole. Columns are ordered widest first so rows pack
+    without padding.
+    """
+
+    created_at = models.DateTimeField(default=timezone.now)
+    id = models.BigAutoField(primary_key=True)
+    application = models.ForeignKey(
+        OnboardingApplication,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="transitions",
+    )
+    actor = models.ForeignKey(
+        "identity.User",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    from_status = models.PositiveSmallIntegerField(choices=TransitionStatusChoices.choices)
+    to_status = models.PositiveSmallIntegerField(choices=TransitionStatusChoices.choices)
+    # milliseconds per step, in services.promotion.PROMOTION_STEPS order
+    step_ms = ArrayField(models.PositiveIntegerField(), null=True, blank=True)
+
+    def __str__(self):
+        return (
+            f"OnboardingTransition({self.application_id}, "
+            f"{self.get_from_status_display()} -> {self.get_to_status_display()})"
+        )
+
+    class Meta:
+        verbose_name = "Onboarding Transition"
+        verbose_name_plural = "Onboarding Transitions"
+        indexes = [models.Index(fields=["application", "created_at"])]
+
+
+class ApplicationIdentifier(models.Model):
+    """
+    One normalized entry of OnboardingApplication.identifiers, so a CAC/TIN
+    lookup is an index probe instead of a scan of the JSON column.
+    """
+
+    application = models.ForeignKey(
+        OnboardingApplication, on_delete=models.CASCADE, related_name="identifier_rows"
+    )
+    kind = models.CharField(max_length=32)  # CAC, TIN, EIN, ...
+    value = models.CharField(max_length=128)  # see normalize_identifier
+
+    def __str__(self):
+        return f"ApplicationIdentifier({self.kind}, {self.value})"
+
+    class Meta:
+        unique_together = ("application", "kind")
+        # value first, so a search without a kind can seek it too
+        indexes = [models.Index(fields=["value", "kind"])]
+
+
+class PromotionJob(ModelMixin):
+    """Queued promotion of an onboarding application, processed by run_promotion_worker"""
+
+    onboarding = models.ForeignKey(
+        OnboardingApplication, on_delete=models.PROTECT, related_name="promotion_jobs"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=PromotionJobStatusChoices.choices,
+        default=PromotionJobStatusChoices.QUEUED,
+    )
+    step = models.CharField(max_length=50, blank=True, default="")
+    step_number = models.PositiveSmallIntegerField(default=0)
+    total_steps = models.PositiveSmallIntegerField(default=0)
+    tenant = models.ForeignKey(
+        "tenants.Client",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"PromotionJob({self.onboarding_id}, {self.status}, {self.step})"
+
+    class Meta:
+        verbose_name = "Promotion Job"
+        verbose_name_plural = "Promotion Jobs"
+        indexes = [models.Index(fields=["status", "created_at"])]
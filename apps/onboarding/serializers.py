@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import OnboardingApplication
+from .models import OnboardingApplication, PromotionJob
 
 
 class OnboardingCreateSerializer(serializers.Serializer):
@@ -58,8 +58,43 @@ class OnboardingCreateSerializer(serializers.Serializer):
                 "At least one business identifier is required."
             )
 
+        self.check_identifier_lengths(value)
+        self.check_duplicate_identifiers(value)
+
         return value
 
+    def check_identifier_lengths(self, value):
+        """Normalized identifiers must fit the ApplicationIdentifier columns."""
+        from onboarding.models import ApplicationIdentifier
+        from onboarding.services.identifiers import normalized_pairs
+
+        kind_length = ApplicationIdentifier._meta.get_field("kind").max_length
+        value_length = ApplicationIdentifier._meta.get_field("value").max_length
+        errors = []
+        for kind, identifier in sorted(normalized_pairs(value)):
+            if len(kind) > kind_length:
+                errors.append(f"Identifier type {kind[:40]} is longer than {kind_length}.")
+            elif len(identifier) > value_length:
+                errors.append(f"{kind} is longer than {value_length} characters.")
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    def check_duplicate_identifiers(self, value):
+        """
+        Reject identifiers another application already registered. Best
+        effort: nothing in the database enforces it, so two concurrent
+        creates with the same identifier can both pass.
+        """
+        from onboarding.services.identifiers import (
+            duplicate_errors,
+            find_duplicates,
+            normalized_pairs,
+        )
+
+        errors = duplicate_errors(value, find_duplicates(normalized_pairs(value)))
+        if errors:
+            raise serializers.ValidationError(errors)
+
     def validate_initiated_by(self, value):
         """Validate that the user exists."""
         from identity.models import User
@@ -77,6 +112,19 @@ class OnboardingCreateSerializer(serializers.Serializer):
         return application
 
 
+class OnboardingBulkItemSerializer(OnboardingCreateSerializer):
+    """
+    One item of a bulk import. Initiators and duplicate identifiers are
+    checked for the whole batch at once by services.ingestion.
+    """
+
+    def validate_initiated_by(self, value):
+        return value
+
+    def check_duplicate_identifiers(self, value):
+        pass
+
+
 class OnboardingResponseSerializer(serializers.Serializer):
     """Serializer for onboarding application response."""
 
@@ -87,6 +135,25 @@ class OnboardingResponseSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
 
 
+class ReviewQueueItemSerializer(serializers.ModelSerializer):
+    """Serializer for applications in the review queue."""
+
+    initiated_by = serializers.UUIDField(source="initiated_by_id", read_only=True)
+
+    class Meta:
+        model = OnboardingApplication
+        fields = [
+            "id",
+            "business_name",
+            "country_code",
+            "status",
+            "initiated_by",
+            "business_profile",
+            "identifiers",
+            "created_at",
+        ]
+
+
 class PromotionRequestSerializer(serializers.Serializer):
     """Serializer for promoting onboarding application request."""
 
@@ -101,3 +168,41 @@ class VerificationRequestSerializer(serializers.Serializer):
     onboarding_id = serializers.UUIDField(
         required=True, help_text="UUID of the onboarding application to verify"
     )
+
+
+class BulkVerificationRequestSerializer(serializers.Serializer):
+    """Serializer for verifying many onboarding applications at once."""
+
+    onboarding_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        help_text="UUIDs of the onboarding applications to verify",
+    )
+
+
+class PromotionJobSerializer(serializers.ModelSerializer):
+    """Serializer for promotion job status responses."""
+
+    job_id = serializers.UUIDField(source="id", read_only=True)
+    onboarding_id = serializers.UUIDField(read_only=True)
+    tenant_id = serializers.UUIDField(read_only=True, allow_null=True)
+    schema = serializers.CharField(
+        source="tenant.schema_name", read_only=True, allow_null=True, default=None
+    )
+
+    class Meta:
+        model = PromotionJob
+        fields = [
+            "job_id",
+            "onboarding_id",
+            "status",
+            "step",
+            "step_number",
+            "total_steps",
+            "tenant_id",
+            "schema",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
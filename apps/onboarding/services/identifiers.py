@@ -0,0 +1,91 @@
+import re
+from typing import Iterable
+
+from django.db.models import Q
+
+from onboarding.enums import BusinessStatusChoices
+from onboarding.models import ApplicationIdentifier, OnboardingApplication
+
+_SEPARATORS = re.compile(r"[\s\-./_]+")
+
+# Rejected applications do not block a new one with the same identifiers
+DUPLICATE_IGNORED_STATUSES = (BusinessStatusChoices.REJECTED,)
+
+
+def normalize_kind(kind) -> str:
+    return str(kind).strip().upper()
+
+
+def normalize_identifier(value) -> str:
+    """'rc-123 456' and 'RC123456' are the same registration number."""
+    return _SEPARATORS.sub("", str(value)).upper()
+
+
+def normalized_pairs(identifiers: dict) -> set:
+    return {
+        (normalize_kind(kind), normalize_identifier(value))
+        for kind, value in identifiers.items()
+        if value not in (None, "")
+    }
+
+
+def sync_identifiers(applications: Iterable[OnboardingApplication]) -> None:
+    """Writes the identifier rows of freshly created applications."""
+    ApplicationIdentifier.objects.bulk_create(
+        [
+            ApplicationIdentifier(application=application, kind=kind, value=value)
+            for application in applications
+            for kind, value in normalized_pairs(application.identifiers)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def find_duplicates(pairs: Iterable[tuple], exclude_ids: Iterable = ()) -> dict:
+    """
+    Returns {(kind, value): application id} for the normalized pairs already
+    registered, in one query over the (value, kind) index. A check before
+    insert, not a constraint: concurrent creates can both pass it.
+    """
+    values_by_kind = {}
+    for kind, value in pairs:
+        values_by_kind.setdefault(kind, set()).add(value)
+    condition = Q()
+    for kind, values in values_by_kind.items():
+        condition |= Q(kind=kind, value__in=sorted(values))
+    if not condition:
+        return {}
+    rows = (
+        ApplicationIdentifier.objects.filter(condition)
+        .exclude(application__status__in=DUPLICATE_IGNORED_STATUSES)
+        .exclude(application_id__in=list(exclude_ids))
+        .values_list("kind", "value", "application_id")
+    )
+    return {(kind, value): application_id for kind, value, application_id in rows}
+
+
+def duplicate_errors(identifiers: dict, duplicates: dict) -> list:
+    return [
+        f"{kind} {value} is already registered (application {duplicates[(kind, value)]})."
+        for kind, value in sorted(normalized_pairs(identifiers))
+        if (kind, value) in duplicates
+    ]
+
+
+def search_applications(
+    identifier: str = None, kind: str = None, profile: dict = None, limit: int = 50
+):
+    """
+    Applications matching an identifier (optionally of one kind) and/or
+    containing every key/value of `profile` in business_profile.
+    """
+    queryset = OnboardingApplication.objects.all()
+    if identifier:
+        rows = ApplicationIdentifier.objects.filter(value=normalize_identifier(identifier))
+        if kind:
+            rows = rows.filter(kind=normalize_kind(kind))
+        queryset = queryset.filter(id__in=rows.values("application_id"))
+    if profile:
+        # served by the jsonb_path_ops GIN index
+        queryset = queryset.filter(business_profile__contains=profile)
+    return queryset.order_by("-created_at")[:limit]
@@ -0,0 +1,138 @@
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from identity.models import User
+from onboarding.models import OnboardingApplication
+from onboarding.services.identifiers import (
+    duplicate_errors,
+    find_duplicates,
+    normalized_pairs,
+    sync_identifiers,
+)
+from onboarding.serializers import OnboardingBulkItemSerializer
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+class IngestionError(Exception):
+    pass
+
+
+def _format_errors(detail) -> list:
+    if isinstance(detail, dict):
+        return [f"{field}: {error}" for field, errors in detail.items() for error in errors]
+    return [str(error) for error in detail]
+
+
+def parse_items(stream, content_type: str) -> Iterator:
+    """
+    Yields the decoded items of a JSON array or an NDJSON stream. NDJSON
+    lines that fail to decode are yielded as IngestionError so the other
+    lines still go through.
+    """
+    if content_type in NDJSON_CONTENT_TYPES:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except UnicodeDecodeError:
+                yield IngestionError(f"line {line_number}: not UTF-8")
+            except ValueError as e:
+                yield IngestionError(f"line {line_number}: invalid JSON ({e.msg})")
+        return
+
+    try:
+        items = json.load(stream)
+    except ValueError as e:
+        raise IngestionError(f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise IngestionError("Expected a JSON array of applications")
+    yield from items
+
+
+def ingest_applications(items: Iterable, chunk_size: int = None) -> list:
+    """
+    Validates every item, resolves all initiators and checks all identifiers
+    for duplicates in one query each, and inserts the valid applications
+    with bulk_create in chunks. Returns one result per item, in input order.
+    """
+    chunk_size = chunk_size or settings.ONBOARDING_BULK_CHUNK_SIZE
+    max_items = settings.ONBOARDING_BULK_MAX_ITEMS
+    results = []
+    pending = []  # (result, validated data)
+
+    for index, item in enumerate(items):
+        if index >= max_items:
+            raise IngestionError(f"At most {max_items} applications per request")
+        result = {"index": index}
+        results.append(result)
+
+        if isinstance(item, IngestionError):
+            result.update(status="error", errors=[str(item)])
+            continue
+        serializer = OnboardingBulkItemSerializer(data=item)
+        if not serializer.is_valid():
+            result.update(status="error", errors=_format_errors(serializer.errors))
+            continue
+        pending.append((result, serializer.validated_data))
+
+    known_users = set(
+        User.objects.filter(
+            id__in={data["initiated_by"] for _, data in pending}
+        ).values_list("id", flat=True)
+    )
+
+    registered = find_duplicates(
+        set().union(*(normalized_pairs(data["identifiers"]) for _, data in pending))
+    )
+
+    applications = []
+    seen = {}  # identifiers claimed by earlier items of this batch
+    for result, data in pending:
+        if data["initiated_by"] not in known_users:
+            result.update(
+                status="error",
+                errors=["initiated_by: User with this ID does not exist."],
+            )
+            continue
+        pairs = normalized_pairs(data["identifiers"])
+        errors = duplicate_errors(data["identifiers"], registered) + [
+            f"{kind} {value} is repeated in this batch (item {seen[(kind, value)]})."
+            for kind, value in sorted(pairs)
+            if (kind, value) in seen
+        ]
+        if errors:
+            result.update(status="error", errors=[f"identifiers: {e}" for e in errors])
+            continue
+        seen.update((pair, result["index"]) for pair in pairs)
+        application = OnboardingApplication(
+            initiated_by_id=data.pop("initiated_by"), **data
+        )
+        applications.append((result, application))
+
+    for start in range(0, len(applications), chunk_size):
+        chunk = applications[start : start + chunk_size]
+        try:
+            with transaction.atomic():
+                created = OnboardingApplication.objects.bulk_create(
+                    [application for _, application in chunk]
+                )
+                sync_identifiers(created)
+        except DatabaseError as e:
+            for result, _ in chunk:
+                result.update(status="error", errors=[f"Not saved: {e}"])
+            continue
+        for result, application in chunk:
+            # primary keys are generated client side, so bulk_create knows them
+            result.update(
+                status="created",
+                application_id=str(application.id),
+                business_name=application.business_name,
+            )
+
+    return results
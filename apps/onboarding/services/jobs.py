@@ -0,0 +1,127 @@
+import logging
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from onboarding.models import OnboardingApplication, PromotionJob
+from onboarding.enums import (
+    BusinessStatusChoices as OnboardingStatus,
+    PromotionJobStatusChoices as JobStatus,
+)
+from onboarding.services.promotion import (
+    PROMOTION_STEPS,
+    PromotionError,
+    promote_onboarding,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def enqueue_promotion(onboarding_id: uuid.UUID) -> PromotionJob:
+    """
+    Queues a promotion for the worker. Returns the already active job when
+    the application has one, so retried requests do not queue duplicates.
+    """
+    with transaction.atomic():
+        try:
+            onboarding = OnboardingApplication.objects.select_for_update().get(
+                id=onboarding_id
+            )
+        except OnboardingApplication.DoesNotExist:
+            raise PromotionError("Onboarding application does not exist")
+
+        if onboarding.status != OnboardingStatus.VERIFIED:
+            raise PromotionError("Onboarding must be verified before promotion")
+
+        if onboarding.promoted_at:
+            raise PromotionError("Onboarding already promoted")
+
+        job = onboarding.promotion_jobs.filter(status__in=ACTIVE_JOB_STATUSES).first()
+        if job is None:
+            job = PromotionJob.objects.create(
+                onboarding=onboarding,
+                total_steps=len(PROMOTION_STEPS),
+            )
+        return job
+
+
+def claim_next_job() -> Optional[PromotionJob]:
+    """Moves the oldest queued job to RUNNING, skipping rows other workers hold."""
+    with transaction.atomic():
+        job = (
+            PromotionJob.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.QUEUED)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "updated_at"])
+        return job
+
+
+def requeue_stale_jobs() -> int:
+    """Puts back RUNNING jobs whose worker died before finishing them."""
+    cutoff = timezone.now() - timedelta(seconds=settings.PROMOTION_JOB_TIMEOUT)
+    return PromotionJob.objects.filter(
+        status=JobStatus.RUNNING, started_at__lt=cutoff
+    ).update(status=JobStatus.QUEUED, step="", step_number=0, updated_at=timezone.now())
+
+
+class _StepReporter:
+    """
+    Records step progress on a dedicated autocommit connection, so pollers see
+    it while the promotion transaction on the main connection is still open.
+    """
+
+    def __init__(self, job: PromotionJob):
+        self.job = job
+        self.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+
+    def __call__(self, step_number: int, step: str) -> None:
+        table = self.connection.ops.quote_name(PromotionJob._meta.db_table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET step = %s, step_number = %s, updated_at = %s "
+                "WHERE id = %s",
+                [step, step_number, timezone.now(), str(self.job.id)],
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+def run_job(job: PromotionJob) -> PromotionJob:
+    reporter = _StepReporter(job)
+    update_fields = ["status", "error", "tenant", "finished_at", "updated_at"]
+    try:
+        tenant = promote_onboarding(job.onboarding_id, on_step=reporter)
+    except Exception as e:
+        if not isinstance(e, PromotionError):
+            logger.exception("Promotion job %s failed", job.id)
+        # keep the step the reporter recorded, it is the one that failed
+        job.status = JobStatus.FAILED
+        job.error = str(e)
+    else:
+        job.status = JobStatus.DONE
+        job.tenant = tenant
+        job.step = PROMOTION_STEPS[-1]
+        job.step_number = len(PROMOTION_STEPS)
+        update_fields += ["step", "step_number"]
+    finally:
+        reporter.close()
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=update_fields)
+    if job.status == JobStatus.FAILED:
+        job.refresh_from_db(fields=["step", "step_number"])
+    return job
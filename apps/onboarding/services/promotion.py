@@ -1,12 +1,24 @@
+import time
 import uuid
-from django.db import transaction
+from contextlib import contextmanager
+from typing import Callable, Optional
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from django_tenants.utils import schema_context
 
+from commons.instrumentation import instrument
+
 from onboarding.models import OnboardingApplication
+from onboarding.services.transitions import (
+    build_transition,
+    record_transition,
+    record_transitions,
+)
 from onboarding.enums import BusinessStatusChoices as OnboardingStatus
 from tenants.models import Client, Domain
 from tenants.enums import TenantStatusChoices as TenantStatus
+from tenants.services.provisioning import prepare_tenant_schema
 from identity.models import Membership
 from identity.enums import UserRoles as TenantRole
 
@@ -14,13 +26,15 @@ from django_ledger.models import LedgerModel, EntityModel
 from django_ledger.models.chart_of_accounts import ChartOfAccountModel
 
 from accounting.models import AccountingEntity
+from accounting.services.chart_of_accounts import seed_chart_of_accounts
+from accounting.services.coa_templates import CoATemplateError, template_for_country
 
 
 class VerificationError(Exception):
     pass
 
 
-def verify_onboarding(onboarding_id: uuid.UUID) -> OnboardingApplication:
+def verify_onboarding(onboarding_id: uuid.UUID, actor=None) -> OnboardingApplication:
     with transaction.atomic():
         onboarding = OnboardingApplication.objects.select_for_update().get(
             id=onboarding_id
@@ -32,16 +46,113 @@ def verify_onboarding(onboarding_id: uuid.UUID) -> OnboardingApplication:
         onboarding.status = OnboardingStatus.VERIFIED
         onboarding.verified_at = timezone.now()
         onboarding.save(update_fields=["status", "verified_at"])
+        record_transition(
+            onboarding.id,
+            OnboardingStatus.DRAFT,
+            OnboardingStatus.VERIFIED,
+            actor=actor,
+            at=onboarding.verified_at,
+        )
 
         return onboarding
 
 
+def bulk_verify_onboardings(onboarding_ids, actor=None) -> dict:
+    """
+    Moves every DRAFT application among `onboarding_ids` to VERIFIED with a
+    single UPDATE ... WHERE status = 'DRAFT' RETURNING, so concurrent
+    verifications cannot double-apply. Returns the verified ids and, for
+    the others, why they were skipped.
+    """
+    ids = list(dict.fromkeys(onboarding_ids))
+    if len(ids) > settings.ONBOARDING_BULK_VERIFY_MAX_IDS:
+        raise VerificationError(
+            f"At most {settings.ONBOARDING_BULK_VERIFY_MAX_IDS} applications per batch"
+        )
+
+    table = connection.ops.quote_name(OnboardingApplication._meta.db_table)
+    with transaction.atomic():
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET status = %s, verified_at = %s, updated_at = %s "
+                f"WHERE id = ANY(%s::uuid[]) AND status = %s RETURNING id",
+                [
+                    OnboardingStatus.VERIFIED,
+                    now,
+                    now,
+                    [str(pk) for pk in ids],
+                    OnboardingStatus.DRAFT,
+                ],
+            )
+            verified = [row[0] for row in cursor.fetchall()]
+
+        record_transitions(
+            [
+                build_transition(
+                    pk,
+                    OnboardingStatus.DRAFT,
+                    OnboardingStatus.VERIFIED,
+                    actor=actor,
+                    at=now,
+                )
+                for pk in verified
+            ]
+        )
+
+    verified_set = set(verified)
+    remaining = [pk for pk in ids if pk not in verified_set]
+    statuses = dict(
+        OnboardingApplication.objects.filter(id__in=remaining).values_list("id", "status")
+    )
+    skipped = {}
+    for pk in remaining:
+        if pk not in statuses:
+            skipped[pk] = "Onboarding application not found"
+        else:
+            skipped[pk] = f"Only draft onboardings can be verified (status is {statuses[pk]})"
+
+    return {"verified": verified, "verified_at": now, "skipped": skipped}
+
+
 class PromotionError(Exception):
     pass
 
 
-def promote_onboarding(onboarding_id: uuid.UUID) -> Client:
-
+PROMOTION_STEPS = (
+    "tenant",
+    "domain",
+    "membership",
+    "entity",
+    "chart_of_accounts",
+    "ledger",
+    "finalize",
+)
+
+
+@contextmanager
+def _promotion_step(on_step, step, records):
+    """Reports the step to `on_step` and instruments it as promotion.<step>."""
+    if on_step is not None:
+        on_step(PROMOTION_STEPS.index(step) + 1, step)
+    with instrument(f"promotion.{step}") as record:
+        yield record
+    records.append(record)
+
+
+def promote_onboarding(
+    onboarding_id: uuid.UUID,
+    on_step: Optional[Callable[[int, str], None]] = None,
+) -> Client:
+    """
+    Promotes a verified onboarding application to an active tenant.
+    `on_step(step_number, step_name)` is called as each step in
+    PROMOTION_STEPS starts. Every step, and the slow calls inside them, is
+    timed with commons.instrumentation.
+    """
+
+    started = time.perf_counter()
+    steps = []
     with transaction.atomic():
         onboarding = OnboardingApplication.objects.select_for_update().get(
             id=onboarding_id
@@ -53,54 +164,92 @@ def promote_onboarding(onboarding_id: uuid.UUID) -> Client:
         if onboarding.promoted_at:
             raise PromotionError("Onboarding already promoted")
 
+        try:
+            coa_template = template_for_country(onboarding.country_code)
+        except CoATemplateError as e:
+            raise PromotionError(f"Chart of accounts template {e}")
+
         # schema_name = f"tenant_{onboarding.business_name.lower().replace(' ', '_')}_{str(uuid.uuid4())[:8]}"
         schema_name = onboarding.business_name.lower().strip()
 
-        tenant = Client.objects.create(
-            schema_name=schema_name,
-            name=onboarding.business_name,
-            status=TenantStatus.ACTIVE,
-            country_code=onboarding.country_code,
-            activated_at=timezone.now(),
-        )
-
-        Domain.objects.create(
-            tenant=tenant,
-            domain=f"{schema_name}.shogun-backend-6mov.onrender.com",
-            is_primary=True,
-        )
-
-        # MEMBERSHIP
-        Membership.objects.create(
-            user=onboarding.initiated_by,
-            tenant=tenant,
-            role=TenantRole.OWNER,
-        )
-
-        with schema_context(schema_name):
-            entity = EntityModel.create_entity(
+        with _promotion_step(on_step, "tenant", steps):
+            tenant = Client(
+                schema_name=schema_name,
                 name=onboarding.business_name,
-                admin=onboarding.initiated_by,
-                use_accrual_method=True,
-                fy_start_month=1,
+                status=TenantStatus.ACTIVE,
+                country_code=onboarding.country_code,
+                activated_at=timezone.now(),
             )
-            coa = entity.create_chart_of_accounts(
-                coa_name=f"{entity.name} Default CoA",
-                assign_as_default=True,
-                commit=True,
+            if coa_template.currency:
+                tenant.base_currency = coa_template.currency
+            # Pooled and cloned schemas are already migrated, skip migration replay
+            with instrument("promotion.tenant.prepare_schema"):
+                prepared = prepare_tenant_schema(schema_name)
+            if prepared:
+                tenant.auto_create_schema = False
+            with instrument(
+                "promotion.tenant.save", migrates_schema=str(not prepared).lower()
+            ):
+                tenant.save()
+
+        with _promotion_step(on_step, "domain", steps):
+            Domain.objects.create(
+                tenant=tenant,
+                domain=f"{schema_name}.shogun-backend-6mov.onrender.com",
+                is_primary=True,
             )
 
-            coa.mark_as_active(commit=True)
-
-            LedgerModel.objects.create(
-                name="Primary General Ledger",
-                entity=entity,
-                posted=True,
+        # MEMBERSHIP
+        with _promotion_step(on_step, "membership", steps):
+            Membership.objects.create(
+                user=onboarding.initiated_by,
+                tenant=tenant,
+                role=TenantRole.OWNER,
             )
 
+        with schema_context(schema_name):
+            with _promotion_step(on_step, "entity", steps):
+                entity = EntityModel.create_entity(
+                    name=onboarding.business_name,
+                    admin=onboarding.initiated_by,
+                    use_accrual_method=True,
+                    fy_start_month=1,
+                )
+
+            with _promotion_step(on_step, "chart_of_accounts", steps):
+                with instrument(
+                    "promotion.chart_of_accounts.create",
+                    template=coa_template.country or "default",
+                ):
+                    coa = seed_chart_of_accounts(
+                        entity,
+                        coa_name=f"{entity.name} Default CoA",
+                        assign_as_default=True,
+                        snapshot=coa_template.snapshot,
+                    )
+                with instrument("promotion.chart_of_accounts.activate"):
+                    coa.mark_as_active(commit=True)
+
+            with _promotion_step(on_step, "ledger", steps):
+                LedgerModel.objects.create(
+                    name="Primary General Ledger",
+                    entity=entity,
+                    posted=True,
+                )
+
         # MARK ONBOARDING AS PROMOTED
-        onboarding.status = OnboardingStatus.PROMOTED
-        onboarding.promoted_at = timezone.now()
-        onboarding.save(update_fields=["status", "promoted_at"])
+        with _promotion_step(on_step, "finalize", steps):
+            onboarding.status = OnboardingStatus.PROMOTED
+            onboarding.promoted_at = timezone.now()
+            onboarding.save(update_fields=["status", "promoted_at"])
+
+        record_transition(
+            onboarding.id,
+            OnboardingStatus.VERIFIED,
+            OnboardingStatus.PROMOTED,
+            at=onboarding.promoted_at,
+            duration_ms=round((time.perf_counter() - started) * 1000),
+            step_ms=[step.milliseconds for step in steps],
+        )
 
         return tenant
@@ -0,0 +1,75 @@
+import base64
+import heapq
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from django.db.models import Q
+
+from onboarding.enums import BusinessStatusChoices
+from onboarding.models import OnboardingApplication
+
+# Applications waiting for verify_onboarding, covered by the partial
+# onboarding_review_queue_idx index
+REVIEW_STATUSES = (BusinessStatusChoices.DRAFT, BusinessStatusChoices.SUBMITTED)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(created_at: datetime, pk: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def review_queue_page(
+    statuses: Optional[Iterable[str]] = None,
+    country_code: str = None,
+    cursor: str = None,
+    limit: int = 50,
+) -> dict:
+    """
+    Returns the next `limit` applications under review, oldest first, after
+    the cursor. Each status is read with its own ordered scan of the
+    (status, created_at, id) index and the scans are merged, so a page
+    costs the same at any queue depth.
+    """
+    statuses = [s for s in (statuses or REVIEW_STATUSES) if s in REVIEW_STATUSES]
+
+    after = Q()
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # the created_at__gte bound is what PostgreSQL can seek the index
+        # with; the OR alone only filters
+        after = Q(created_at__gte=created_at) & (
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        )
+
+    scans = []
+    for status in statuses:
+        queryset = OnboardingApplication.objects.filter(after, status=status)
+        if country_code:
+            queryset = queryset.filter(country_code=country_code.upper())
+        scans.append(list(queryset.order_by("status", "created_at", "id")[: limit + 1]))
+
+    merged = list(
+        heapq.merge(*scans, key=lambda application: (application.created_at, application.id))
+    )
+    results = merged[:limit]
+    has_more = len(merged) > limit
+    return {
+        "results": results,
+        "next_cursor": (
+            encode_cursor(results[-1].created_at, results[-1].id) if has_more else None
+        ),
+    }
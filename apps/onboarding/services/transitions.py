@@ -0,0 +1,156 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
+from typing import Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from onboarding.enums import TransitionStatusChoices
+from onboarding.models import OnboardingTransition
+
+logger = logging.getLogger(__name__)
+
+TABLE = OnboardingTransition._meta.db_table
+
+# Rows recorded during the current request, written by flush_transitions
+_buffer: ContextVar[Optional[list]] = ContextVar("onboarding_transitions", default=None)
+
+
+def build_transition(
+    application_id,
+    from_status,
+    to_status,
+    actor=None,
+    duration_ms: int = None,
+    step_ms: list = None,
+    at=None,
+) -> OnboardingTransition:
+    return OnboardingTransition(
+        created_at=at or timezone.now(),
+        application_id=application_id,
+        actor_id=getattr(actor, "pk", actor),
+        duration_ms=duration_ms,
+        from_status=TransitionStatusChoices.from_business_status(from_status),
+        to_status=TransitionStatusChoices.from_business_status(to_status),
+        step_ms=step_ms,
+    )
+
+
+def record_transitions(transitions: list) -> None:
+    """
+    Queues transition rows once the surrounding transaction commits, so a
+    rolled back change leaves no history. Inside batched_transitions the
+    rows are written together at the end; elsewhere they are written as
+    soon as the transaction commits.
+    """
+
+    def enqueue():
+        buffer = _buffer.get()
+        if buffer is None:
+            OnboardingTransition.objects.bulk_create(transitions)
+        else:
+            buffer.extend(transitions)
+
+    transaction.on_commit(enqueue)
+
+
+def record_transition(application_id, from_status, to_status, **kwargs) -> None:
+    record_transitions([build_transition(application_id, from_status, to_status, **kwargs)])
+
+
+@contextmanager
+def batched_transitions():
+    """Collects the transitions recorded in the block and writes them in one INSERT."""
+    token = _buffer.set([])
+    try:
+        yield
+    finally:
+        buffer = _buffer.get()
+        _buffer.reset(token)
+        if buffer:
+            try:
+                OnboardingTransition.objects.bulk_create(buffer)
+            except Exception:
+                # the status changes are committed already, only history is lost
+                logger.exception("Writing %d onboarding transitions failed", len(buffer))
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year}m{month.month:02d}"
+
+
+def _create_partition(cursor, month: date, following: date):
+    """
+    Creates the partition of `month`. PostgreSQL refuses it while the
+    DEFAULT partition holds rows of that month (when the maintenance
+    command ran late), so those are moved: the default is swapped for an
+    empty one and its rows go back through the parent, which routes them
+    to the new partition or the new default. The old default is dropped
+    rather than deleted from, which the append-only trigger allows.
+    """
+    qn = connection.ops.quote_name
+    name, default = partition_name(month), f"{TABLE}_default"
+    bounds = f"FROM ('{month.isoformat()} 00:00+00') TO ('{following.isoformat()} 00:00+00')"
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {qn(default)} "
+        f"WHERE created_at >= %s AND created_at < %s)",
+        [f"{month.isoformat()} 00:00+00", f"{following.isoformat()} 00:00+00"],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE)} FOR VALUES {bounds}")
+        return
+    stranded = f"{default}_stranded"
+    cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(default)}")
+    cursor.execute(f"ALTER TABLE {qn(default)} RENAME TO {qn(stranded)}")
+    cursor.execute(f"CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE)} FOR VALUES {bounds}")
+    cursor.execute(f"CREATE TABLE {qn(default)} PARTITION OF {qn(TABLE)} DEFAULT")
+    cursor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(stranded)}")
+    logger.warning(
+        "Moved %d onboarding transitions out of the default partition", cursor.rowcount
+    )
+    cursor.execute(f"DROP TABLE {qn(stranded)}")
+
+
+def ensure_partitions(months_ahead: int = 3) -> list:
+    """Creates the monthly partitions from this month to `months_ahead` months out."""
+    created = []
+    month = _month_start(timezone.now().date())
+    for _ in range(months_ahead + 1):
+        following = _next_month(month)
+        name = partition_name(month)
+        # each month in one transaction, a failed move leaves the default as it was
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NULL", [name])
+            if cursor.fetchone()[0]:
+                _create_partition(cursor, month, following)
+                created.append(name)
+        month = following
+    return created
+
+
+def drop_partitions_before(month: date) -> list:
+    """Drops whole monthly partitions older than `month`, the only way rows leave the log."""
+    cutoff = partition_name(_month_start(month))
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s AND child.relname ~ %s",
+            [TABLE, r"_y\d{4}m\d{2}$"],
+        )
+        old = sorted(name for (name,) in cursor.fetchall() if name < cutoff)
+        for name in old:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+    return old
@@ -1,3 +1,83 @@
-from django.test import TestCase
+import io
+import uuid
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory
+
+from identity.models import User
+from identity.serializers import CustomTokenObtainPairSerializer
+from onboarding.endpoints import OnboardingBulkCreateView, PromotionJobStatusAPIView
+from onboarding.services.ingestion import IngestionError, parse_items
+
+
+class ParseItemsTests(SimpleTestCase):
+    def test_ndjson_line_errors(self):
+        stream = io.BytesIO(b'{"business_name": "Acme"}\n"\x80abc"\n{oops\n\n[1]\n')
+        items = list(parse_items(stream, "application/x-ndjson"))
+
+        self.assertEqual(len(items), 4)
+        self.assertEqual(items[0], {"business_name": "Acme"})
+        self.assertIsInstance(items[1], IngestionError)
+        self.assertEqual(str(items[1]), "line 2: not UTF-8")
+        self.assertIsInstance(items[2], IngestionError)
+        self.assertTrue(str(items[2]).startswith("line 3: invalid JSON"))
+        self.assertEqual(items[3], [1])
+
+    def test_json_array(self):
+        items = list(parse_items(io.BytesIO(b'[{"a": 1}, {"b": 2}]'), "application/json"))
+        self.assertEqual(items, [{"a": 1}, {"b": 2}])
+
+    def test_json_not_an_array(self):
+        with self.assertRaises(IngestionError):
+            list(parse_items(io.BytesIO(b'{"a": 1}'), "application/json"))
+
+
+class OnboardingBulkCreateViewTests(TestCase):
+    def post(self, body: bytes, user=None):
+        headers = {}
+        if user is not None:
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        request = APIRequestFactory().post(
+            "/api/v1/onboarding/create/bulk/",
+            body,
+            content_type="application/x-ndjson",
+            **headers,
+        )
+        return OnboardingBulkCreateView.as_view()(request)
+
+    def user(self, is_staff: bool) -> User:
+        return User.objects.create_user(
+            email=f"{'staff' if is_staff else 'user'}@example.com",
+            password="secret",
+            first_name="Ada",
+            last_name="Lovelace",
+            is_staff=is_staff,
+        )
+
+    def test_requires_staff(self):
+        self.assertEqual(self.post(b"{}\n").status_code, 401)
+        self.assertEqual(self.post(b"{}\n", self.user(is_staff=False)).status_code, 403)
+
+    def test_invalid_utf8_line_is_a_per_line_error(self):
+        response = self.post(b'"\x80abc"\n', self.user(is_staff=True))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["results"][0]["errors"], ["line 1: not UTF-8"])
+
+
+class PromotionJobStatusAPIViewTests(TestCase):
+    def test_requires_staff(self):
+        user = User.objects.create_user(
+            email="user@example.com", password="secret", first_name="Ada", last_name="Lovelace"
+        )
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        view = PromotionJobStatusAPIView.as_view()
+        job_id = uuid.uuid4()
+        factory = APIRequestFactory()
+        url = f"/api/v1/onboarding/promote/jobs/{job_id}/"
+
+        self.assertEqual(view(factory.get(url), job_id=job_id).status_code, 401)
+        request = factory.get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(view(request, job_id=job_id).status_code, 403)
@@ -1,12 +1,36 @@
 from django.urls import path
 from onboarding.endpoints import (
+    BulkVerifyOnboardingAPIView,
+    OnboardingBulkCreateView,
     OnboardingCreateView,
+    OnboardingExportView,
+    OnboardingSearchAPIView,
     PromoteOnboardingAPIView,
+    PromotionJobStatusAPIView,
+    ReviewQueueAPIView,
     VerifyOnboardingAPIView,
 )
 
 urlpatterns = [
     path("create/", OnboardingCreateView.as_view(), name="onboarding-create"),
+    path(
+        "create/bulk/",
+        OnboardingBulkCreateView.as_view(),
+        name="onboarding-bulk-create",
+    ),
+    path("export/", OnboardingExportView.as_view(), name="onboarding-export"),
     path("promote/", PromoteOnboardingAPIView.as_view(), name="onboarding-promote"),
+    path(
+        "promote/jobs/<uuid:job_id>/",
+        PromotionJobStatusAPIView.as_view(),
+        name="onboarding-promotion-job",
+    ),
+    path("review-queue/", ReviewQueueAPIView.as_view(), name="onboarding-review-queue"),
+    path("search/", OnboardingSearchAPIView.as_view(), name="onboarding-search"),
     path("verify/", VerifyOnboardingAPIView.as_view(), name="onboarding-verify"),
+    path(
+        "verify/bulk/",
+        BulkVerifyOnboardingAPIView.as_view(),
+        name="onboarding-bulk-verify",
+    ),
 ]
@@ -1,7 +1,7 @@
 from django_tenants.admin import TenantAdminMixin
 from django.contrib import admin
 
-from .models import Client, Domain
+from .models import Client, Domain, SpareSchema
 
 
 @admin.register(Client)
@@ -14,3 +14,9 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
 class DomainAdmin(admin.ModelAdmin):
     list_display = ("domain", "tenant", "is_primary")
     search_fields = ("domain", "tenant__name")
+
+
+@admin.register(SpareSchema)
+class SpareSchemaAdmin(admin.ModelAdmin):
+    list_display = ("schema_name", "status", "created_at", "ready_at")
+    list_filter = ("status",)
@@ -0,0 +1,187 @@
+import copy
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from commons.cache import TTLCache
+from commons.metrics import registry
+from tenants.models import Client, Domain
+
+SHARED_KEY_PREFIX = "tenant-host:"
+
+# Cached for hostnames with no Domain row, so unknown hosts skip the query too
+NOT_FOUND = "__not_found__"
+
+# An incremental status refresh looks this far back past the previous one,
+# for transactions that committed late and clocks that disagree
+STATUS_CHANGE_MARGIN = timedelta(seconds=60)
+
+lookups_total = registry.counter(
+    "tenant_resolution_lookups_total", "Hostname to tenant lookups by cache result"
+)
+
+_local = TTLCache(
+    maxsize=settings.TENANT_RESOLUTION_CACHE_SIZE,
+    ttl=settings.TENANT_RESOLUTION_CACHE_TTL,
+)
+
+
+def _shared_cache():
+    alias = settings.TENANT_RESOLUTION_SHARED_CACHE
+    return caches[alias] if alias else None
+
+
+def _load(hostname):
+    try:
+        domain = Domain.objects.select_related("tenant").get(domain=hostname)
+    except Domain.DoesNotExist:
+        return NOT_FOUND
+    return domain.tenant
+
+
+def get_tenant_for_hostname(hostname: str) -> Client:
+    """
+    Resolves a hostname to its tenant through the in-process LRU, then the
+    shared cache, then the database. Raises Domain.DoesNotExist like the
+    django-tenants lookup it replaces.
+    """
+    tenant = _local.get(hostname)
+    if tenant is not None:
+        lookups_total.inc(result="hit")
+    else:
+        shared = _shared_cache()
+        tenant = shared.get(SHARED_KEY_PREFIX + hostname) if shared else None
+        if tenant is not None:
+            lookups_total.inc(result="shared_hit")
+        else:
+            lookups_total.inc(result="miss")
+            tenant = _load(hostname)
+            if shared:
+                shared.set(
+                    SHARED_KEY_PREFIX + hostname,
+                    tenant,
+                    settings.TENANT_RESOLUTION_CACHE_TTL,
+                )
+        _local.set(hostname, tenant)
+
+    if tenant == NOT_FOUND:
+        raise Domain.DoesNotExist(f'No tenant for hostname "{hostname}"')
+    # The middleware sets attributes on the tenant, keep the cached one clean
+    return copy.copy(tenant)
+
+
+def invalidate_hostnames(*hostnames: str) -> None:
+    shared = _shared_cache()
+    for hostname in hostnames:
+        _local.delete(hostname)
+    if shared:
+        shared.delete_many([SHARED_KEY_PREFIX + hostname for hostname in hostnames])
+
+
+def invalidate_tenant(tenant_id) -> None:
+    hostnames = list(
+        Domain.objects.filter(tenant_id=tenant_id).values_list("domain", flat=True)
+    )
+    _local.delete_matching(
+        lambda tenant: tenant != NOT_FOUND and tenant.pk == tenant_id
+    )
+    if hostnames:
+        invalidate_hostnames(*hostnames)
+
+
+def clear() -> None:
+    _local.clear()
+
+
+class TenantStatusMap:
+    """
+    tenant id -> status for tenants that must not be served. Only the blocked
+    rows are held. Every `refresh_interval` seconds the tenants updated since
+    the previous refresh are reloaded, every `full_refresh_interval` seconds
+    the whole set, and in between Client signals patch it in this process
+    once the change commits.
+
+    The incremental reload finds changes by Client.updated_at, which only
+    save() sets. A status changed by QuerySet.update() must set
+    updated_at=Now() too; one changed by raw SQL, or a deleted tenant, is
+    seen at the next full reload.
+    """
+
+    def __init__(self, blocked_statuses, refresh_interval, full_refresh_interval):
+        self.blocked_statuses = frozenset(blocked_statuses)
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._statuses = {}
+        self._loaded_at = None
+        self._full_loaded_at = None
+        self._changed_since = None
+        self._lock = threading.Lock()
+
+    def refresh(self, full=False):
+        started = timezone.now()
+        if full or self._changed_since is None:
+            self._statuses = dict(
+                Client.objects.filter(status__in=self.blocked_statuses).values_list(
+                    "id", "status"
+                )
+            )
+            self._full_loaded_at = time.monotonic()
+        else:
+            statuses = dict(self._statuses)
+            for tenant_id, status in Client.objects.filter(
+                updated_at__gte=self._changed_since
+            ).values_list("id", "status"):
+                if status in self.blocked_statuses:
+                    statuses[tenant_id] = status
+                else:
+                    statuses.pop(tenant_id, None)
+            self._statuses = statuses
+        self._changed_since = started - STATUS_CHANGE_MARGIN
+        self._loaded_at = time.monotonic()
+
+    def _is_fresh(self):
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_interval
+        )
+
+    def _full_refresh_due(self):
+        return (
+            self._full_loaded_at is None
+            or time.monotonic() - self._full_loaded_at >= self.full_refresh_interval
+        )
+
+    def _ensure_fresh(self):
+        if self._is_fresh():
+            return
+        # one thread reloads, the others keep using the current map
+        if self._lock.acquire(blocking=self._loaded_at is None):
+            try:
+                if not self._is_fresh():
+                    self.refresh(full=self._full_refresh_due())
+            finally:
+                self._lock.release()
+
+    def blocked_status(self, tenant_id):
+        """Returns the tenant's status if it is blocked, otherwise None."""
+        self._ensure_fresh()
+        return self._statuses.get(tenant_id)
+
+    def update(self, tenant_id, status):
+        statuses = dict(self._statuses)
+        if status in self.blocked_statuses:
+            statuses[tenant_id] = status
+        else:
+            statuses.pop(tenant_id, None)
+        self._statuses = statuses
+
+
+tenant_statuses = TenantStatusMap(
+    blocked_statuses=settings.TENANT_BLOCKED_STATUSES,
+    refresh_interval=settings.TENANT_STATUS_REFRESH_INTERVAL,
+    full_refresh_interval=settings.TENANT_STATUS_FULL_REFRESH_INTERVAL,
+)
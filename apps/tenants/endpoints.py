@@ -0,0 +1,54 @@
+from django.conf import settings
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema
+
+from tenants.services.schema_pool import (
+    claim_seconds,
+    claims_total,
+    pool_depth,
+)
+
+
+class SchemaPoolStatusView(APIView):
+    """
+    Reports the spare schema pool depth and claim timings for this process.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Tenants"],
+        responses={
+            200: {
+                "type": "object",
+                "example": {
+                    "depth": 4,
+                    "target": 5,
+                    "low_water_mark": 2,
+                    "claims": {"hit": 12, "miss": 1},
+                    "claim_seconds": {"count": 12, "sum": 0.084},
+                },
+            },
+        },
+        summary="Spare schema pool status",
+    )
+    def get(self, request):
+        return Response(
+            {
+                "depth": pool_depth(),
+                "target": settings.TENANT_SCHEMA_POOL_SIZE,
+                "low_water_mark": settings.TENANT_SCHEMA_POOL_LOW_WATER_MARK,
+                "claims": {
+                    "hit": int(claims_total.value(outcome="hit")),
+                    "miss": int(claims_total.value(outcome="miss")),
+                },
+                "claim_seconds": {
+                    "count": claim_seconds.count(),
+                    "sum": round(claim_seconds.sum(), 6),
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -7,3 +7,8 @@ class TenantStatusChoices(TextChoices):
     SUSPENDED = "SUSPENDED", "Suspended"
     PENDING = "PENDING", "Pending"
     CLOSED = "CLOSED", "Closed"
+
+
+class SpareSchemaStatusChoices(TextChoices):
+    PROVISIONING = "PROVISIONING", "Provisioning"
+    READY = "READY", "Ready"
@@ -0,0 +1,93 @@
+import statistics
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+
+from shogun.settings.connections import CONNECTION_MODES, connection_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares request latency and throughput for each database connection "
+        "mode (see shogun/settings/connections.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=CONNECTION_MODES,
+            default=list(CONNECTION_MODES),
+        )
+        parser.add_argument("--requests", type=int, default=500, help="Requests per thread")
+        parser.add_argument("--threads", type=int, default=4, help="Concurrent workers")
+        parser.add_argument(
+            "--queries", type=int, default=2, help="Queries per simulated request"
+        )
+
+    def handle(self, *args, **options):
+        base_settings = connections.settings[DEFAULT_DB_ALIAS]
+        backend = load_backend(base_settings["ENGINE"])
+
+        for mode in options["modes"]:
+            settings_dict = {**base_settings, "OPTIONS": dict(base_settings["OPTIONS"])}
+            settings_dict.update(connection_settings(mode))
+            try:
+                latencies, elapsed = self._run(backend, settings_dict, mode, options)
+            except ImproperlyConfigured as e:
+                self.stdout.write(self.style.WARNING(f"{mode:<11} skipped: {e}"))
+                continue
+
+            latencies.sort()
+            total = len(latencies)
+            self.stdout.write(
+                f"{mode:<11} {total / elapsed:8.1f} req/s  "
+                f"p50 {statistics.median(latencies) * 1000:6.2f}ms  "
+                f"p95 {latencies[int(total * 0.95) - 1] * 1000:6.2f}ms  "
+                f"max {latencies[-1] * 1000:6.2f}ms"
+            )
+
+    def _run(self, backend, settings_dict, mode, options):
+        latencies = []
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            # One wrapper per thread, like one per gunicorn worker thread
+            conn = backend.DatabaseWrapper(settings_dict, alias=f"bench_{mode}")
+            local = []
+            try:
+                for _ in range(options["requests"]):
+                    started = time.perf_counter()
+                    # What request_started / request_finished do
+                    conn.close_if_unusable_or_obsolete()
+                    for _ in range(options["queries"]):
+                        with conn.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                            cursor.fetchone()
+                    conn.close_if_unusable_or_obsolete()
+                    local.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        # The pool is shared by alias, close it once every thread is done
+        backend.DatabaseWrapper(settings_dict, alias=f"bench_{mode}").close_pool()
+
+        if errors:
+            raise errors[0]
+        return latencies, elapsed
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django_tenants.utils import schema_context
+
+from tenants.models import Client, Domain
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a request-like mix of public and tenant queries and reports "
+        "how many SET search_path round-trips the backend skipped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema", help="Tenant schema to switch into")
+        parser.add_argument("--iterations", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        schema = options["schema"]
+        if not hasattr(connection, "search_path_skipped"):
+            raise CommandError("DATABASES ENGINE is not commons.postgresql_backend")
+        if not Client.objects.filter(schema_name=schema).exists():
+            raise CommandError(f"No tenant with schema {schema}")
+
+        from django_ledger.models import EntityModel
+
+        iterations = options["iterations"]
+        executed_before = connection.search_path_executed
+        skipped_before = connection.search_path_skipped
+
+        statements = 0
+
+        def count_statements(execute, sql, params, many, context):
+            nonlocal statements
+            statements += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_statements):
+            for _ in range(iterations):
+                # resolve the tenant, then switch in and out like
+                # promote_onboarding does
+                Domain.objects.filter(tenant__schema_name=schema).first()
+                with schema_context(schema):
+                    EntityModel.objects.exists()
+                    EntityModel.objects.count()
+                Client.objects.filter(schema_name=schema).exists()
+                with schema_context(schema):
+                    EntityModel.objects.exists()
+        elapsed = time.perf_counter() - started
+
+        executed = connection.search_path_executed - executed_before
+        skipped = connection.search_path_skipped - skipped_before
+        queries = statements - executed
+        self.stdout.write(
+            f"{iterations} iterations, {queries} queries in {elapsed:.2f}s\n"
+            f"SET search_path executed: {executed} ({executed / iterations:.1f}/iteration)\n"
+            f"SET search_path skipped:  {skipped} ({skipped / iterations:.1f}/iteration)\n"
+            f"Round-trips saved: {skipped / (executed + skipped or 1):.0%}"
+        )
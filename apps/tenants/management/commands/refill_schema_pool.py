@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tenants.services.schema_pool import discard_stale_schemas, pool_depth, refill_pool
+
+
+class Command(BaseCommand):
+    help = "Tops up the pool of pre-migrated spare tenant schemas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=None,
+            help="Number of spare schemas to keep (defaults to TENANT_SCHEMA_POOL_SIZE)",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and refill whenever the pool drops to the low-water mark",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds between pool checks in --watch mode",
+        )
+
+    def handle(self, *args, **options):
+        size = options["size"] or settings.TENANT_SCHEMA_POOL_SIZE
+        verbosity = max(options["verbosity"] - 1, 0)
+
+        discarded = discard_stale_schemas()
+        if discarded:
+            self.stdout.write(f"Discarded {discarded} stale spare schema(s)")
+
+        self._refill(size, verbosity)
+        if not options["watch"]:
+            return
+
+        while True:
+            time.sleep(options["interval"])
+            if pool_depth() <= settings.TENANT_SCHEMA_POOL_LOW_WATER_MARK:
+                self._refill(size, verbosity)
+
+    def _refill(self, size, verbosity):
+        started = time.perf_counter()
+        created = refill_pool(target=size, verbosity=verbosity)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pool depth {pool_depth()}/{size} "
+                f"({created} provisioned in {elapsed:.1f}s)"
+            )
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_exists
+
+from tenants.services.template import (
+    TemplateSchemaError,
+    pending_migrations,
+    rebuild_template_schema,
+    template_schema_name,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the migrated template schema that new tenant schemas are cloned from"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report whether the template is up to date, exit non-zero if not",
+        )
+
+    def handle(self, *args, **options):
+        template = template_schema_name()
+        if not template:
+            raise CommandError("TENANT_TEMPLATE_SCHEMA is not set")
+
+        if options["check"]:
+            if not schema_exists(template):
+                raise CommandError(f"Template schema {template} does not exist")
+            missing = pending_migrations(template)
+            if missing:
+                raise CommandError(
+                    f"Template schema {template} is missing "
+                    + ", ".join(f"{app}.{name}" for app, name in missing)
+                )
+            self.stdout.write(self.style.SUCCESS(f"Template schema {template} is up to date"))
+            return
+
+        started = time.perf_counter()
+        try:
+            rebuild_template_schema(verbosity=max(options["verbosity"] - 1, 0))
+        except TemplateSchemaError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt template schema {template} in {time.perf_counter() - started:.1f}s"
+            )
+        )
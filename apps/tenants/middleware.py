@@ -0,0 +1,55 @@
+import json
+
+from django.http import HttpResponse
+from django_tenants.middleware.main import TenantMainMiddleware
+from django_tenants.utils import get_public_schema_name
+
+from tenants.cache import get_tenant_for_hostname, tenant_statuses
+from tenants.enums import TenantStatusChoices as TenantStatus
+
+
+class CachedTenantMiddleware(TenantMainMiddleware):
+    """
+    TenantMainMiddleware that resolves hostnames through tenants.cache instead
+    of querying Domain and Client on every request.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        return get_tenant_for_hostname(hostname)
+
+
+class TenantStatusMiddleware:
+    """
+    Rejects requests for suspended, inactive or closed tenants before the rest
+    of the middleware stack runs. Must come right after CachedTenantMiddleware.
+    """
+
+    STATUS_CODES = {TenantStatus.CLOSED: 410}
+    DEFAULT_STATUS_CODE = 403
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.public_schema_name = get_public_schema_name()
+        self.bodies = {
+            status: json.dumps(
+                {"detail": f"This workspace is {status.lower()}", "status": status}
+            ).encode()
+            for status in TenantStatus.values
+        }
+
+    def __call__(self, request):
+        tenant = getattr(request, "tenant", None)
+        if tenant is not None and tenant.schema_name != self.public_schema_name:
+            status = tenant_statuses.blocked_status(tenant.pk)
+            if status is not None:
+                return self.rejection(status)
+        return self.get_response(request)
+
+    def rejection(self, status):
+        response = HttpResponse(
+            self.bodies[status],
+            content_type="application/json",
+            status=self.STATUS_CODES.get(status, self.DEFAULT_STATUS_CODE),
+        )
+        response["Cache-Control"] = "public, max-age=60"
+        return response
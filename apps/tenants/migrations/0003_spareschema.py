@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0002_client_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpareSchema',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schema_name', models.CharField(max_length=63, unique=True)),
+                ('status', models.CharField(choices=[('PROVISIONING', 'Provisioning'), ('READY', 'Ready')], default='PROVISIONING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ready_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django_tenants.models import TenantMixin, DomainMixin
 from django.db import models
 import uuid
-from tenants.enums import TenantStatusChoices
+from tenants.enums import TenantStatusChoices, SpareSchemaStatusChoices
 
 
 class Client(TenantMixin):
@@ -20,6 +20,9 @@ class Client(TenantMixin):
     base_currency = models.CharField(max_length=10, default="NGN")
     activated_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # what tenants.cache.TenantStatusMap reloads changed statuses by; set it
+    # (updated_at=Now()) when changing status with QuerySet.update()
+    updated_at = models.DateTimeField(auto_now=True, null=True, blank=True, db_index=True)
 
     auto_create_schema = True  # django-tenants will create schema automatically
 
@@ -28,3 +31,19 @@ class Domain(DomainMixin):
     """Domain routing for tenants"""
 
     pass
+
+
+class SpareSchema(models.Model):
+    """Pre-migrated schema waiting to be claimed by a new tenant"""
+
+    schema_name = models.CharField(max_length=63, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=SpareSchemaStatusChoices.choices,
+        default=SpareSchemaStatusChoices.PROVISIONING,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    ready_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"SpareSchema({self.schema_name}, {self.status})"
@@ -0,0 +1,33 @@
+import logging
+
+from django.db import DatabaseError
+
+from tenants.services.schema_pool import claim_spare_schema
+from tenants.services.template import (
+    TemplateSchemaError,
+    clone_template_schema,
+    template_available,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_tenant_schema(schema_name: str) -> bool:
+    """
+    Gets a migrated schema named `schema_name` ready for a new tenant, from the
+    spare pool or by cloning the template schema. Returns False when neither is
+    available, in which case the tenant creates its own schema on save.
+
+    Must be called inside the caller's transaction.
+    """
+    if claim_spare_schema(schema_name):
+        return True
+
+    if template_available():
+        try:
+            clone_template_schema(schema_name)
+            return True
+        except (TemplateSchemaError, DatabaseError) as e:
+            logger.warning("Cloning %s failed (%s), replaying migrations", schema_name, e)
+
+    return False
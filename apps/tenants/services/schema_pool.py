@@ -0,0 +1,147 @@
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from commons.metrics import registry
+from tenants.models import SpareSchema
+from tenants.enums import SpareSchemaStatusChoices as SpareStatus
+from tenants.services.template import create_tenant_schema
+
+logger = logging.getLogger(__name__)
+
+POOL_SCHEMA_PREFIX = "pool_"
+
+pool_depth_gauge = registry.gauge(
+    "tenant_schema_pool_depth", "Ready spare schemas waiting to be claimed"
+)
+claim_seconds = registry.histogram(
+    "tenant_schema_pool_claim_seconds", "Time taken to claim and rename a spare schema"
+)
+claims_total = registry.counter(
+    "tenant_schema_pool_claims_total", "Spare schema claims by outcome"
+)
+
+
+class SchemaPoolError(Exception):
+    pass
+
+
+def pool_depth() -> int:
+    depth = SpareSchema.objects.filter(status=SpareStatus.READY).count()
+    pool_depth_gauge.set(depth)
+    return depth
+
+
+def drop_spare_schema(spare: SpareSchema) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "DROP SCHEMA IF EXISTS %s CASCADE" % connection.ops.quote_name(spare.schema_name)
+        )
+    spare.delete()
+
+
+def provision_spare_schema(verbosity: int = 0) -> SpareSchema:
+    """
+    Creates one fully migrated spare schema, cloned from the template schema
+    when available. Must run outside a transaction: migrate_schemas commits
+    as it goes.
+    """
+    if connection.in_atomic_block:
+        raise SchemaPoolError("Spare schemas cannot be provisioned inside a transaction")
+
+    spare = SpareSchema.objects.create(
+        schema_name=f"{POOL_SCHEMA_PREFIX}{uuid.uuid4().hex[:16]}"
+    )
+    try:
+        create_tenant_schema(spare.schema_name, verbosity=verbosity)
+    except Exception:
+        connection.set_schema_to_public()
+        drop_spare_schema(spare)
+        raise
+
+    connection.set_schema_to_public()
+    spare.status = SpareStatus.READY
+    spare.ready_at = timezone.now()
+    spare.save(update_fields=["status", "ready_at"])
+    return spare
+
+
+def discard_stale_schemas(max_age: timedelta = timedelta(hours=1)) -> int:
+    """Drops schemas whose provisioning never finished (e.g. a killed worker)."""
+    stale = SpareSchema.objects.filter(
+        status=SpareStatus.PROVISIONING,
+        created_at__lt=timezone.now() - max_age,
+    )
+    count = 0
+    for spare in stale:
+        drop_spare_schema(spare)
+        count += 1
+    return count
+
+
+def refill_pool(target: int | None = None, verbosity: int = 0) -> int:
+    """Tops the pool up to `target` spare schemas, returns how many were created."""
+    if target is None:
+        target = settings.TENANT_SCHEMA_POOL_SIZE
+
+    created = 0
+    while SpareSchema.objects.count() < target:
+        provision_spare_schema(verbosity=verbosity)
+        created += 1
+
+    pool_depth()
+    return created
+
+
+def claim_spare_schema(schema_name: str) -> bool:
+    """
+    Renames a ready spare schema to `schema_name`. Returns False when the pool
+    is disabled or empty, in which case the caller creates the schema itself.
+
+    Must be called inside the caller's transaction so the rename is rolled
+    back together with the tenant rows if promotion fails.
+    """
+    if not settings.TENANT_SCHEMA_POOL_ENABLED:
+        return False
+
+    if not transaction.get_connection().in_atomic_block:
+        raise SchemaPoolError("Spare schemas must be claimed inside a transaction")
+
+    started = time.perf_counter()
+    spare = (
+        SpareSchema.objects.select_for_update(skip_locked=True)
+        .filter(status=SpareStatus.READY)
+        .order_by("created_at")
+        .first()
+    )
+    if spare is None:
+        claims_total.inc(outcome="miss")
+        logger.warning("Tenant schema pool is empty, %s needs a new schema", schema_name)
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ALTER SCHEMA %s RENAME TO %s"
+            % (
+                connection.ops.quote_name(spare.schema_name),
+                connection.ops.quote_name(schema_name),
+            )
+        )
+    spare.delete()
+
+    claim_seconds.observe(time.perf_counter() - started)
+    claims_total.inc(outcome="hit")
+
+    depth = pool_depth()
+    if depth <= settings.TENANT_SCHEMA_POOL_LOW_WATER_MARK:
+        logger.warning(
+            "Tenant schema pool below low-water mark (%s <= %s)",
+            depth,
+            settings.TENANT_SCHEMA_POOL_LOW_WATER_MARK,
+        )
+    return True
@@ -0,0 +1,138 @@
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.clone import CLONE_SCHEMA_FUNCTION
+from django_tenants.utils import app_labels, schema_exists
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateSchemaError(Exception):
+    pass
+
+
+def template_schema_name() -> str:
+    return getattr(settings, "TENANT_TEMPLATE_SCHEMA", "") or ""
+
+
+@lru_cache(maxsize=1)
+def expected_migrations() -> frozenset:
+    """Latest TENANT_APPS migrations a tenant schema must have applied, read once per process."""
+    tenant_labels = set(app_labels(settings.TENANT_APPS))
+    graph = MigrationLoader(None, ignore_no_migrations=True).graph
+    return frozenset(node for node in graph.leaf_nodes() if node[0] in tenant_labels)
+
+
+def applied_migrations(schema_name: str) -> set:
+    table = "%s.django_migrations" % connection.ops.quote_name(schema_name)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT app, name FROM {table}")
+        return set(cursor.fetchall())
+
+
+def pending_migrations(schema_name: str) -> list:
+    return sorted(expected_migrations() - applied_migrations(schema_name))
+
+
+def template_available() -> bool:
+    template = template_schema_name()
+    if not template:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_namespace WHERE nspname = %s), "
+            "EXISTS(SELECT 1 FROM pg_catalog.pg_proc WHERE proname = 'clone_schema')",
+            [template],
+        )
+        has_schema, has_function = cursor.fetchone()
+    return has_schema and has_function
+
+
+def install_clone_function() -> None:
+    db_user = settings.DATABASES["default"].get("USER", None) or "postgres"
+    with connection.cursor() as cursor:
+        cursor.execute(CLONE_SCHEMA_FUNCTION.format(db_user=db_user))
+
+
+def clone_template_schema(schema_name: str) -> None:
+    """
+    Copies the template's tables, sequences and rows (including its
+    django_migrations records) into a new schema in a single statement, then
+    checks the copy has every current migration applied.
+
+    Runs in a savepoint, so a failed clone leaves the caller's transaction
+    usable for a fallback.
+    """
+    template = template_schema_name()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT clone_schema(%s, %s, %s)", [template, schema_name, "DATA"]
+            )
+        missing = pending_migrations(schema_name)
+        if missing:
+            raise TemplateSchemaError(
+                "Template schema %s is missing migrations: %s"
+                % (template, ", ".join(f"{app}.{name}" for app, name in missing))
+            )
+
+
+def migrate_new_schema(schema_name: str, verbosity: int = 0) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE SCHEMA %s" % connection.ops.quote_name(schema_name))
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    connection.set_schema_to_public()
+
+
+def create_tenant_schema(schema_name: str, verbosity: int = 0) -> None:
+    """Creates a fully migrated schema, cloning the template when one is available."""
+    if template_available():
+        try:
+            clone_template_schema(schema_name)
+            return
+        except (TemplateSchemaError, DatabaseError) as e:
+            logger.warning("Cloning %s failed (%s), replaying migrations", schema_name, e)
+    migrate_new_schema(schema_name, verbosity=verbosity)
+
+
+def rebuild_template_schema(verbosity: int = 0) -> str:
+    """
+    Migrates a fresh copy of the template next to the current one and swaps it
+    in, so tenants created meanwhile keep cloning the old template.
+    """
+    template = template_schema_name()
+    if not template:
+        raise TemplateSchemaError("TENANT_TEMPLATE_SCHEMA is not set")
+    if connection.in_atomic_block:
+        raise TemplateSchemaError("The template cannot be rebuilt inside a transaction")
+
+    staging = f"{template}_next"
+    qn = connection.ops.quote_name
+
+    install_clone_function()
+    with connection.cursor() as cursor:
+        cursor.execute("DROP SCHEMA IF EXISTS %s CASCADE" % qn(staging))
+    migrate_new_schema(staging, verbosity=verbosity)
+
+    missing = pending_migrations(staging)
+    if missing:
+        raise TemplateSchemaError(
+            "Rebuilt template is missing migrations: %s"
+            % ", ".join(f"{app}.{name}" for app, name in missing)
+        )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if schema_exists(template):
+            cursor.execute("DROP SCHEMA %s CASCADE" % qn(template))
+        cursor.execute("ALTER SCHEMA %s RENAME TO %s" % (qn(staging), qn(template)))
+    return template
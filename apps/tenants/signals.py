@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from tenants import cache
+from tenants.models import Client, Domain
+
+# Invalidations run once the change commits: evicted any earlier, a
+# concurrent request could cache the old row again for a whole TTL.
+
+
+@receiver(pre_save, sender=Domain)
+def remember_previous_domain(sender, instance, **kwargs):
+    # the old hostname (or tenant) would keep resolving until its TTL otherwise
+    instance._previous_domain = None
+    if not instance._state.adding:
+        instance._previous_domain = (
+            Domain.objects.filter(pk=instance.pk).values_list("domain", "tenant_id").first()
+        )
+
+
+@receiver([post_save, post_delete], sender=Domain)
+def invalidate_domain(sender, instance, using, **kwargs):
+    hostnames, tenant_ids = {instance.domain}, {instance.tenant_id}
+    previous = instance.__dict__.pop("_previous_domain", None)
+    if previous is not None:
+        hostnames.add(previous[0])
+        tenant_ids.add(previous[1])
+
+    def invalidate():
+        cache.invalidate_hostnames(*hostnames)
+        for tenant_id in tenant_ids:
+            cache.invalidate_tenant(tenant_id)
+
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client(sender, instance, using, **kwargs):
+    tenant_id, status = instance.pk, instance.status
+
+    def invalidate():
+        cache.invalidate_tenant(tenant_id)
+        cache.tenant_statuses.update(tenant_id, status)
+
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_delete, sender=Client)
+def invalidate_deleted_client(sender, instance, using, **kwargs):
+    tenant_id = instance.pk
+
+    def invalidate():
+        cache.invalidate_tenant(tenant_id)
+        cache.tenant_statuses.update(tenant_id, None)
+
+    transaction.on_commit(invalidate, using=using)
@@ -1,3 +1,60 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.db.models.functions import Now
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+
+from tenants import cache
+from tenants.models import Client, Domain
+
+
+@override_settings(TENANT_RESOLUTION_SHARED_CACHE="default")
+class DomainInvalidationTests(TenantTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_rename_evicts_previous_hostname_on_commit(self):
+        domain = Domain.objects.create(domain="old.example.com", tenant=self.tenant)
+        self.assertEqual(cache.get_tenant_for_hostname("old.example.com").pk, self.tenant.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            domain.domain = "new.example.com"
+            domain.save()
+        # not evicted before the rename commits
+        self.assertEqual(cache.get_tenant_for_hostname("old.example.com").pk, self.tenant.pk)
+
+        for callback in callbacks:
+            callback()
+        with self.assertRaises(Domain.DoesNotExist):
+            cache.get_tenant_for_hostname("old.example.com")
+        self.assertEqual(cache.get_tenant_for_hostname("new.example.com").pk, self.tenant.pk)
+
+
+class TenantStatusMapTests(TenantTestCase):
+    def setUp(self):
+        self.statuses = cache.TenantStatusMap(
+            blocked_statuses=["SUSPENDED"], refresh_interval=30, full_refresh_interval=600
+        )
+        self.statuses.refresh()
+
+    def test_incremental_refresh_reads_updated_tenants(self):
+        Client.objects.filter(pk=self.tenant.pk).update(status="SUSPENDED", updated_at=Now())
+        self.statuses.refresh()
+        self.assertEqual(self.statuses._statuses.get(self.tenant.pk), "SUSPENDED")
+
+        self.tenant.status = "ACTIVE"
+        self.tenant.save()
+        self.statuses.refresh()
+        self.assertNotIn(self.tenant.pk, self.statuses._statuses)
+
+    def test_changes_without_updated_at_wait_for_the_full_refresh(self):
+        # as if the row was last saved an hour ago
+        Client.objects.filter(pk=self.tenant.pk).update(
+            status="SUSPENDED", updated_at=self.tenant.created_at - timedelta(hours=1)
+        )
+        self.statuses.refresh()
+        self.assertNotIn(self.tenant.pk, self.statuses._statuses)
+
+        self.statuses.refresh(full=True)
+        self.assertEqual(self.statuses._statuses.get(self.tenant.pk), "SUSPENDED")
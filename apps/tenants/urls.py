@@ -1,3 +1,6 @@
 from django.urls import path
+from tenants.endpoints import SchemaPoolStatusView
 
-urlpatterns = []
+urlpatterns = [
+    path("schema-pool/", SchemaPoolStatusView.as_view(), name="tenants-schema-pool"),
+]
@@ -0,0 +1,120 @@
+import functools
+import logging
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from commons.metrics import registry
+
+logger = logging.getLogger("shogun.steps")
+
+step_seconds = registry.histogram(
+    "step_duration_seconds", "Wall time of instrumented steps"
+)
+step_queries_total = registry.counter(
+    "step_queries_total", "Database statements run by instrumented steps"
+)
+step_rows_total = registry.counter(
+    "step_rows_total", "Rows returned or affected by instrumented steps"
+)
+step_failures_total = registry.counter(
+    "step_failures_total", "Instrumented steps that raised"
+)
+
+
+@dataclass
+class StepRecord:
+    name: str
+    labels: dict = field(default_factory=dict)
+    seconds: float = 0.0
+    queries: int = 0
+    rows: int = 0
+    failed: bool = False
+
+    @property
+    def milliseconds(self) -> int:
+        return round(self.seconds * 1000)
+
+
+class instrument:
+    """
+    Records the wall time, query count and rows touched (cursor.rowcount) of a
+    named step on the given database aliases, then logs one structured line
+    and updates the step_* metrics. Works as a context manager, yielding the
+    StepRecord, or as a decorator:
+
+        with instrument("promotion.entity") as step:
+            ...
+        step.milliseconds
+
+        @instrument("accounting.seed_coa")
+        def seed(...): ...
+
+    Steps nest; an outer step counts its inner steps' queries as well.
+    """
+
+    def __init__(self, name, using=(DEFAULT_DB_ALIAS,), **labels):
+        self.name = name
+        self.using = using
+        self.labels = labels
+        self._stack = None
+        self._started = None
+        self.record = None
+
+    def _count(self, execute, sql, params, many, context):
+        self.record.queries += 1
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            rowcount = getattr(context["cursor"], "rowcount", -1)
+            if rowcount and rowcount > 0:
+                self.record.rows += rowcount
+
+    def __enter__(self) -> StepRecord:
+        self.record = StepRecord(self.name, dict(self.labels))
+        self._stack = ExitStack()
+        for alias in self.using:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._count))
+        self._started = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        record = self.record
+        record.seconds = time.perf_counter() - self._started
+        record.failed = exc_type is not None
+        self._stack.close()
+
+        labels = {"step": record.name, **record.labels}
+        step_seconds.observe(record.seconds, **labels)
+        step_queries_total.inc(record.queries, **labels)
+        step_rows_total.inc(record.rows, **labels)
+        if record.failed:
+            step_failures_total.inc(**labels)
+        logger.info(
+            "step %s %s in %dms (%d queries, %d rows)",
+            record.name,
+            "failed" if record.failed else "finished",
+            record.milliseconds,
+            record.queries,
+            record.rows,
+            extra={
+                "step": record.name,
+                "duration_ms": record.milliseconds,
+                "queries": record.queries,
+                "rows": record.rows,
+                "failed": record.failed,
+                "labels": record.labels,
+            },
+        )
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # a fresh instance per call, so concurrent calls keep their own record
+            with instrument(self.name, using=self.using, **self.labels):
+                return func(*args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,162 @@
+import threading
+from collections import defaultdict
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    @staticmethod
+    def _format_labels(key, extra=()):
+        pairs = list(key) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text=""):
+        super().__init__(name, help_text)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        with self._lock:
+            self._values[self._key(labels)] += amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            return [
+                (self.name + self._format_labels(key), value)
+                for key, value in self._values.items()
+            ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text=""):
+        super().__init__(name, help_text)
+        self._values = {}
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            return [
+                (self.name + self._format_labels(key), value)
+                for key, value in self._values.items()
+            ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = {}
+        self._sums = defaultdict(float)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+
+    def count(self, **labels):
+        counts = self._counts.get(self._key(labels))
+        return counts[-1] if counts else 0
+
+    def sum(self, **labels):
+        return self._sums.get(self._key(labels), 0.0)
+
+    def samples(self):
+        rows = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                for bound, count in zip(self.buckets, counts):
+                    rows.append(
+                        (
+                            self.name
+                            + "_bucket"
+                            + self._format_labels(key, [("le", bound)]),
+                            count,
+                        )
+                    )
+                rows.append(
+                    (
+                        self.name + "_bucket" + self._format_labels(key, [("le", "+Inf")]),
+                        counts[-1],
+                    )
+                )
+                rows.append((self.name + "_count" + self._format_labels(key), counts[-1]))
+                rows.append((self.name + "_sum" + self._format_labels(key), self._sums[key]))
+        return rows
+
+
+class MetricsRegistry:
+    """
+    Process-local registry of metrics rendered in the Prometheus text format.
+    Metrics are created lazily and shared by name, so modules can declare the
+    same metric without coordinating imports.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text=""):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text="", **kwargs):
+        return self._get_or_create(Histogram, name, help_text, **kwargs)
+
+    def render(self):
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if metric.help_text:
+                lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,89 @@
+import django.db.utils
+from django.core.exceptions import ImproperlyConfigured
+from django_tenants.postgresql_backend.base import (
+    DatabaseWrapper as TenantDatabaseWrapper,
+    is_psycopg3,
+    psycopg,
+)
+
+from commons.metrics import registry
+
+search_path_sets_total = registry.counter(
+    "db_search_path_sets_total",
+    "SET search_path statements by whether they were executed or skipped",
+)
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+    """
+    django-tenants backend that remembers the search_path active on the
+    physical connection and skips SET statements that would not change it,
+    e.g. when schema_context switches back to the schema already in use.
+
+    SET is transactional in PostgreSQL, so the remembered path is dropped on
+    every rollback, savepoint rollback and new connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.active_search_path = None
+        self.search_path_executed = 0
+        self.search_path_skipped = 0
+        super().__init__(*args, **kwargs)
+
+    def get_new_connection(self, conn_params):
+        self.active_search_path = None
+        return super().get_new_connection(conn_params)
+
+    def close(self):
+        self.active_search_path = None
+        super().close()
+
+    def _rollback(self):
+        self.active_search_path = None
+        return super()._rollback()
+
+    def _savepoint_rollback(self, sid):
+        super()._savepoint_rollback(sid)
+        self.active_search_path = None
+
+    def _cursor(self, name=None):
+        # Skip django-tenants' _cursor, which sets the search_path on
+        # every new cursor, and go straight to Django's.
+        cursor = super(TenantDatabaseWrapper, self)._cursor(name=name)
+
+        if not self.schema_name:
+            raise ImproperlyConfigured(
+                "Database schema not set. Did you forget "
+                "to call set_schema() or set_tenant()?"
+            )
+
+        search_paths = self._get_cursor_search_paths()
+        if search_paths == self.active_search_path:
+            self.search_path_skipped += 1
+            search_path_sets_total.inc(result="skipped")
+            return cursor
+
+        if name or is_psycopg3:
+            # Named cursors can only run one statement
+            cursor_for_search_path = self.connection.cursor()
+        else:
+            cursor_for_search_path = cursor
+
+        try:
+            cursor_for_search_path.execute(
+                "SET search_path = {0}".format(
+                    ",".join("'{}'".format(s) for s in search_paths)
+                )
+            )
+        except (django.db.utils.DatabaseError, psycopg.InternalError):
+            # The transaction is already failing, the next statement (a
+            # rollback or another error) does not need the path
+            self.active_search_path = None
+        else:
+            self.active_search_path = search_paths
+            self.search_path_set_schemas = search_paths
+            self.search_path_executed += 1
+            search_path_sets_total.inc(result="executed")
+        if name or is_psycopg3:
+            cursor_for_search_path.close()
+        return cursor
@@ -0,0 +1,21 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from commons.metrics import registry
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this process's metrics. Disabled unless
+    METRICS_TOKEN is set; scrapers send it as a bearer token.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404()
+    if not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
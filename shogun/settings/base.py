@@ -16,6 +16,8 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .connections import connection_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -64,6 +66,7 @@ TENANT_APPS = [
     # your tenant-specific apps
     "django_ledger",  #
     "accounting",
+    "banking",
 ]
 
 
@@ -73,13 +76,15 @@ INSTALLED_APPS = list(SHARED_APPS) + [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # CORS must be first to handle preflight requests
-    "django_tenants.middleware.main.TenantMainMiddleware",
+    "tenants.middleware.CachedTenantMiddleware",  # cached TenantMainMiddleware
+    "tenants.middleware.TenantStatusMiddleware",  # reject non-active tenants early
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "onboarding.middleware.TransitionLogMiddleware",  # one INSERT per request
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -118,7 +123,8 @@ WSGI_APPLICATION = "shogun.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django_tenants.postgresql_backend",
+        # django_tenants.postgresql_backend that skips redundant SET search_path
+        "ENGINE": "commons.postgresql_backend",
         "NAME": os.getenv("SHOGUN_POSTGRES_DB", "shogun_db"),
         "USER": os.getenv("SHOGUN_POSTGRES_USER", "shogun_user"),
         "PASSWORD": os.getenv("SHOGUN_POSTGRES_PASSWORD", "shogun_password"),
@@ -127,9 +133,151 @@ DATABASES = {
     }
 }
 
+# See shogun/settings/connections.py for the available modes
+DB_CONNECTION_MODE = os.getenv("SHOGUN_DB_CONN_MODE", "none")
+DATABASES["default"].update(connection_settings(DB_CONNECTION_MODE))
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # shared by every worker, see JWT_REVOCATION_CACHE
+    "revocations": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "identity_revocation_cache",
+        # revocations are few and expire with the access tokens, never cull
+        # one early
+        "OPTIONS": {"MAX_ENTRIES": 1_000_000},
+    },
+}
+
 
 DATABASE_ROUTERS = ("django_tenants.routers.TenantSyncRouter",)
 
+# Pool of pre-migrated spare schemas claimed by promote_onboarding.
+# Refilled by `manage.py refill_schema_pool [--watch]`.
+TENANT_SCHEMA_POOL_ENABLED = (
+    os.getenv("SHOGUN_SCHEMA_POOL_ENABLED", "true").lower() == "true"
+)
+TENANT_SCHEMA_POOL_SIZE = int(os.getenv("SHOGUN_SCHEMA_POOL_SIZE", "5"))
+TENANT_SCHEMA_POOL_LOW_WATER_MARK = int(
+    os.getenv("SHOGUN_SCHEMA_POOL_LOW_WATER_MARK", "2")
+)
+
+# Fully migrated schema that new tenant schemas are cloned from instead of
+# replaying every migration. Rebuild it with `manage.py refresh_tenant_template`
+# after new TENANT_APPS migrations land; set to "" to disable cloning.
+TENANT_TEMPLATE_SCHEMA = os.getenv("SHOGUN_TENANT_TEMPLATE_SCHEMA", "tenant_template")
+
+# Hostname -> tenant cache used by tenants.middleware.CachedTenantMiddleware.
+# Entries live in a per-process LRU; set SHOGUN_TENANT_SHARED_CACHE to a
+# CACHES alias to share lookups between workers as well.
+TENANT_RESOLUTION_CACHE_SIZE = int(os.getenv("SHOGUN_TENANT_CACHE_SIZE", "1024"))
+TENANT_RESOLUTION_CACHE_TTL = int(os.getenv("SHOGUN_TENANT_CACHE_TTL", "30"))
+TENANT_RESOLUTION_SHARED_CACHE = os.getenv("SHOGUN_TENANT_SHARED_CACHE") or None
+
+# Tenants in these statuses get a cached 403/410 from TenantStatusMiddleware.
+# Every TENANT_STATUS_REFRESH_INTERVAL seconds the tenants changed since the
+# last refresh (by updated_at) are reloaded, and the whole blocked set every
+# TENANT_STATUS_FULL_REFRESH_INTERVAL seconds, which also picks up deletions
+# and status changes made without updating updated_at (e.g. raw SQL).
+TENANT_BLOCKED_STATUSES = ("SUSPENDED", "INACTIVE", "CLOSED")
+TENANT_STATUS_REFRESH_INTERVAL = int(os.getenv("SHOGUN_TENANT_STATUS_REFRESH", "30"))
+TENANT_STATUS_FULL_REFRESH_INTERVAL = int(
+    os.getenv("SHOGUN_TENANT_STATUS_FULL_REFRESH", "600")
+)
+
+# Access tokens carry is_active and tenant memberships and are trusted without
+# a User query. Deactivating a user or changing a membership records a
+# revocation time in this CACHES alias, and each worker re-reads it at most
+# every JWT_REVOCATION_LOCAL_TTL seconds. The alias must be shared by every
+# worker: the default is a database cache whose table identity's migrations
+# create; point it at a Redis or Memcached alias where there is one. A
+# per-process backend (LocMemCache) fails identity.E001.
+JWT_REVOCATION_CACHE = os.getenv("SHOGUN_JWT_REVOCATION_CACHE", "revocations")
+JWT_REVOCATION_LOCAL_TTL = int(os.getenv("SHOGUN_JWT_REVOCATION_LOCAL_TTL", "5"))
+
+# (user, tenant) -> roles cache behind identity.permissions.IsTenantMember.
+# Membership signals invalidate it in-process, other workers within the TTL.
+TENANT_AUTHZ_CACHE_SIZE = int(os.getenv("SHOGUN_TENANT_AUTHZ_CACHE_SIZE", "10000"))
+TENANT_AUTHZ_CACHE_TTL = int(os.getenv("SHOGUN_TENANT_AUTHZ_CACHE_TTL", "30"))
+
+# Bulk onboarding imports (POST onboarding/create/bulk/)
+ONBOARDING_BULK_MAX_ITEMS = int(os.getenv("SHOGUN_ONBOARDING_BULK_MAX_ITEMS", "10000"))
+ONBOARDING_BULK_CHUNK_SIZE = int(os.getenv("SHOGUN_ONBOARDING_BULK_CHUNK_SIZE", "500"))
+
+# Most applications a single bulk verification may touch
+ONBOARDING_BULK_VERIFY_MAX_IDS = int(os.getenv("SHOGUN_ONBOARDING_BULK_VERIFY_MAX_IDS", "1000"))
+
+# Rows per keyset page when exporting onboarding applications
+ONBOARDING_EXPORT_PAGE_SIZE = int(os.getenv("SHOGUN_ONBOARDING_EXPORT_PAGE_SIZE", "5000"))
+
+# Bearer token for the /metrics/ scrape endpoint, which is off when unset
+METRICS_TOKEN = os.getenv("SHOGUN_METRICS_TOKEN") or None
+
+# commons.instrumentation logs one line per instrumented step
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "shogun.steps": {
+            "handlers": ["console"],
+            "level": os.getenv("SHOGUN_STEP_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Journal entries per bulk_create chunk (and savepoint) in accounting imports
+JOURNAL_IMPORT_CHUNK_SIZE = int(os.getenv("SHOGUN_JOURNAL_IMPORT_CHUNK_SIZE", "500"))
+
+# Bank transactions per bulk insert when ingesting OFX/QFX statements
+BANKING_INGEST_CHUNK_SIZE = int(os.getenv("SHOGUN_BANKING_INGEST_CHUNK_SIZE", "2000"))
+
+# Days a ledger transaction may be away from the bank line it reconciles
+BANKING_RECONCILE_DATE_WINDOW = int(os.getenv("SHOGUN_BANKING_RECONCILE_DATE_WINDOW", "4"))
+# Cents an automatic one-to-one match may be off by
+BANKING_RECONCILE_AMOUNT_TOLERANCE = int(
+    os.getenv("SHOGUN_BANKING_RECONCILE_AMOUNT_TOLERANCE", "0")
+)
+
+# Seconds a promotion job may stay RUNNING before run_promotion_worker
+# assumes its worker died and queues it again.
+PROMOTION_JOB_TIMEOUT = int(os.getenv("SHOGUN_PROMOTION_JOB_TIMEOUT", "1800"))
+
+
+# Password hashing. SHOGUN_PASSWORD_HASHER picks the hasher for new hashes
+# ("pbkdf2", "scrypt" or "argon2", which needs argon2-cffi); the others stay
+# listed so existing hashes verify and get upgraded on login. The default
+# stays pbkdf2; cost defaults match Django's, tune them (or switch hasher)
+# per host with bench_password_hashers.
+PASSWORD_HASHER_STRATEGY = os.getenv("SHOGUN_PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "identity.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "identity.hashers.TunedScryptPasswordHasher",
+    "argon2": "identity.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER_STRATEGY]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER_STRATEGY
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("SHOGUN_PBKDF2_ITERATIONS", "1000000"))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("SHOGUN_SCRYPT_WORK_FACTOR", str(2**14)))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv("SHOGUN_SCRYPT_BLOCK_SIZE", "8"))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("SHOGUN_SCRYPT_PARALLELISM", "5"))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("SHOGUN_ARGON2_TIME_COST", "2"))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("SHOGUN_ARGON2_MEMORY_COST", "102400"))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("SHOGUN_ARGON2_PARALLELISM", "8"))
+
+# At most WORKERS hashes run at once per process (identity.hashing), in
+# the request's own thread. Up to QUEUE more requests wait at most
+# PASSWORD_HASHING_TIMEOUT seconds for a turn; the rest get a 503. This is
+# per process and only matters with threaded gunicorn workers: a sync
+# worker hashes one request at a time and never waits here.
+PASSWORD_HASHING_WORKERS = int(os.getenv("SHOGUN_PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_QUEUE = int(os.getenv("SHOGUN_PASSWORD_HASHING_QUEUE", "16"))
+PASSWORD_HASHING_TIMEOUT = float(os.getenv("SHOGUN_PASSWORD_HASHING_TIMEOUT", "5"))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -183,6 +331,10 @@ SIMPLE_JWT = {
 
 
 REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "identity.authentication.StatelessJWTAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
     "EXCEPTION_HANDLER": "commons.exceptions.custom_exception_handler",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
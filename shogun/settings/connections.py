@@ -0,0 +1,64 @@
+"""
+Database connection modes, selected per environment with SHOGUN_DB_CONN_MODE:
+
+- "none": a new connection per request (Django's default, CONN_MAX_AGE=0).
+- "persistent": each worker keeps its connection for CONN_MAX_AGE seconds
+  and checks it is alive before reusing it.
+- "pool": psycopg 3 connection pool shared by the threads of a worker.
+  Requires `psycopg[binary,pool]`, which requirements.txt does not ship
+  (it pins psycopg2); selecting the mode without it fails at startup.
+
+All modes are safe with django-tenants: commons.postgresql_backend forgets
+the connection's search_path whenever it gets a new or pooled connection.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+CONNECTION_MODES = ("none", "persistent", "pool")
+
+
+def _require_psycopg_pool():
+    # Django falls back to psycopg2 without psycopg 3 and only rejects the
+    # pool option when the first connection opens
+    try:
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            'The "pool" database connection mode needs psycopg 3 and its pool, '
+            'install "psycopg[binary,pool]" or pick another SHOGUN_DB_CONN_MODE'
+        ) from e
+
+
+def connection_settings(mode):
+    """Returns the DATABASES["default"] keys for the given connection mode."""
+    if mode == "none":
+        return {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}
+
+    if mode == "persistent":
+        return {
+            "CONN_MAX_AGE": int(os.getenv("SHOGUN_DB_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+        }
+
+    if mode == "pool":
+        _require_psycopg_pool()
+        # Django rejects CONN_MAX_AGE with pooling, connections go back to
+        # the pool at the end of each request instead.
+        return {
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": False,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.getenv("SHOGUN_DB_POOL_MIN_SIZE", "2")),
+                    "max_size": int(os.getenv("SHOGUN_DB_POOL_MAX_SIZE", "8")),
+                    "timeout": float(os.getenv("SHOGUN_DB_POOL_TIMEOUT", "10")),
+                },
+            },
+        }
+
+    raise ValueError(
+        f"Unknown database connection mode {mode!r}, expected one of {CONNECTION_MODES}"
+    )
@@ -1 +1,6 @@
 from .base import *
+from .connections import connection_settings
+
+# Reuse connections across requests in production
+DB_CONNECTION_MODE = os.getenv("SHOGUN_DB_CONN_MODE", "persistent")
+DATABASES["default"].update(connection_settings(DB_CONNECTION_MODE))
@@ -0,0 +1,36 @@
+import sys
+import types
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from shogun.settings.connections import connection_settings
+
+
+class ConnectionSettingsTests(SimpleTestCase):
+    def test_pool_requires_psycopg_3(self):
+        for missing in ("psycopg", "psycopg_pool"):
+            with self.subTest(missing=missing):
+                modules = {
+                    "psycopg": types.ModuleType("psycopg"),
+                    "psycopg_pool": types.ModuleType("psycopg_pool"),
+                    missing: None,
+                }
+                with mock.patch.dict(sys.modules, modules):
+                    with self.assertRaisesMessage(ImproperlyConfigured, "psycopg[binary,pool]"):
+                        connection_settings("pool")
+
+    def test_pool_with_psycopg_3(self):
+        modules = {
+            "psycopg": types.ModuleType("psycopg"),
+            "psycopg_pool": types.ModuleType("psycopg_pool"),
+        }
+        with mock.patch.dict(sys.modules, modules):
+            options = connection_settings("pool")
+        self.assertEqual(options["CONN_MAX_AGE"], 0)
+        self.assertIn("pool", options["OPTIONS"])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            connection_settings("pooled")
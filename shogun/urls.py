@@ -58,6 +58,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     # Tenant APIs
     path("api/v1/accounting/", include("accounting.urls")),
+    path("api/v1/banking/", include("banking.urls")),
     path("ledger/", include("django_ledger.urls", namespace="django_ledger")),
     # Optional tenant-level identity endpoints
     # (profile, logout, etc. — not signup)
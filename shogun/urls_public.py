@@ -45,6 +45,8 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from commons.views import metrics_view
+
 urlpatterns = [
     # Admin (public schema only)
     path("admin/", admin.site.urls),
@@ -52,6 +54,8 @@ urlpatterns = [
     path("api/v1/identity/", include("identity.urls")),
     path("api/v1/onboarding/", include("onboarding.urls")),
     path("api/v1/tenants/", include("tenants.urls")),  # promotion trigger lives here
+    # Prometheus metrics of the serving process
+    path("metrics/", metrics_view, name="metrics"),
     # API schema (public only)
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(